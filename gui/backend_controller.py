@@ -2,14 +2,25 @@
 
 import logging
 import threading
+import time
 from typing import Callable, Optional, List, Dict
 from datetime import datetime
 
 # Import voice assistant modules
-from voice_assistant.audio import record_audio, play_audio
-from voice_assistant.transcription import transcribe_audio
-from voice_assistant.response_generation import generate_response
-from voice_assistant.text_to_speech import text_to_speech
+from voice_assistant.audio import record_audio, play_audio, set_volume, get_volume
+from voice_assistant.transcription import transcribe_audio, transcribe_partial
+from voice_assistant.response_generation import generate_response, generate_response_stream
+from voice_assistant.text_to_speech import text_to_speech, warm_tts_cache
+from voice_assistant.pipeline import speak_pipelined, get_output_format, streams_playback
+from voice_assistant.long_text import is_long_text, speak_long_text
+from voice_assistant.summarizer import HistoryCompactor
+from voice_assistant.memory import ConversationMemory
+from voice_assistant.model_warmup import start_preload
+from voice_assistant.intents import intent_engine, IntentResult
+from voice_assistant.speculation import SpeculativeGenerator
+from voice_assistant.circuit_breaker import breakers
+from voice_assistant.auto_select import resolve_model
+from voice_assistant.deadline import TurnDeadline
 from voice_assistant.config import Config
 from voice_assistant.temp_file_manager import temp_file_manager
 from voice_assistant.permissions import (
@@ -21,7 +32,7 @@ from voice_assistant.permissions import (
 from voice_assistant.api_key_manager import (
     get_transcription_api_key,
     get_response_api_key,
-    get_tts_api_key
+    get_api_key
 )
 
 logger = logging.getLogger(__name__)
@@ -37,6 +48,24 @@ class BackendController:
         """Initialize the backend controller."""
         self.is_recording = False
         self.is_processing = False
+        self.speech_ended_at: Optional[float] = None
+        # Deadline of the current turn, with per-stage budgets
+        self.deadline: Optional[TurnDeadline] = None
+        self._got_first_token = False
+
+        # Last spoken answer, for "repeat that"
+        self.last_audio_files: List[str] = []
+        self.last_spoken_text: Optional[str] = None
+
+        # Guards chat_history against the background compactor's segment swap
+        self.history_lock = threading.Lock()
+        self.compactor = HistoryCompactor(self.history_lock)
+
+        # Starts the LLM on stable partial transcripts before the final one arrives
+        self.speculator = SpeculativeGenerator(self._speculative_stream)
+
+        # Long-term memory index, loaded on first use
+        self._memory: Optional[ConversationMemory] = None
         self.chat_history: List[Dict[str, str]] = [
             {
                 "role": "system",
@@ -51,6 +80,12 @@ class BackendController:
         self.on_animation_update: Optional[Callable[[str], None]] = None
         self.on_message_add: Optional[Callable[[str, str], None]] = None
         self.on_error: Optional[Callable[[str], None]] = None
+        self.on_model_state: Optional[Callable[[dict], None]] = None
+        self.on_history_cleared: Optional[Callable[[], None]] = None
+        self.on_breaker_state: Optional[Callable[[dict], None]] = None
+
+        # Registered once; the callback is looked up on every change, so set_callbacks can be called again
+        breakers.add_listener(self._handle_breaker_change)
 
         # Load settings from config file if exists
         try:
@@ -75,7 +110,10 @@ class BackendController:
         on_status_update: Callable[[str], None],
         on_animation_update: Callable[[str], None],
         on_message_add: Callable[[str, str], None],
-        on_error: Callable[[str], None]
+        on_error: Callable[[str], None],
+        on_model_state: Optional[Callable[[dict], None]] = None,
+        on_history_cleared: Optional[Callable[[], None]] = None,
+        on_breaker_state: Optional[Callable[[dict], None]] = None
     ):
         """
         Set callback functions for UI updates.
@@ -85,11 +123,33 @@ class BackendController:
             on_animation_update: Callback for animation state changes
             on_message_add: Callback for adding messages to chat
             on_error: Callback for error handling
+            on_model_state: Callback for local LLM model-ready state changes
+            on_history_cleared: Callback when a voice command cleared the conversation
+            on_breaker_state: Callback with every provider circuit breaker's state when one changes
         """
         self.on_status_update = on_status_update
         self.on_animation_update = on_animation_update
         self.on_message_add = on_message_add
         self.on_error = on_error
+        self.on_model_state = on_model_state
+        self.on_history_cleared = on_history_cleared
+        self.on_breaker_state = on_breaker_state
+
+    def _handle_breaker_change(self, name: str, state: str):
+        """Forward a provider circuit breaker state change to the UI."""
+        if self.on_breaker_state:
+            self.on_breaker_state(breakers.get_states())
+
+    def preload_models(self):
+        """Load the local LLM and cache the fallback message in the background, ahead of the first turn."""
+        self._prepare_fallback_speech()
+        if not Config.LOCAL_LLM_PRELOAD:
+            return
+        start_preload(
+            Config.RESPONSE_MODEL,
+            self.chat_history[0]["content"] if self.chat_history else None,
+            self.on_model_state
+        )
 
     def start_conversation(self):
         """Start a new voice conversation cycle."""
@@ -115,6 +175,7 @@ class BackendController:
         """Background thread that handles the full conversation flow."""
         try:
             self.is_processing = True
+            self.deadline = TurnDeadline() if Config.TURN_DEADLINE_ENABLED else None
 
             # Step 1: Record audio
             if not self._record_audio():
@@ -125,6 +186,23 @@ class BackendController:
             if not user_text:
                 return
 
+            # Local fast path: answer common commands without the LLM
+            if Config.LOCAL_INTENTS:
+                intent = intent_engine.match(user_text)
+                if intent:
+                    logger.info(f"Handling intent locally: {intent.name}")
+                    self._handle_intent(intent)
+                    return
+
+            # Add to chat history
+            with self.history_lock:
+                self.chat_history.append({"role": "user", "content": user_text})
+
+            # Pipelined mode: speak sentences while the response is still generating
+            if Config.PIPELINED_TURNS:
+                self._generate_and_speak(user_text)
+                return
+
             # Step 3: Generate response
             response_text = self._generate_response(user_text)
             if not response_text:
@@ -139,6 +217,13 @@ class BackendController:
                 self.on_error(f"Conversation error: {str(e)}")
         finally:
             self.is_processing = False
+            # Speech outside a turn (reading the conversation aloud) has no deadline
+            self.deadline = None
+            # Drop a speculation the turn didn't use (intent, empty or failed transcript)
+            self.speculator.cancel()
+            # Summarize older turns between turns, never during one
+            if Config.HISTORY_SUMMARIZATION:
+                self.compactor.maybe_compact(self.chat_history)
             if self.on_status_update:
                 self.on_status_update("Ready")
             if self.on_animation_update:
@@ -160,7 +245,14 @@ class BackendController:
             logger.info("Starting audio recording...")
             # Register INPUT_AUDIO as temp file
             input_file = temp_file_manager.register_temp_file(Config.INPUT_AUDIO)
-            record_audio(input_file)
+            record_audio(
+                input_file,
+                phrase_time_limit=self._start_stage("capture"),
+                on_audio=self._on_partial_audio if self._speculates() else None,
+                audio_interval=Config.SPECULATION_INTERVAL
+            )
+            self.speech_ended_at = time.perf_counter()
+            self._finish_stage("capture")
             logger.info("Audio recording complete")
             return True
 
@@ -170,6 +262,16 @@ class BackendController:
                 self.on_error(f"Recording failed: {str(e)}")
             return False
 
+    def _speculates(self) -> bool:
+        """Speculation needs partial transcripts during capture, which only local faster-whisper provides."""
+        return Config.SPECULATIVE_GENERATION and Config.TRANSCRIPTION_MODEL == "faster-whisper"
+
+    def _on_partial_audio(self, wav_data: bytes):
+        """Transcribe the speech captured so far and hand it to the speculator."""
+        text = transcribe_partial(wav_data)
+        if text:
+            self.speculator.on_partial(text)
+
     def _transcribe_audio(self) -> Optional[str]:
         """
         Transcribe recorded audio to text.
@@ -189,8 +291,10 @@ class BackendController:
                 Config.TRANSCRIPTION_MODEL,
                 transcription_api_key,
                 Config.INPUT_AUDIO,
-                Config.LOCAL_MODEL_PATH
+                Config.LOCAL_MODEL_PATH,
+                timeout=self._start_stage("stt")
             )
+            self._finish_stage("stt")
 
             if not user_text:
                 logger.warning("Empty transcription received")
@@ -204,14 +308,14 @@ class BackendController:
             if self.on_message_add:
                 self.on_message_add(user_text, "user")
 
-            # Add to chat history
-            self.chat_history.append({"role": "user", "content": user_text})
-
             return user_text
 
         except Exception as e:
             logger.error(f"Transcription failed: {e}", exc_info=True)
-            if self.on_error:
+            if not self._finish_stage("stt"):
+                # Out of time: tell the user instead of showing an error dialog
+                self._speak_fallback()
+            elif self.on_error:
                 self.on_error(f"Transcription failed: {str(e)}")
             return None
 
@@ -232,13 +336,29 @@ class BackendController:
                 self.on_animation_update("thinking")
 
             logger.info("Generating response...")
-            response_api_key = get_response_api_key()
-            response_text = generate_response(
-                Config.RESPONSE_MODEL,
-                response_api_key,
-                self.chat_history,
-                Config.LOCAL_MODEL_PATH
-            )
+            # Also started on a speculation hit, so the stage measures the wait that is left
+            llm_timeout = self._start_stage("llm_first_token")
+            speculative_stream = self.speculator.take(user_text)
+            if speculative_stream is not None:
+                try:
+                    response_text = "".join(speculative_stream)
+                except Exception as e:
+                    logger.error(f"Speculative response failed: {e}")
+                    response_text = None
+            else:
+                model, api_key = self._response_model()
+                response_text = generate_response(
+                    model,
+                    api_key,
+                    self._build_prompt(user_text),
+                    Config.LOCAL_MODEL_PATH,
+                    timeout=llm_timeout
+                )
+            # Without streaming, the whole response is what arrives first
+            within_budget = self._finish_stage("llm_first_token")
+            if response_text is None:
+                self._handle_no_response(user_text, within_budget)
+                return None
 
             logger.info(f"Response: {response_text}")
 
@@ -247,7 +367,12 @@ class BackendController:
                 self.on_message_add(response_text, "assistant")
 
             # Add to chat history
-            self.chat_history.append({"role": "assistant", "content": response_text})
+            with self.history_lock:
+                self.chat_history.append({"role": "assistant", "content": response_text})
+            self.remember_conversation([
+                {"role": "user", "content": user_text},
+                {"role": "assistant", "content": response_text}
+            ])
 
             return response_text
 
@@ -257,12 +382,269 @@ class BackendController:
                 self.on_error(f"Response generation failed: {str(e)}")
             return None
 
-    def _text_to_speech(self, text: str) -> bool:
+    def _generate_and_speak(self, user_text: str) -> Optional[str]:
+        """
+        Generate the LLM response and speak it sentence by sentence as it streams.
+
+        Args:
+            user_text: The user's transcribed text
+
+        Returns:
+            str: LLM response text, or None if failed
+        """
+        try:
+            if self.on_status_update:
+                self.on_status_update("Thinking...")
+            if self.on_animation_update:
+                self.on_animation_update("thinking")
+
+            def on_first_audio():
+                self._finish_stage("tts_first_chunk")
+                if self.on_status_update:
+                    self.on_status_update("Speaking...")
+                if self.on_animation_update:
+                    self.on_animation_update("speaking")
+
+            logger.info("Generating and speaking response...")
+            self._got_first_token = False
+            # Also started on a speculation hit, so the stage measures the wait that is left
+            llm_timeout = self._start_stage("llm_first_token")
+            token_stream = self.speculator.take(user_text)
+            if token_stream is None:
+                model, api_key = self._response_model()
+                token_stream = generate_response_stream(
+                    model,
+                    api_key,
+                    self._build_prompt(user_text),
+                    Config.LOCAL_MODEL_PATH,
+                    timeout=llm_timeout
+                )
+            audio_files = []
+            tts_model = resolve_model("tts", Config.TTS_MODEL)
+            response_text = speak_pipelined(
+                self._track_first_token(token_stream),
+                tts_model,
+                get_api_key("tts", tts_model),
+                Config.LOCAL_MODEL_PATH,
+                speech_ended_at=self.speech_ended_at,
+                on_first_audio=on_first_audio,
+                audio_files=audio_files,
+                timeout=self.deadline.timeout("tts_first_chunk") if self.deadline else None
+            )
+            self.last_audio_files = audio_files
+            self.last_spoken_text = response_text
+
+            logger.info(f"Response: {response_text}")
+
+            # Add assistant message to chat
+            if self.on_message_add:
+                self.on_message_add(response_text, "assistant")
+
+            # Add to chat history
+            with self.history_lock:
+                self.chat_history.append({"role": "assistant", "content": response_text})
+            self.remember_conversation([
+                {"role": "user", "content": user_text},
+                {"role": "assistant", "content": response_text}
+            ])
+
+            return response_text
+
+        except Exception as e:
+            logger.error(f"Pipelined response failed: {e}", exc_info=True)
+            if not self._got_first_token:
+                # Nothing was said yet: tell the user instead of showing an error dialog
+                self._handle_no_response(user_text, self._finish_stage("llm_first_token"))
+            else:
+                self._forget_user_message(user_text)
+                if self.on_error:
+                    self.on_error(f"Response generation failed: {str(e)}")
+            return None
+
+    def _handle_no_response(self, user_text: str, within_budget: bool):
+        """
+        Speak a fallback message when no provider produced a response.
+
+        The fallback is not a real answer, so neither it nor the unanswered
+        question is kept in the chat history or long-term memory.
+
+        Args:
+            user_text: The user's transcribed text
+            within_budget: False if the LLM stage ran out of time, which speaks the deadline message
+        """
+        self._forget_user_message(user_text)
+        if not within_budget:
+            self._speak_fallback()
+            return
+        if self.on_message_add:
+            self.on_message_add(Config.LLM_UNAVAILABLE_MESSAGE, "assistant")
+        self._text_to_speech(Config.LLM_UNAVAILABLE_MESSAGE, timeout=Config.DEADLINE_FALLBACK_TIMEOUT)
+
+    def _forget_user_message(self, user_text: str):
+        """Remove the user message of a turn that got no answer from the chat history."""
+        with self.history_lock:
+            if self.chat_history and self.chat_history[-1] == {"role": "user", "content": user_text}:
+                self.chat_history.pop()
+
+    def _track_first_token(self, token_stream):
+        """Pass a token stream through, closing the LLM stage and opening the TTS stage on the first token."""
+        for delta in token_stream:
+            if not self._got_first_token:
+                self._got_first_token = True
+                self._finish_stage("llm_first_token")
+                self._start_stage("tts_first_chunk")
+            yield delta
+
+    def _start_stage(self, stage: str) -> Optional[float]:
+        """
+        Start a stage of the turn deadline.
+
+        Args:
+            stage: The stage name ('capture', 'stt', 'llm_first_token', 'tts_first_chunk')
+
+        Returns:
+            float: Timeout for the stage's provider call, or None without a deadline
+        """
+        return self.deadline.start(stage) if self.deadline else None
+
+    def _finish_stage(self, stage: str) -> bool:
+        """
+        Finish a stage of the turn deadline, logging the remaining budget.
+
+        Returns:
+            bool: True if the stage kept to its budget (always True without a deadline)
+        """
+        return self.deadline.finish(stage) if self.deadline else True
+
+    def _response_model(self):
+        """
+        Pick the response model, switching to the fast model when the turn is running out of time.
+
+        Returns:
+            tuple: (model, api_key)
+        """
+        model = Config.RESPONSE_MODEL
+        fast_model = Config.ROUTING_FAST_MODEL
+        if self.deadline and self.deadline.should_degrade() and fast_model and fast_model != model:
+            fast_key = get_api_key("response", fast_model)
+            if fast_key or fast_model not in ('openai', 'groq'):
+                logger.warning(f"Only {self.deadline.remaining():.1f}s left in the turn, "
+                               f"answering with {fast_model}")
+                return fast_model, fast_key
+        return model, get_response_api_key()
+
+    def _speak_fallback(self):
+        """Speak a short apology when the turn ran out of time."""
+        if self.on_message_add:
+            self.on_message_add(Config.DEADLINE_FALLBACK_MESSAGE, "assistant")
+        # The turn's budget is spent by now, so the apology gets its own timeout
+        self._text_to_speech(Config.DEADLINE_FALLBACK_MESSAGE, timeout=Config.DEADLINE_FALLBACK_TIMEOUT)
+
+    def _prepare_fallback_speech(self):
+        """Synthesize the deadline apology into the TTS cache in the background, so it plays instantly."""
+        if not (Config.TURN_DEADLINE_ENABLED and Config.TTS_CACHE_ENABLED):
+            return
+
+        def prepare():
+            try:
+                tts_model = resolve_model("tts", Config.TTS_MODEL)
+                file_format = None if streams_playback(tts_model) else get_output_format(tts_model)
+                warm_tts_cache(tts_model, get_api_key("tts", tts_model), Config.DEADLINE_FALLBACK_MESSAGE,
+                               file_format, timeout=Config.DEADLINE_FALLBACK_TIMEOUT)
+            except Exception as e:
+                logger.warning(f"Could not prepare the fallback message: {e}")
+
+        threading.Thread(target=prepare, daemon=True).start()
+
+    def _speculative_stream(self, user_text: str):
+        """
+        Start a response stream on a partial transcript.
+
+        The user message is not in chat_history yet, so it is appended to the
+        prompt here; on a hit the prompt is the same one the final transcript
+        would have produced.
+
+        Args:
+            user_text: The stable partial transcript
+
+        Returns:
+            iterator: Text deltas of the response
+        """
+        messages = self._build_prompt(user_text)
+        messages.append({"role": "user", "content": user_text})
+        return generate_response_stream(
+            Config.RESPONSE_MODEL,
+            get_response_api_key(),
+            messages,
+            Config.LOCAL_MODEL_PATH
+        )
+
+    def _get_memory(self) -> Optional[ConversationMemory]:
+        """Get the long-term memory index, loading it on first use."""
+        if not Config.MEMORY_ENABLED:
+            return None
+        if self._memory is None:
+            try:
+                self._memory = ConversationMemory()
+            except Exception as e:
+                logger.error(f"Failed to load conversation memory: {e}")
+                Config.MEMORY_ENABLED = False
+                return None
+        return self._memory
+
+    def _build_prompt(self, user_text: str) -> List[Dict[str, str]]:
+        """
+        Build the messages for a generation request.
+
+        Args:
+            user_text: The user's transcribed text
+
+        Returns:
+            list: A snapshot of the chat history, with relevant memories
+                inserted after the system prompt when memory is enabled
+        """
+        messages = self.compactor.snapshot(self.chat_history)
+        memory = self._get_memory()
+        if memory is None:
+            return messages
+
+        try:
+            context = memory.build_context_message(user_text, exclude=messages)
+        except Exception as e:
+            logger.error(f"Memory retrieval failed: {e}")
+            return messages
+        if context:
+            insert_at = 0
+            while insert_at < len(messages) and messages[insert_at]["role"] == "system":
+                insert_at += 1
+            messages.insert(insert_at, context)
+        return messages
+
+    def remember_conversation(self, messages: List[Dict[str, str]]):
+        """
+        Add messages to the long-term memory index, skipping ones already indexed.
+
+        Args:
+            messages: Chat messages to remember
+        """
+        memory = self._get_memory()
+        if memory is None:
+            return
+        try:
+            added = memory.add_messages(messages)
+            if added:
+                logger.info(f"Added {added} messages to conversation memory")
+        except Exception as e:
+            logger.error(f"Failed to update conversation memory: {e}")
+
+    def _text_to_speech(self, text: str, timeout: Optional[float] = None) -> bool:
         """
         Convert text to speech and play it.
 
         Args:
             text: The text to convert to speech
+            timeout: Seconds allowed per TTS request, outside the turn deadline
+                (by default the deadline's TTS stage decides)
 
         Returns:
             bool: True if successful, False otherwise
@@ -273,26 +655,52 @@ class BackendController:
             if self.on_animation_update:
                 self.on_animation_update("speaking")
 
+            staged = timeout is None
+            if staged:
+                timeout = self._start_stage("tts_first_chunk")
+            # The TTS stage ends when the first audio plays
+            on_first_audio = (lambda: self._finish_stage("tts_first_chunk")) if staged else None
+            tts_model = resolve_model("tts", Config.TTS_MODEL)
+            if is_long_text(text):
+                logger.info("Speaking long text in parallel chunks...")
+                self.last_audio_files = speak_long_text(
+                    text,
+                    tts_model,
+                    get_api_key("tts", tts_model),
+                    Config.LOCAL_MODEL_PATH,
+                    on_first_audio=on_first_audio,
+                    timeout=timeout
+                )
+                self.last_spoken_text = text
+                logger.info("Speech playback complete")
+                return True
+
             # Determine output file format and get temp file path
-            if Config.TTS_MODEL in ['openai', 'elevenlabs', 'melotts', 'cartesia']:
-                output_file = temp_file_manager.get_output_file('mp3')
-            else:
-                output_file = temp_file_manager.get_output_file('wav')
+            streamed = streams_playback(tts_model)
+            output_file = None if streamed else temp_file_manager.get_output_file(get_output_format(tts_model))
 
             logger.info("Generating speech...")
-            tts_api_key = get_tts_api_key()
+            tts_api_key = get_api_key("tts", tts_model)
             text_to_speech(
-                Config.TTS_MODEL,
+                tts_model,
                 tts_api_key,
                 text,
                 output_file,
-                Config.LOCAL_MODEL_PATH
+                Config.LOCAL_MODEL_PATH,
+                timeout=timeout,
+                on_first_audio=on_first_audio
             )
 
-            # Play audio (skip for cartesia as it streams)
-            if Config.TTS_MODEL != "cartesia":
+            # Play audio (skip for models that stream playback themselves)
+            if not streamed:
                 logger.info("Playing audio...")
+                if on_first_audio:
+                    on_first_audio()
                 play_audio(output_file)
+                self.last_audio_files = [output_file]
+            else:
+                self.last_audio_files = []
+            self.last_spoken_text = text
 
             logger.info("Speech playback complete")
             return True
@@ -303,16 +711,97 @@ class BackendController:
                 self.on_error(f"Text-to-speech failed: {str(e)}")
             return False
 
+    def read_conversation_aloud(self) -> bool:
+        """
+        Read the assistant's and user's messages aloud in a background thread.
+
+        Returns:
+            bool: True if reading started, False if a turn is running or there is nothing to read
+        """
+        if self.is_processing:
+            logger.warning("Already processing a conversation")
+            if self.on_status_update:
+                self.on_status_update("Busy, try again when the turn is over")
+            return False
+        with self.history_lock:
+            messages = [msg for msg in self.chat_history if msg["role"] in ("user", "assistant")]
+        if not messages:
+            if self.on_status_update:
+                self.on_status_update("Nothing to read yet")
+            return False
+
+        text = "\n".join(
+            f"{'You' if msg['role'] == 'user' else 'Verbi'} said: {msg['content']}" for msg in messages
+        )
+
+        def read():
+            try:
+                self._text_to_speech(text)
+            finally:
+                self.is_processing = False
+                if self.on_status_update:
+                    self.on_status_update("Ready")
+                if self.on_animation_update:
+                    self.on_animation_update("idle")
+
+        # Held like a turn, so a turn cannot start and share the mixer while the conversation is read
+        self.is_processing = True
+        self.deadline = None
+        threading.Thread(target=read, daemon=True).start()
+        return True
+
+    def _handle_intent(self, intent: IntentResult):
+        """
+        Carry out a locally matched voice command.
+
+        Args:
+            intent: The matched intent
+        """
+        if intent.action == "repeat":
+            self._repeat_last_answer()
+        elif intent.action in ("volume_up", "volume_down"):
+            step = Config.VOLUME_STEP if intent.action == "volume_up" else -Config.VOLUME_STEP
+            volume = set_volume(get_volume() + step)
+            if self.on_status_update:
+                self.on_status_update(f"Volume {volume:.0%}")
+        elif intent.action == "clear_history":
+            self.clear_history()
+            if self.on_history_cleared:
+                self.on_history_cleared()
+        elif intent.action == "exit":
+            intent.response = intent.response or "Goodbye!"
+
+        if intent.response:
+            if self.on_message_add:
+                self.on_message_add(intent.response, "assistant")
+            self._text_to_speech(intent.response)
+
+    def _repeat_last_answer(self):
+        """Replay the last spoken answer without calling the LLM or TTS."""
+        if self.last_audio_files:
+            if self.on_status_update:
+                self.on_status_update("Speaking...")
+            if self.on_animation_update:
+                self.on_animation_update("speaking")
+            for audio_file in self.last_audio_files:
+                play_audio(audio_file)
+        elif self.last_spoken_text:
+            # Streaming TTS models leave no file behind, so synthesize the text again
+            self._text_to_speech(self.last_spoken_text)
+        elif self.on_status_update:
+            self.on_status_update("Nothing to repeat yet")
+
     def clear_history(self):
         """Clear the conversation history."""
-        self.chat_history = [
-            {
-                "role": "system",
-                "content": """You are a helpful Assistant called Verbi.
-                You are friendly and fun and you will help the users with their requests.
-                Your answers are short and concise."""
-            }
-        ]
+        with self.history_lock:
+            self.chat_history = [
+                {
+                    "role": "system",
+                    "content": """You are a helpful Assistant called Verbi.
+                    You are friendly and fun and you will help the users with their requests.
+                    Your answers are short and concise."""
+                }
+            ]
         logger.info("Chat history cleared")
 
     def stop(self):
@@ -5,6 +5,7 @@ from typing import Optional
 import sys
 import os
 import logging
+import threading
 import tkinter as tk
 from tkinter import filedialog
 import json
@@ -54,7 +55,10 @@ class VerbiMainWindow(ctk.CTk):
             on_status_update=self.handle_status_update,
             on_animation_update=self.handle_animation_update,
             on_message_add=self.handle_message_add,
-            on_error=self.handle_error
+            on_error=self.handle_error,
+            on_model_state=self.handle_model_state,
+            on_history_cleared=self.handle_history_cleared,
+            on_breaker_state=self.handle_breaker_state
         )
 
         # Create menu bar
@@ -69,6 +73,9 @@ class VerbiMainWindow(ctk.CTk):
         # Setup keyboard shortcuts
         self.setup_keyboard_shortcuts()
 
+        # Warm up the local LLM in the background
+        self.backend.preload_models()
+
         # Bind close event
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
 
@@ -141,6 +148,7 @@ class VerbiMainWindow(ctk.CTk):
         file_menu.add_command(label="Load Conversation...", command=self.load_conversation, accelerator="Cmd+O")
         file_menu.add_command(label="Export as Text...", command=self.export_conversation_text)
         file_menu.add_command(label="Export as Markdown...", command=self.export_conversation_markdown)
+        file_menu.add_command(label="Read Conversation Aloud", command=self.read_conversation_aloud)
         file_menu.add_separator()
         file_menu.add_command(label="Settings", command=self.open_settings, accelerator="Cmd+,")
         file_menu.add_separator()
@@ -228,6 +236,24 @@ class VerbiMainWindow(ctk.CTk):
         )
         self.status_label.grid(row=0, column=1, sticky="e", padx=(0, 10))
 
+        # Local LLM model-ready state (only shown for Ollama / LM Studio)
+        self.model_state_label = ctk.CTkLabel(
+            header_frame,
+            text="",
+            font=ctk.CTkFont(size=12),
+            text_color=NeonTheme.TEXT_MUTED
+        )
+        self.model_state_label.grid(row=1, column=0, sticky="w")
+
+        # Providers whose circuit breaker is open (hidden while all are healthy)
+        self.breaker_state_label = ctk.CTkLabel(
+            header_frame,
+            text="",
+            font=ctk.CTkFont(size=12),
+            text_color=NeonTheme.TEXT_MUTED
+        )
+        self.breaker_state_label.grid(row=1, column=1, sticky="e", padx=(0, 10))
+
         # Settings button with neon theme
         settings_btn = ctk.CTkButton(
             header_frame,
@@ -455,6 +481,8 @@ class VerbiMainWindow(ctk.CTk):
         """Handle settings saved callback."""
         logger.info("Settings saved, updating UI")
         self.update_status("Settings updated")
+        # The response model may have changed, so warm up the new one
+        self.backend.preload_models()
 
     def update_status(self, message: str):
         """Update the status label."""
@@ -473,6 +501,40 @@ class VerbiMainWindow(ctk.CTk):
             self.after(0, lambda: self.mic_button.configure(state="normal"))
             self.after(0, lambda: self.stop_btn.configure(state="disabled"))
 
+    def handle_history_cleared(self):
+        """Handle the conversation being cleared by a voice command (thread-safe)."""
+        self.after(0, self.chat_area.clear_messages)
+
+    def handle_model_state(self, state: dict):
+        """Handle local LLM model-ready state changes from backend (thread-safe)."""
+        self.after(0, lambda: self.update_model_state(state))
+
+    def update_model_state(self, state: dict):
+        """Update the model-ready label."""
+        labels = {
+            "loading": ("Loading model...", NeonTheme.TEXT_SECONDARY),
+            "ready": (f"Model ready: {state.get('detail')}", NeonTheme.PRIMARY),
+            "failed": ("Model failed to load", NeonTheme.SECONDARY_PINK),
+        }
+        text, color = labels.get(state.get("state"), ("", NeonTheme.TEXT_MUTED))
+        self.model_state_label.configure(text=text, text_color=color)
+
+    def handle_breaker_state(self, states: dict):
+        """Handle provider circuit breaker state changes from backend (thread-safe)."""
+        self.after(0, lambda: self.update_breaker_state(states))
+
+    def update_breaker_state(self, states: dict):
+        """Update the label listing unhealthy providers."""
+        unhealthy = [
+            f"{name.split(':', 1)[1]} {name.split(':', 1)[0].upper()} "
+            f"{'recovering' if state == 'half_open' else 'down'}"
+            for name, state in sorted(states.items()) if state != "closed"
+        ]
+        if unhealthy:
+            self.breaker_state_label.configure(text=", ".join(unhealthy), text_color=NeonTheme.SECONDARY_PINK)
+        else:
+            self.breaker_state_label.configure(text="", text_color=NeonTheme.TEXT_MUTED)
+
     def handle_message_add(self, message: str, sender: str):
         """Handle adding messages from backend (thread-safe)."""
         self.after(0, lambda: self.chat_area.add_message(message, sender))
@@ -512,6 +574,8 @@ class VerbiMainWindow(ctk.CTk):
                         "timestamp": datetime.now().isoformat(),
                         "messages": self.backend.chat_history
                     }, f, indent=2)
+                # Index the conversation so it can inform future answers
+                self._remember_in_background(self.backend.chat_history)
                 self.update_status(f"Conversation saved")
                 logger.info(f"Conversation saved to {filename}")
             except Exception as e:
@@ -540,12 +604,28 @@ class VerbiMainWindow(ctk.CTk):
                     elif msg["role"] == "assistant":
                         self.chat_area.add_message(msg["content"], "assistant")
 
+                self._remember_in_background(self.backend.chat_history)
                 self.update_status("Conversation loaded")
                 logger.info(f"Conversation loaded from {filename}")
             except Exception as e:
                 logger.error(f"Error loading conversation: {e}")
                 self._show_error_dialog(f"Failed to load conversation: {str(e)}")
 
+    def read_conversation_aloud(self):
+        """Read the current (e.g. just loaded) conversation aloud."""
+        if self.backend.read_conversation_aloud():
+            self.mic_button.configure(state="disabled")
+            self.update_status("Reading conversation...")
+            self.status_indicator.set_state("speaking")
+
+    def _remember_in_background(self, messages):
+        """Add messages to the long-term memory without blocking the UI."""
+        threading.Thread(
+            target=self.backend.remember_conversation,
+            args=(list(messages),),
+            daemon=True
+        ).start()
+
     def export_conversation_text(self):
         """Export conversation as plain text file."""
         if not self.backend.chat_history or len(self.backend.chat_history) <= 1:
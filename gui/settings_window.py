@@ -110,7 +110,7 @@ class SettingsWindow(ctk.CTkToplevel):
         self.transcription_menu = ctk.CTkOptionMenu(
             transcription_frame,
             variable=self.transcription_var,
-            values=["openai", "groq", "deepgram", "fastwhisperapi", "faster-whisper", "local"],
+            values=["openai", "groq", "deepgram", "fastwhisperapi", "faster-whisper", "local", "auto"],
             width=200
         )
         self.transcription_menu.pack(side="right", padx=10, pady=10)
@@ -134,7 +134,7 @@ class SettingsWindow(ctk.CTkToplevel):
         self.response_menu = ctk.CTkOptionMenu(
             response_frame,
             variable=self.response_var,
-            values=["openai", "groq", "ollama", "lmstudio", "local"],
+            values=["openai", "groq", "ollama", "lmstudio", "local", "auto"],
             width=200
         )
         self.response_menu.pack(side="right", padx=10, pady=10)
@@ -158,7 +158,7 @@ class SettingsWindow(ctk.CTkToplevel):
         self.tts_menu = ctk.CTkOptionMenu(
             tts_frame,
             variable=self.tts_var,
-            values=["openai", "deepgram", "elevenlabs", "melotts", "cartesia", "piper", "pyttsx3", "local"],
+            values=["openai", "deepgram", "elevenlabs", "melotts", "cartesia", "piper", "pyttsx3", "local", "auto"],
             width=200
         )
         self.tts_menu.pack(side="right", padx=10, pady=10)
@@ -1,46 +1,243 @@
+import io
+import json
+import logging
+import os
+import queue
+import shutil
 import subprocess
+import tempfile
+import threading
+import uuid
+import wave
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
-from fastapi.responses import FileResponse
-import os
+from fastapi.responses import Response, StreamingResponse
 
-app = FastAPI()
+from voice_assistant.segmenter import split_sentences
+
+PIPER_EXECUTABLE = os.getenv("PIPER_EXECUTABLE", "./piper/piper")  # path to the piper binary
+PIPER_MODEL = os.getenv("PIPER_MODEL", "en_US-lessac-medium.onnx")  # path to the .onnx file
+# Each worker keeps its own copy of the voice loaded; one per two cores leaves room for onnxruntime threads
+PIPER_WORKERS = int(os.getenv("PIPER_WORKERS", max(1, (os.cpu_count() or 2) // 2)))
+# Seconds a worker may take for one request before it is killed and replaced
+PIPER_TIMEOUT = float(os.getenv("PIPER_TIMEOUT", "30"))
 
 
 class SynthesisRequest(BaseModel):
     text: str
 
+
+class PiperWorker:
+    """
+    A long-lived Piper process with the voice model loaded.
+
+    Requests are fed line by line with --json-input. Each one is written to
+    its own file in the worker's private directory, which is read into
+    memory and removed as soon as Piper reports it done. A worker that takes
+    longer than PIPER_TIMEOUT is killed.
+    """
+
+    def __init__(self, executable, model_path):
+        self.output_dir = tempfile.mkdtemp(prefix="piper_worker_")
+        self._stderr = deque(maxlen=20)
+        self.process = subprocess.Popen(
+            [executable, "--model", model_path, "--json-input"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            text=True, bufsize=1
+        )
+        # Piper logs to stderr; drain it so the pipe never fills up and blocks the worker
+        threading.Thread(target=self._drain_stderr, daemon=True).start()
+        # Finished files are read from stdout on a thread, so waiting for one can time out
+        self._done = queue.Queue()
+        threading.Thread(target=self._read_stdout, daemon=True).start()
+
+    @property
+    def alive(self):
+        return self.process.poll() is None
+
+    def synthesize(self, text):
+        """Synthesize text and return the WAV bytes."""
+        output_file = os.path.join(self.output_dir, f"{uuid.uuid4().hex}.wav")
+        self.process.stdin.write(json.dumps({"text": text, "output_file": output_file}) + "\n")
+        self.process.stdin.flush()
+        try:
+            done = self._done.get(timeout=PIPER_TIMEOUT)
+        except queue.Empty:
+            self._kill()
+            raise TimeoutError(f"Piper worker took longer than {PIPER_TIMEOUT:.0f}s")
+        if done is None:
+            # Reap the process so the pool sees it as dead and replaces it
+            self._kill()
+            raise RuntimeError("Piper worker exited: " + " ".join(self._stderr))
+        try:
+            with open(output_file, "rb") as f:
+                return f.read()
+        finally:
+            if os.path.exists(output_file):
+                os.remove(output_file)
+
+    def close(self):
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=5)
+        except Exception:
+            self.process.kill()
+        shutil.rmtree(self.output_dir, ignore_errors=True)
+
+    def _kill(self):
+        self.process.kill()
+        self.process.wait()
+
+    def _drain_stderr(self):
+        for line in self.process.stderr:
+            self._stderr.append(line.strip())
+
+    def _read_stdout(self):
+        # Piper prints the path of each finished file on stdout; None marks the end
+        for line in self.process.stdout:
+            self._done.put(line)
+        self._done.put(None)
+
+
+class PiperPool:
+    """Fixed pool of Piper workers; each request borrows one, so throughput scales with PIPER_WORKERS."""
+
+    def __init__(self, size, executable, model_path):
+        self.executable = executable
+        self.model_path = model_path
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._missing = 0
+        for _ in range(size):
+            self._idle.put(PiperWorker(executable, model_path))
+
+    def synthesize(self, text):
+        self._replace_missing()
+        try:
+            worker = self._idle.get(timeout=PIPER_TIMEOUT)
+        except queue.Empty:
+            raise RuntimeError("No Piper worker available")
+        try:
+            return worker.synthesize(text)
+        finally:
+            self._release(worker)
+
+    def _release(self, worker):
+        if worker.alive:
+            self._idle.put(worker)
+            return
+        # Replace a worker that died so the pool keeps its size
+        worker.close()
+        with self._lock:
+            self._missing += 1
+        self._replace_missing()
+
+    def _replace_missing(self):
+        with self._lock:
+            if not self._missing:
+                return
+            self._missing -= 1
+        try:
+            self._idle.put(PiperWorker(self.executable, self.model_path))
+        except Exception as e:
+            logging.error(f"Could not replace a Piper worker: {e}")
+            with self._lock:
+                self._missing += 1
+
+    def close(self):
+        while not self._idle.empty():
+            self._idle.get().close()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            if not os.path.isfile(PIPER_EXECUTABLE) or not os.access(PIPER_EXECUTABLE, os.X_OK):
+                raise HTTPException(status_code=500, detail="Piper binary not found or not executable!")
+            if not os.path.exists(PIPER_MODEL):
+                raise HTTPException(status_code=500, detail="Piper model file not found!")
+            _pool = PiperPool(PIPER_WORKERS, PIPER_EXECUTABLE, PIPER_MODEL)
+        return _pool
+
+
+# Synthesizes the sentences of streamed requests, one thread per Piper worker
+_executor = ThreadPoolExecutor(max_workers=PIPER_WORKERS, thread_name_prefix="piper")
+
+
+@asynccontextmanager
+async def lifespan(app):
+    try:
+        get_pool()
+    except HTTPException as e:
+        logging.error(f"Piper workers not started: {e.detail}")
+    yield
+    _executor.shutdown(wait=False, cancel_futures=True)
+    if _pool is not None:
+        _pool.close()
+
+
+app = FastAPI(lifespan=lifespan)
+
+
 @app.post("/synthesize/")
 def synthesize(request: SynthesisRequest):
-    output_file = "output.wav"
-    piper_executable = "./piper/piper"  #path to the piper binary 
-    model_path = "en_US-lessac-medium.onnx" #path to the .onnx file
+    pool = get_pool()
+    try:
+        audio = pool.synthesize(request.text)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Speech synthesis failed: {e}")
+    if not audio:
+        raise HTTPException(status_code=500, detail="Piper did not generate an audio file.")
+    return Response(content=audio, media_type="audio/wav")
 
-    
-    if not os.path.isfile(piper_executable) or not os.access(piper_executable, os.X_OK):
-        raise HTTPException(status_code=500, detail="Piper binary not found or not executable!")
 
-    
-    if not os.path.exists(model_path):
-        raise HTTPException(status_code=500, detail="Piper model file not found!")
+def _read_pcm(audio):
+    with wave.open(io.BytesIO(audio), "rb") as wav_file:
+        return wav_file.getframerate(), wav_file.readframes(wav_file.getnframes())
 
 
-    command = [piper_executable, "--model", model_path, "--output_file", output_file]
+@app.post("/synthesize/stream")
+def synthesize_stream(request: SynthesisRequest):
+    """
+    Synthesize sentence by sentence and stream raw 16-bit mono PCM over chunked HTTP.
+
+    Sentences are synthesized on the worker pool in parallel and sent in
+    order as each one finishes. The sample rate is in the X-Sample-Rate header.
+    """
+    pool = get_pool()
+    sentences = split_sentences(request.text) or [request.text]
+    futures = [_executor.submit(pool.synthesize, sentence) for sentence in sentences]
+
+    def cancel():
+        for future in futures:
+            future.cancel()
 
     try:
-        
-        process = subprocess.run(command, input=request.text.encode(), stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
-
-        
-        if os.path.exists(output_file):
-            return FileResponse(output_file, media_type="audio/wav")
-        else:
-            raise HTTPException(status_code=500, detail="Piper did not generate an audio file.")
-    
-    except subprocess.CalledProcessError as e:
-        error_message = e.stderr.decode() if e.stderr else "Unknown error"
-        raise HTTPException(status_code=500, detail=f"Speech synthesis failed: {error_message}")
+        sample_rate, first = _read_pcm(futures[0].result())
+    except Exception as e:
+        cancel()
+        raise HTTPException(status_code=500, detail=f"Speech synthesis failed: {e}")
+
+    def chunks():
+        try:
+            yield first
+            for future in futures[1:]:
+                yield _read_pcm(future.result())[1]
+        finally:
+            cancel()
+
+    return StreamingResponse(chunks(), media_type="audio/pcm",
+                             headers={"X-Sample-Rate": str(sample_rate)})
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=5000)
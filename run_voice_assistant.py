@@ -3,13 +3,21 @@
 import logging
 import time
 from colorama import Fore, init
-from voice_assistant.audio import record_audio, play_audio
+from voice_assistant.audio import record_audio, play_audio, set_volume, get_volume
 from voice_assistant.transcription import transcribe_audio
-from voice_assistant.response_generation import generate_response
+from voice_assistant.response_generation import generate_response, generate_response_stream
 from voice_assistant.text_to_speech import text_to_speech
+from voice_assistant.pipeline import speak_pipelined, get_output_format, streams_playback
+from voice_assistant.long_text import is_long_text, speak_long_text
+from voice_assistant.summarizer import HistoryCompactor
+from voice_assistant.memory import ConversationMemory
+from voice_assistant.deadline import TurnDeadline
+from voice_assistant.model_warmup import start_preload
+from voice_assistant.intents import intent_engine
 from voice_assistant.utils import delete_file
 from voice_assistant.config import Config
-from voice_assistant.api_key_manager import get_transcription_api_key, get_response_api_key, get_tts_api_key
+from voice_assistant.api_key_manager import get_api_key, get_transcription_api_key, get_response_api_key
+from voice_assistant.auto_select import resolve_model
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -19,6 +27,127 @@ init(autoreset=True)
 
 import threading
 
+# Long-term memory index, loaded on first use
+_memory = None
+
+
+def _speak(text, timeout=None):
+    """
+    Synthesize text with the configured TTS model and play it.
+
+    Args:
+    text (str): The text to speak.
+    timeout (float): Seconds allowed per TTS request, or None to wait as long as needed.
+
+    Returns:
+    list: The audio files that were played (empty for models that stream playback).
+    """
+    tts_model = resolve_model("tts", Config.TTS_MODEL)
+    if is_long_text(text):
+        # Synthesize sentence chunks in parallel and play them back in order
+        return speak_long_text(text, tts_model, get_api_key("tts", tts_model), Config.LOCAL_MODEL_PATH,
+                               timeout=timeout)
+
+    # Determine the output file format based on the TTS model
+    streamed = streams_playback(tts_model)
+    output_file = None if streamed else 'output.' + get_output_format(tts_model)
+
+    # Convert the text to speech and save it to the appropriate file
+    text_to_speech(tts_model, get_api_key("tts", tts_model), text, output_file, Config.LOCAL_MODEL_PATH,
+                   timeout=timeout)
+
+    # Play the generated speech audio
+    if streamed:
+        return []
+    play_audio(output_file)
+    return [output_file]
+
+
+def _start_stage(deadline, stage):
+    """Start a stage of the turn deadline, returning its timeout (None without a deadline)."""
+    return deadline.start(stage) if deadline else None
+
+
+def _finish_stage(deadline, stage):
+    """Finish a stage of the turn deadline, returning whether it kept to its budget."""
+    return deadline.finish(stage) if deadline else True
+
+
+def _response_model(deadline):
+    """
+    Pick the response model, switching to the fast model when the turn is running out of time.
+
+    Args:
+    deadline (TurnDeadline): The turn's deadline, or None.
+
+    Returns:
+    tuple: (model, api_key)
+    """
+    model = Config.RESPONSE_MODEL
+    fast_model = Config.ROUTING_FAST_MODEL
+    if deadline and deadline.should_degrade() and fast_model and fast_model != model:
+        fast_key = get_api_key("response", fast_model)
+        if fast_key or fast_model not in ('openai', 'groq'):
+            logging.warning(f"Only {deadline.remaining():.1f}s left in the turn, answering with {fast_model}")
+            return fast_model, fast_key
+    return model, get_response_api_key()
+
+
+def _get_memory():
+    """Get the long-term memory index, loading it on first use (None when memory is off)."""
+    global _memory
+    if not Config.MEMORY_ENABLED:
+        return None
+    if _memory is None:
+        try:
+            _memory = ConversationMemory()
+        except Exception as e:
+            logging.error(f"Failed to load conversation memory: {e}")
+            Config.MEMORY_ENABLED = False
+            return None
+    return _memory
+
+
+def _build_prompt(messages, user_input):
+    """
+    Insert memories relevant to the user's input after the system prompt.
+
+    Args:
+    messages (list): A snapshot of the chat history.
+    user_input (str): The user's transcribed text.
+
+    Returns:
+    list: The messages to send to the LLM.
+    """
+    memory = _get_memory()
+    if memory is None:
+        return messages
+    try:
+        context = memory.build_context_message(user_input, exclude=messages)
+    except Exception as e:
+        logging.error(f"Memory retrieval failed: {e}")
+        return messages
+    if context:
+        insert_at = 0
+        while insert_at < len(messages) and messages[insert_at]["role"] == "system":
+            insert_at += 1
+        messages.insert(insert_at, context)
+    return messages
+
+
+def _remember(user_input, response_text):
+    """Add a question and its answer to the long-term memory index."""
+    memory = _get_memory()
+    if memory is None:
+        return
+    try:
+        memory.add_messages([
+            {"role": "user", "content": user_input},
+            {"role": "assistant", "content": response_text}
+        ])
+    except Exception as e:
+        logging.error(f"Failed to update conversation memory: {e}")
+
 
 def main():
     """
@@ -29,17 +158,45 @@ def main():
          You are friendly and fun and you will help the users with their requests.
          Your answers are short and concise. """}
     ]
+    compactor = HistoryCompactor()
+    # Files of the last spoken answer, replayed on "repeat that"
+    last_audio_files = []
+    # Text of the last spoken answer, synthesized again when it left no files (streamed playback)
+    last_spoken_text = None
+
+    # Load the local LLM while the first question is being recorded
+    if Config.LOCAL_LLM_PRELOAD:
+        start_preload(Config.RESPONSE_MODEL, chat_history[0]["content"])
 
     while True:
         try:
+            # Summarize older turns in the background while we wait for the user
+            if Config.HISTORY_SUMMARIZATION:
+                compactor.maybe_compact(chat_history)
+
+            # Each turn has a deadline split into stage budgets, passed to provider calls as timeouts
+            deadline = TurnDeadline() if Config.TURN_DEADLINE_ENABLED else None
+
             # Record audio from the microphone and save it as 'test.wav'
-            record_audio(Config.INPUT_AUDIO)
+            record_audio(Config.INPUT_AUDIO, phrase_time_limit=_start_stage(deadline, "capture"))
+            speech_ended_at = time.perf_counter()
+            _finish_stage(deadline, "capture")
 
             # Get the API key for transcription
             transcription_api_key = get_transcription_api_key()
             
             # Transcribe the audio file
-            user_input = transcribe_audio(Config.TRANSCRIPTION_MODEL, transcription_api_key, Config.INPUT_AUDIO, Config.LOCAL_MODEL_PATH)
+            try:
+                user_input = transcribe_audio(Config.TRANSCRIPTION_MODEL, transcription_api_key, Config.INPUT_AUDIO,
+                                              Config.LOCAL_MODEL_PATH, timeout=_start_stage(deadline, "stt"))
+            except Exception:
+                if _finish_stage(deadline, "stt"):
+                    raise
+                # Out of time: apologize instead of going silent
+                last_audio_files = _speak(Config.DEADLINE_FALLBACK_MESSAGE, Config.DEADLINE_FALLBACK_TIMEOUT)
+                last_spoken_text = Config.DEADLINE_FALLBACK_MESSAGE
+                continue
+            _finish_stage(deadline, "stt")
 
             # Check if the transcription is empty and restart the recording if it is. This check will avoid empty requests if vad_filter is used in the fastwhisperapi.
             if not user_input:
@@ -47,40 +204,78 @@ def main():
                 continue
             logging.info(Fore.GREEN + "You said: " + user_input + Fore.RESET)
 
-            # Check if the user wants to exit the program
-            if "goodbye" in user_input.lower() or "arrivederci" in user_input.lower():
-                break
+            # Answer common commands locally, without the LLM
+            intent = intent_engine.match(user_input) if Config.LOCAL_INTENTS else None
+            if intent:
+                logging.info(f"Handling intent locally: {intent.name}")
+                if intent.action == "exit":
+                    break
+                elif intent.action == "repeat":
+                    if last_audio_files:
+                        for audio_file in last_audio_files:
+                            play_audio(audio_file)
+                    elif last_spoken_text:
+                        last_audio_files = _speak(last_spoken_text)
+                elif intent.action in ("volume_up", "volume_down"):
+                    step = Config.VOLUME_STEP if intent.action == "volume_up" else -Config.VOLUME_STEP
+                    logging.info(f"Volume {set_volume(get_volume() + step):.0%}")
+                elif intent.action == "clear_history":
+                    with compactor.lock:
+                        del chat_history[1:]
+                if intent.response:
+                    last_audio_files = _speak(intent.response)
+                    last_spoken_text = intent.response
+                continue
 
             # Append the user's input to the chat history
-            chat_history.append({"role": "user", "content": user_input})
+            with compactor.lock:
+                chat_history.append({"role": "user", "content": user_input})
+
+            # Pick the model and API key for response generation
+            response_model, response_api_key = _response_model(deadline)
+            prompt = _build_prompt(compactor.snapshot(chat_history), user_input)
+            llm_timeout = _start_stage(deadline, "llm_first_token")
 
-            # Get the API key for response generation
-            response_api_key = get_response_api_key()
+            # Pipelined mode: speak each sentence while later ones are still generating
+            if Config.PIPELINED_TURNS:
+                tts_model = resolve_model("tts", Config.TTS_MODEL)
+                response_text = speak_pipelined(
+                    generate_response_stream(response_model, response_api_key, prompt, Config.LOCAL_MODEL_PATH,
+                                             timeout=llm_timeout),
+                    tts_model, get_api_key("tts", tts_model), Config.LOCAL_MODEL_PATH,
+                    speech_ended_at=speech_ended_at,
+                    audio_files=last_audio_files,
+                    timeout=deadline.timeout("tts_first_chunk") if deadline else None
+                )
+                logging.info(Fore.CYAN + "Response: " + response_text + Fore.RESET)
+                last_spoken_text = response_text
+                with compactor.lock:
+                    chat_history.append({"role": "assistant", "content": response_text})
+                _remember(user_input, response_text)
+                continue
 
             # Generate a response
-            response_text = generate_response(Config.RESPONSE_MODEL, response_api_key, chat_history, Config.LOCAL_MODEL_PATH)
+            response_text = generate_response(response_model, response_api_key, prompt, Config.LOCAL_MODEL_PATH,
+                                              timeout=llm_timeout)
+            within_budget = _finish_stage(deadline, "llm_first_token")
+            if response_text is None:
+                # Every provider failed: apologize, and keep the unanswered question out of the history
+                with compactor.lock:
+                    chat_history.pop()
+                message = Config.LLM_UNAVAILABLE_MESSAGE if within_budget else Config.DEADLINE_FALLBACK_MESSAGE
+                last_audio_files = _speak(message, Config.DEADLINE_FALLBACK_TIMEOUT)
+                last_spoken_text = message
+                continue
             logging.info(Fore.CYAN + "Response: " + response_text + Fore.RESET)
 
             # Append the assistant's response to the chat history
-            chat_history.append({"role": "assistant", "content": response_text})
-
-            # Determine the output file format based on the TTS model
-            if Config.TTS_MODEL == 'openai' or Config.TTS_MODEL == 'elevenlabs' or Config.TTS_MODEL == 'melotts' or Config.TTS_MODEL == 'cartesia':
-                output_file = 'output.mp3'
-            else:
-                output_file = 'output.wav'
-
-            # Get the API key for TTS
-            tts_api_key = get_tts_api_key()
-
-            # Convert the response text to speech and save it to the appropriate file
-            text_to_speech(Config.TTS_MODEL, tts_api_key, response_text, output_file, Config.LOCAL_MODEL_PATH)
+            with compactor.lock:
+                chat_history.append({"role": "assistant", "content": response_text})
+            _remember(user_input, response_text)
 
-            # Play the generated speech audio
-            if Config.TTS_MODEL=="cartesia":
-                pass
-            else:
-                play_audio(output_file)
+            # Convert the response text to speech and play it
+            last_audio_files = _speak(response_text, _start_stage(deadline, "tts_first_chunk"))
+            last_spoken_text = response_text
             
             # Clean up audio files
             # delete_file(Config.INPUT_AUDIO)
@@ -89,8 +284,9 @@ def main():
         except Exception as e:
             logging.error(Fore.RED + f"An error occurred: {e}" + Fore.RESET)
             delete_file(Config.INPUT_AUDIO)
-            if 'output_file' in locals():
+            for output_file in last_audio_files:
                 delete_file(output_file)
+            last_audio_files = []
             time.sleep(1)
 
 if __name__ == "__main__":
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test script for the token-budgeted chat history window.
+"""
+
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from voice_assistant.config import Config
+from voice_assistant.chat_history import HistoryWindow
+
+
+def _conversation():
+    return [
+        {"role": "system", "content": "You are Verbi, a helpful voice assistant."},
+        {"role": "user", "content": "Tell me about the history of Rome. " * 5},
+        {"role": "assistant", "content": "Rome was founded, according to legend, in 753 BC. " * 5},
+        {"role": "user", "content": "And what about Carthage? " * 5},
+        {"role": "assistant", "content": "Carthage was a Phoenician city in North Africa. " * 5},
+        {"role": "user", "content": "Who won the Punic Wars?"},
+    ]
+
+
+def _with_budget(budget, fn):
+    saved = Config.HISTORY_TOKEN_BUDGETS
+    Config.HISTORY_TOKEN_BUDGETS = {"test-model": budget}
+    try:
+        return fn()
+    finally:
+        Config.HISTORY_TOKEN_BUDGETS = saved
+
+
+def test_everything_fits():
+    """A history within the budget is sent unchanged."""
+    window = HistoryWindow()
+    messages = _conversation()
+    sent = _with_budget(100000, lambda: window.apply(messages, "test-model"))
+    assert sent == messages
+    assert window.last_stats["tokens_saved"] == 0
+
+
+def test_oldest_turns_are_dropped():
+    """The system prompt and the most recent turns that fit are kept; the input is not modified."""
+    window = HistoryWindow()
+    messages = _conversation()
+    budget = window.count_messages([messages[0]] + messages[3:])
+    sent = _with_budget(budget, lambda: window.apply(messages, "test-model"))
+    assert sent == [messages[0]] + messages[3:]
+    assert len(messages) == 6
+    stats = window.last_stats
+    assert stats["messages_sent"] == 4 and stats["budget"] == budget
+    assert stats["tokens_sent"] == budget
+    assert stats["tokens_saved"] == stats["tokens_total"] - budget
+
+
+def test_window_does_not_start_with_an_orphaned_reply():
+    """An assistant reply whose question was dropped is dropped too."""
+    window = HistoryWindow()
+    messages = _conversation()
+    budget = window.count_messages([messages[0]] + messages[2:])
+    sent = _with_budget(budget, lambda: window.apply(messages, "test-model"))
+    assert sent == [messages[0]] + messages[3:]
+
+
+def test_latest_message_is_always_sent():
+    """The latest message is sent even if it alone exceeds the budget."""
+    window = HistoryWindow()
+    messages = _conversation()
+    sent = _with_budget(1, lambda: window.apply(messages, "test-model"))
+    assert sent == [messages[0], messages[-1]]
+
+
+if __name__ == "__main__":
+    test_everything_fits()
+    test_oldest_turns_are_dropped()
+    test_window_does_not_start_with_an_orphaned_reply()
+    test_latest_message_is_always_sent()
+    print("✓ All chat history tests passed")
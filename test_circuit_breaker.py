@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Test script for the provider circuit breakers and fallback chains.
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from voice_assistant.config import Config
+from voice_assistant.circuit_breaker import CLOSED, HALF_OPEN, OPEN, BreakerRegistry, CircuitBreaker
+
+_SETTINGS = ("BREAKER_FAILURE_THRESHOLD", "BREAKER_WINDOW", "BREAKER_ERROR_RATE",
+             "BREAKER_SLOW_CALL_SECONDS", "BREAKER_RECOVERY_SECONDS")
+
+
+def _configure(**overrides):
+    saved = {name: getattr(Config, name) for name in _SETTINGS}
+    Config.BREAKER_FAILURE_THRESHOLD = 3
+    Config.BREAKER_WINDOW = 10
+    Config.BREAKER_ERROR_RATE = 0.5
+    Config.BREAKER_SLOW_CALL_SECONDS = 10.0
+    Config.BREAKER_RECOVERY_SECONDS = 30.0
+    for name, value in overrides.items():
+        setattr(Config, name, value)
+    return saved
+
+
+def _restore(saved):
+    for name, value in saved.items():
+        setattr(Config, name, value)
+
+
+def test_opens_after_consecutive_failures():
+    """The breaker opens after the failure threshold and then rejects calls."""
+    saved = _configure()
+    try:
+        changes = []
+        breaker = CircuitBreaker("llm:test", on_change=lambda b: changes.append(b.state))
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.state == CLOSED and breaker.allow()
+        breaker.record_success(0.1)
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.state == CLOSED, "a success resets the consecutive count"
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert not breaker.allow()
+        assert changes == [OPEN]
+    finally:
+        _restore(saved)
+
+
+def test_opens_on_error_rate():
+    """The breaker opens when the error rate over a full window reaches the limit."""
+    saved = _configure(BREAKER_WINDOW=4)
+    try:
+        breaker = CircuitBreaker("llm:test")
+        for _ in range(2):
+            breaker.record_success(0.1)
+            breaker.record_failure()
+        assert breaker.state == OPEN
+    finally:
+        _restore(saved)
+
+
+def test_half_open_probe():
+    """After the recovery time one probe is let through; its outcome closes or re-opens the breaker."""
+    saved = _configure(BREAKER_FAILURE_THRESHOLD=1, BREAKER_RECOVERY_SECONDS=0.02)
+    try:
+        breaker = CircuitBreaker("tts:test")
+        breaker.record_failure()
+        assert not breaker.allow()
+        time.sleep(0.03)
+        assert breaker.allow()
+        assert breaker.state == HALF_OPEN
+        assert not breaker.allow(), "only one probe at a time"
+        breaker.record_failure()
+        assert breaker.state == OPEN and not breaker.allow()
+
+        time.sleep(0.03)
+        assert breaker.allow()
+        breaker.record_success(0.1)
+        assert breaker.state == CLOSED and breaker.allow()
+    finally:
+        _restore(saved)
+
+
+def test_slow_calls_count_as_failures():
+    """A call slower than the slow-call limit counts against the provider."""
+    saved = _configure(BREAKER_FAILURE_THRESHOLD=2, BREAKER_SLOW_CALL_SECONDS=0.5)
+    try:
+        breaker = CircuitBreaker("stt:test")
+        breaker.record_success(1.0)
+        breaker.record_success(1.0)
+        assert breaker.state == OPEN
+    finally:
+        _restore(saved)
+
+
+def test_registry_falls_back_and_skips_open_providers():
+    """Calls fall back along the chain, and providers with an open breaker are skipped."""
+    saved = _configure(BREAKER_FAILURE_THRESHOLD=1)
+    try:
+        registry = BreakerRegistry()
+        changes, outcomes, attempted = [], [], []
+        registry.add_listener(lambda name, state: changes.append((name, state)))
+        registry.add_observer(lambda kind, provider, latency, ok: outcomes.append((provider, ok)))
+
+        def answer(provider):
+            attempted.append(provider)
+            if provider == "groq":
+                raise ConnectionError("down")
+            return f"from {provider}"
+
+        assert registry.call("llm", ["groq", "openai"], answer) == ("openai", "from openai")
+        assert changes == [("llm:groq", OPEN)]
+        assert outcomes == [("groq", False), ("openai", True)]
+
+        attempted.clear()
+        assert registry.call("llm", ["groq", "openai"], answer) == ("openai", "from openai")
+        assert attempted == ["openai"]
+        assert registry.get_states() == {"llm:groq": OPEN, "llm:openai": CLOSED}
+    finally:
+        _restore(saved)
+
+
+def test_registry_streams_fall_back_before_the_first_token():
+    """A stream falls back if it fails before its first token; a later failure counts against its provider."""
+    saved = _configure(BREAKER_FAILURE_THRESHOLD=1)
+    try:
+        registry = BreakerRegistry()
+
+        def open_stream(provider):
+            if provider == "groq":
+                raise ConnectionError("down")
+            return provider, iter(["Hello", " world"])
+
+        served_by, stream = registry.stream("llm", ["groq", "openai"], open_stream)
+        assert served_by == "openai"
+        assert list(stream) == ["Hello", " world"]
+
+        def breaks(provider):
+            yield "Hello"
+            raise ConnectionError("reset")
+
+        served_by, stream = registry.stream("llm", ["openai"], lambda provider: (provider, breaks(provider)))
+        try:
+            list(stream)
+            assert False, "expected the error to be raised"
+        except ConnectionError:
+            pass
+        assert registry.get_states()["llm:openai"] == OPEN
+    finally:
+        _restore(saved)
+
+
+def test_registry_records_the_provider_that_answered():
+    """A hedged answer counts for the provider that gave it, not the one the chain called."""
+    saved = _configure()
+    try:
+        registry = BreakerRegistry()
+        outcomes = []
+        registry.add_observer(lambda kind, provider, latency, ok: outcomes.append((provider, ok)))
+        answer = registry.call("stt", ["groq"], lambda provider: ("openai", "text"), lambda result: result[0])
+        assert answer == ("openai", ("openai", "text"))
+        assert outcomes == [("openai", True)]
+    finally:
+        _restore(saved)
+
+
+def test_registry_async_calls_fall_back():
+    """The async variants fall back along the chain like the sync ones."""
+    saved = _configure(BREAKER_FAILURE_THRESHOLD=1)
+    try:
+        registry = BreakerRegistry()
+
+        async def answer(provider):
+            if provider == "groq":
+                raise ConnectionError("down")
+            return f"from {provider}"
+
+        assert asyncio.run(registry.call_async("llm", ["groq", "openai"], answer)) == ("openai", "from openai")
+
+        async def tokens():
+            yield "Hello"
+            yield " world"
+
+        async def open_stream(provider):
+            if provider == "groq":
+                raise ConnectionError("down")
+            return provider, tokens()
+
+        async def collect():
+            served_by, stream = await registry.stream_async("llm", ["groq", "openai"], open_stream)
+            return served_by, [delta async for delta in stream]
+
+        assert asyncio.run(collect()) == ("openai", ["Hello", " world"])
+        assert registry.get_states() == {"llm:groq": OPEN, "llm:openai": CLOSED}
+    finally:
+        _restore(saved)
+
+
+if __name__ == "__main__":
+    test_opens_after_consecutive_failures()
+    test_opens_on_error_rate()
+    test_half_open_probe()
+    test_slow_calls_count_as_failures()
+    test_registry_falls_back_and_skips_open_providers()
+    test_registry_streams_fall_back_before_the_first_token()
+    test_registry_records_the_provider_that_answered()
+    test_registry_async_calls_fall_back()
+    print("✓ All circuit breaker tests passed")
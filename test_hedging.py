@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test script for hedged provider calls.
+"""
+
+import os
+import sys
+import threading
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from voice_assistant.config import Config
+from voice_assistant.hedging import Hedger, LatencyTracker
+
+
+def _hedger(kind, delay=0.05):
+    """A hedger whose primary ('groq') has an observed p90 latency of `delay`."""
+    tracker = LatencyTracker()
+    for _ in range(Config.HEDGE_MIN_SAMPLES):
+        tracker.record((kind, "groq"), delay)
+    return Hedger(tracker)
+
+
+def test_fast_primary_is_not_hedged():
+    """A primary that answers within the hedge delay never starts the secondary."""
+    called = []
+
+    def answer(provider):
+        called.append(provider)
+        return f"from {provider}"
+
+    assert _hedger("stt").call("stt", "groq", "openai", answer) == ("groq", "from groq")
+    assert called == ["groq"]
+
+
+def test_slow_primary_is_hedged_and_the_loser_discarded():
+    """The secondary answers for a slow primary; the primary's late result is discarded."""
+    discarded = threading.Event()
+
+    def answer(provider):
+        if provider == "groq":
+            time.sleep(0.2)
+        return provider
+
+    hedger = _hedger("llm")
+    assert hedger.call("llm", "groq", "openai", answer, discard=lambda value: discarded.set()) == ("openai", "openai")
+    assert discarded.wait(1)
+    assert hedger.get_stats()["openai"]["wins"] == 1
+
+
+def test_early_failure_hedges_at_once():
+    """A primary failing before the hedge delay hands over to the secondary straight away."""
+    hedger = _hedger("stt", delay=5.0)
+
+    def answer(provider):
+        if provider == "groq":
+            raise ConnectionError("down")
+        return provider
+
+    start = time.perf_counter()
+    assert hedger.call("stt", "groq", "openai", answer) == ("openai", "openai")
+    assert time.perf_counter() - start < 1
+
+
+def test_wait_is_bounded_by_the_timeout():
+    """Two hung providers raise a TimeoutError instead of hanging the turn."""
+    def hang(provider):
+        time.sleep(1)
+        return provider
+
+    start = time.perf_counter()
+    try:
+        _hedger("stt").call("stt", "groq", "openai", hang, timeout=0.2)
+        assert False, "expected a timeout"
+    except TimeoutError:
+        pass
+    assert time.perf_counter() - start < 0.5
+
+
+if __name__ == "__main__":
+    test_fast_primary_is_not_hedged()
+    test_slow_primary_is_hedged_and_the_loser_discarded()
+    test_early_failure_hedges_at_once()
+    test_wait_is_bounded_by_the_timeout()
+    print("✓ All hedging tests passed")
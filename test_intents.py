@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Test script for the local fast-path intent engine.
+"""
+
+import os
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from voice_assistant.intents import IntentEngine, IntentResult, build_default_engine
+
+
+def test_builtin_commands():
+    """Common commands are recognized regardless of politeness and punctuation."""
+    engine = build_default_engine()
+    expected = {
+        "Hey Verbi, could you repeat that please?": "repeat",
+        "Louder!": "volume_up",
+        "turn it down": "volume_down",
+        "What time is it?": "time",
+        "Clear the conversation": "clear_history",
+        "Okay, goodbye for now": "exit",
+    }
+    for text, name in expected.items():
+        result = engine.match(text)
+        assert result is not None and result.name == name, f"{text!r} -> {result}"
+
+
+def test_questions_go_to_the_llm():
+    """Anything that isn't a known command is left for the LLM."""
+    engine = build_default_engine()
+    for text in ["What is the capital of France?", "Stop worrying and tell me a story",
+                 "Can you repeat the steps for making bread?"]:
+        assert engine.match(text) is None, text
+
+
+def test_time_is_answered_locally():
+    """Time questions carry a spoken answer."""
+    result = build_default_engine().match("what's the time")
+    assert result.action == "speak"
+    assert result.response.startswith("It's")
+
+
+def test_custom_intents():
+    """Intents can be registered and removed at runtime."""
+    engine = IntentEngine()
+    engine.register("lights_on", [r"(turn|switch) on the lights"],
+                    lambda command: IntentResult("lights_on", "speak", "Lights on."))
+    assert engine.match("Please turn on the lights").response == "Lights on."
+    engine.unregister("lights_on")
+    assert engine.match("turn on the lights") is None
+
+
+def test_matching_is_fast():
+    """Matching a non-command transcript takes microseconds, not milliseconds."""
+    engine = build_default_engine()
+    start = time.perf_counter()
+    for _ in range(1000):
+        engine.match("What is the weather going to be like in Paris tomorrow afternoon?")
+    per_call = (time.perf_counter() - start) / 1000
+    assert per_call < 0.001, per_call
+
+
+if __name__ == "__main__":
+    test_builtin_commands()
+    test_questions_go_to_the_llm()
+    test_time_is_answered_locally()
+    test_custom_intents()
+    test_matching_is_fast()
+    print("✓ All intent tests passed")
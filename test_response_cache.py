@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Test script for the LLM response cache.
+"""
+
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from voice_assistant.response_cache import ResponseCache, normalize_query
+
+
+def _ask(text):
+    return [{"role": "system", "content": "You are Verbi."}, {"role": "user", "content": text}]
+
+
+def test_exact_repeat_hits():
+    """The same question with different punctuation, case and filler words is served from the cache."""
+    cache = ResponseCache(max_entries=10, ttl=60, similarity_threshold=0.9)
+    cache.store("groq", _ask("What is the capital of France?"), "Paris.")
+    assert cache.lookup("groq", _ask("um, what is the capital of france")) == "Paris."
+    assert cache.get_stats()["exact_hits"] == 1
+
+
+def test_near_misses_do_not_hit():
+    """Queries that differ in one number or content word never get each other's answer."""
+    cache = ResponseCache(max_entries=10, ttl=60, similarity_threshold=0.9)
+    pairs = [
+        ("What is 12 plus 30?", "What is 12 plus 31?", "42"),
+        ("Translate hello into Spanish", "Translate hello into Danish", "hola"),
+        ("Is 13 a prime number", "Is 15 a prime number", "yes"),
+        ("Is it safe to eat raw eggs", "Is it not safe to eat raw eggs", "Mostly."),
+    ]
+    for stored, asked, answer in pairs:
+        cache.store("groq", _ask(stored), answer)
+    for _, asked, _ in pairs:
+        assert cache.lookup("groq", _ask(asked)) is None, asked
+    assert cache.get_stats()["similar_hits"] == 0
+
+
+def test_stopword_variants_hit():
+    """Rephrasings that only differ in stopwords are near-duplicates."""
+    cache = ResponseCache(max_entries=10, ttl=60, similarity_threshold=0.8)
+    cache.store("groq", _ask("What is the boiling point of water?"), "100 degrees Celsius.")
+    assert cache.lookup("groq", _ask("what's the boiling point of water")) == "100 degrees Celsius."
+    assert cache.get_stats()["similar_hits"] == 1
+
+
+def test_model_and_context_are_part_of_the_key():
+    """A cached answer is only reused for the same model and preceding turns."""
+    cache = ResponseCache(max_entries=10, ttl=60, similarity_threshold=0.9)
+    cache.store("groq", _ask("Who wrote it?"), "Tolkien.")
+    assert cache.lookup("openai", _ask("Who wrote it?")) is None
+    other_context = [{"role": "user", "content": "Tell me about Dune"},
+                     {"role": "assistant", "content": "A novel."},
+                     {"role": "user", "content": "Who wrote it?"}]
+    assert cache.lookup("groq", other_context) is None
+
+
+def test_time_sensitive_queries_are_skipped():
+    """Queries whose answer changes with the moment are never cached."""
+    cache = ResponseCache(max_entries=10, ttl=60, similarity_threshold=0.9)
+    cache.store("groq", _ask("What's the weather today?"), "Sunny.")
+    assert cache.lookup("groq", _ask("What's the weather today?")) is None
+    assert normalize_query("Hey Verbi, OK, tell me!") == "tell me"
+
+
+if __name__ == "__main__":
+    test_exact_repeat_hits()
+    test_near_misses_do_not_hit()
+    test_stopword_variants_hit()
+    test_model_and_context_are_part_of_the_key()
+    test_time_sensitive_queries_are_skipped()
+    print("✓ All response cache tests passed")
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Test script for provider rate limiting and retries.
+"""
+
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from voice_assistant.config import Config
+from voice_assistant.retry import RetryPolicy, TokenBucket, get_retry_after, is_retryable
+
+
+class _HTTPError(Exception):
+    def __init__(self, status, headers=None):
+        super().__init__(f"HTTP {status}")
+        self.status_code = status
+        self.response = SimpleNamespace(status_code=status, headers=headers or {})
+
+
+def _fast_policy():
+    Config.RETRY_ENABLED = True
+    Config.RETRY_MAX_ATTEMPTS = 3
+    Config.RETRY_BASE_DELAY = 0.001
+    Config.RETRY_MAX_DELAY = 0.01
+    return RetryPolicy()
+
+
+def _restore(saved):
+    for name, value in saved.items():
+        setattr(Config, name, value)
+
+
+def _save():
+    return {name: getattr(Config, name) for name in
+            ("RETRY_ENABLED", "RETRY_MAX_ATTEMPTS", "RETRY_BASE_DELAY", "RETRY_MAX_DELAY")}
+
+
+def test_token_bucket_allows_a_burst_then_waits():
+    """A full bucket serves its burst at once, then paces requests at its rate."""
+    bucket = TokenBucket(rate=50, capacity=2)
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0
+    start = time.monotonic()
+    assert bucket.acquire() > 0
+    assert time.monotonic() - start >= 0.015
+
+
+def test_token_bucket_gives_up_at_the_timeout():
+    """A wait longer than the timeout raises straight away instead of sleeping."""
+    bucket = TokenBucket(rate=0.1, capacity=1)
+    assert bucket.acquire(timeout=0.5) == 0
+    start = time.monotonic()
+    try:
+        bucket.acquire(timeout=0.5)
+        assert False, "expected a timeout"
+    except TimeoutError:
+        pass
+    assert time.monotonic() - start < 0.1
+
+
+def test_rate_limits_are_opt_in():
+    """No bucket paces a provider unless rate limiting is enabled."""
+    saved = Config.RATE_LIMITS_ENABLED
+    try:
+        policy = RetryPolicy()
+        Config.RATE_LIMITS_ENABLED = False
+        assert policy._get_bucket("groq", "key") is None
+        Config.RATE_LIMITS_ENABLED = True
+        assert isinstance(policy._get_bucket("groq", "key"), TokenBucket)
+    finally:
+        Config.RATE_LIMITS_ENABLED = saved
+
+
+def test_error_classification():
+    """Rate limits, server errors and connection failures are retried; client errors and timeouts are not."""
+    assert is_retryable(_HTTPError(429))
+    assert is_retryable(_HTTPError(503))
+    assert not is_retryable(_HTTPError(400))
+    assert not is_retryable(_HTTPError(401))
+    assert is_retryable(ConnectionError("reset"))
+    assert not is_retryable(TimeoutError("slow"))
+    assert not is_retryable(ValueError("bad"))
+    assert get_retry_after(_HTTPError(429, {"retry-after": "2"})) == 2.0
+    assert get_retry_after(_HTTPError(429, {"retry-after-ms": "250"})) == 0.25
+    assert get_retry_after(_HTTPError(429)) is None
+
+
+def test_transient_failures_are_retried():
+    """A call that fails transiently succeeds on a later attempt and is counted."""
+    saved = _save()
+    try:
+        policy = _fast_policy()
+        attempts = []
+
+        def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise _HTTPError(503)
+            return "ok"
+
+        assert policy.call("test", "key", flaky) == "ok"
+        assert len(attempts) == 3
+        stats = policy.get_stats()["test"]
+        assert stats["calls"] == 3 and stats["retries"] == 2 and stats["failures"] == 0
+    finally:
+        _restore(saved)
+
+
+def test_permanent_failures_are_not_retried():
+    """Non-retryable errors, and errors on the last attempt, are raised straight away."""
+    saved = _save()
+    try:
+        policy = _fast_policy()
+        attempts = []
+
+        def unauthorized():
+            attempts.append(1)
+            raise _HTTPError(401)
+
+        try:
+            policy.call("test", "key", unauthorized)
+            assert False, "expected the error to be raised"
+        except _HTTPError:
+            pass
+        assert len(attempts) == 1
+
+        attempts.clear()
+
+        def down():
+            attempts.append(1)
+            raise _HTTPError(503)
+
+        try:
+            policy.call("test", "key", down)
+            assert False, "expected the error to be raised"
+        except _HTTPError:
+            pass
+        assert len(attempts) == Config.RETRY_MAX_ATTEMPTS
+        assert policy.get_stats()["test"]["failures"] == 2
+
+        attempts.clear()
+
+        def rate_limited():
+            attempts.append(1)
+            raise _HTTPError(429, {"retry-after": "5"})
+
+        try:
+            policy.call("test", "key", rate_limited)
+            assert False, "expected the error to be raised"
+        except _HTTPError:
+            pass
+        assert len(attempts) == 1, "a Retry-After beyond the limit is not retried early"
+    finally:
+        _restore(saved)
+
+
+def test_streams_are_only_retried_before_the_first_delta():
+    """A stream is reopened if it fails before its first delta, but never once output has started."""
+    saved = _save()
+    try:
+        policy = _fast_policy()
+        opened = []
+
+        def fails_then_streams():
+            opened.append(1)
+            if len(opened) == 1:
+                raise ConnectionError("reset")
+            return iter(["a", "b", "c"])
+
+        assert list(policy.stream("test", "key", fails_then_streams)) == ["a", "b", "c"]
+        assert len(opened) == 2
+
+        opened.clear()
+
+        def breaks_mid_stream():
+            opened.append(1)
+            yield "a"
+            raise ConnectionError("reset")
+
+        received = []
+        try:
+            for delta in policy.stream("test", "key", breaks_mid_stream):
+                received.append(delta)
+            assert False, "expected the error to be raised"
+        except ConnectionError:
+            pass
+        assert received == ["a"]
+        assert len(opened) == 1
+    finally:
+        _restore(saved)
+
+
+def test_async_calls_and_streams_are_retried():
+    """The async variants retry transient failures like the sync ones."""
+    saved = _save()
+    try:
+        policy = _fast_policy()
+        opened = []
+
+        async def fails_then_answers():
+            opened.append(1)
+            if len(opened) == 1:
+                raise _HTTPError(503)
+            return "ok"
+
+        assert asyncio.run(policy.call_async("test", "key", fails_then_answers)) == "ok"
+        assert len(opened) == 2
+
+        opened.clear()
+
+        async def fails_then_streams():
+            opened.append(1)
+            if len(opened) == 1:
+                raise ConnectionError("reset")
+            for delta in ("a", "b"):
+                yield delta
+
+        async def collect():
+            return [delta async for delta in await policy.stream_async("test", "key", fails_then_streams)]
+
+        assert asyncio.run(collect()) == ["a", "b"]
+        assert len(opened) == 2
+    finally:
+        _restore(saved)
+
+
+if __name__ == "__main__":
+    test_token_bucket_allows_a_burst_then_waits()
+    test_token_bucket_gives_up_at_the_timeout()
+    test_rate_limits_are_opt_in()
+    test_error_classification()
+    test_transient_failures_are_retried()
+    test_permanent_failures_are_not_retried()
+    test_streams_are_only_retried_before_the_first_delta()
+    test_async_calls_and_streams_are_retried()
+    print("✓ All retry tests passed")
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test script for the streaming sentence segmenter used by pipelined turns.
+"""
+
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from voice_assistant.segmenter import SentenceSegmenter, split_long_text, split_sentences
+
+
+def _feed_words(text, segmenter):
+    segments = []
+    for word in text.split(" "):
+        segments += segmenter.feed(word + " ")
+    return segments + segmenter.flush()
+
+
+def test_sentences_cut_as_tokens_arrive():
+    """Segments are emitted as soon as a sentence terminator is followed by whitespace."""
+    segmenter = SentenceSegmenter()
+    assert segmenter.feed("Sure, the weather is lovely today.") == []
+    assert segmenter.feed(" It") == ["Sure, the weather is lovely today."]
+    assert segmenter.flush() == ["It"]
+
+
+def test_short_sentences_and_abbreviations_are_merged():
+    """Very short sentences, abbreviations and decimals do not end a segment."""
+    segments = _feed_words("Hi! Dr. Smith measured 3.5 degrees today. Bye.", SentenceSegmenter())
+    assert segments == ["Hi! Dr. Smith measured 3.5 degrees today.", "Bye."]
+
+
+def test_long_sentences_cut_at_clauses():
+    """Run-on sentences are cut at clause punctuation once they get long."""
+    text = ("After a very long introduction that keeps going and going for a while, "
+            "we finally reach the point of this sentence")
+    segments = _feed_words(text, SentenceSegmenter(clause_chars=60))
+    assert len(segments) == 2
+    assert segments[0].endswith(",")
+
+
+def test_split_sentences():
+    """Whole texts split the same way as streamed ones."""
+    assert split_sentences("One two three four. Five six seven eight!\nNine") == [
+        "One two three four.", "Five six seven eight!", "Nine"]
+
+
+def test_split_long_text():
+    """The first sentence is spoken alone and the rest are merged up to the chunk size."""
+    text = ("This is the first sentence. Here is the second one. And a third one follows. "
+            "Then comes the fourth sentence. Finally the fifth.")
+    chunks = split_long_text(text, chunk_chars=60)
+    assert chunks == ["This is the first sentence.",
+                      "Here is the second one. And a third one follows.",
+                      "Then comes the fourth sentence. Finally the fifth."]
+    assert all(len(chunk) <= 60 for chunk in chunks)
+    assert " ".join(chunks) == text
+
+
+def test_split_long_text_edge_cases():
+    """Empty texts give no chunks and a sentence longer than the chunk size is kept whole."""
+    assert split_long_text("   ") == []
+    assert split_long_text("Just one sentence here.") == ["Just one sentence here."]
+    long_sentence = "Short start. " + "word " * 30 + "end."
+    assert split_long_text(long_sentence, chunk_chars=20)[0] == "Short start."
+
+
+if __name__ == "__main__":
+    test_sentences_cut_as_tokens_arrive()
+    test_short_sentences_and_abbreviations_are_merged()
+    test_long_sentences_cut_at_clauses()
+    test_split_sentences()
+    test_split_long_text()
+    test_split_long_text_edge_cases()
+    print("✓ All segmenter tests passed")
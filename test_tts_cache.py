@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test script for the two-tier TTS audio cache.
+"""
+
+import os
+import sys
+import tempfile
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from voice_assistant.tts_cache import TTSCache, tts_cache_key
+
+
+def test_keys_ignore_whitespace_only():
+    """Whitespace differences share a clip; case, provider and format do not."""
+    key = tts_cache_key("Hello there.", "openai", "mp3")
+    assert tts_cache_key("  Hello   there. ", "openai", "mp3") == key
+    assert tts_cache_key("hello there.", "openai", "mp3") != key
+    assert tts_cache_key("Hello there.", "elevenlabs", "mp3") != key
+    assert tts_cache_key("Hello there.", "openai", "wav") != key
+
+
+def test_memory_tier_evicts_least_recently_used():
+    """The memory tier stays under its byte cap by dropping the least recently used clip."""
+    with tempfile.TemporaryDirectory() as directory:
+        cache = TTSCache(directory, memory_bytes=10, disk_bytes=1000)
+        cache.put("a", "mp3", b"aaaa")
+        cache.put("b", "mp3", b"bbbb")
+        assert cache.get("a", "mp3") == b"aaaa"
+        cache.put("c", "mp3", b"cccc")
+        stats = cache.get_stats()
+        assert stats["memory_entries"] == 2 and stats["memory_bytes"] == 8
+
+        # The evicted clip is still served from disk
+        assert cache.get("b", "mp3") == b"bbbb"
+        stats = cache.get_stats()
+        assert stats["memory_hits"] == 1 and stats["disk_hits"] == 1
+
+
+def test_disk_tier_evicts_oldest_files():
+    """The disk tier stays under its byte cap by removing the least recently used files."""
+    with tempfile.TemporaryDirectory() as directory:
+        cache = TTSCache(directory, memory_bytes=100, disk_bytes=10)
+        cache.put("old", "mp3", b"1111")
+        cache.put("new", "mp3", b"2222")
+        os.utime(os.path.join(directory, "old.mp3"), (1000, 1000))
+        os.utime(os.path.join(directory, "new.mp3"), (2000, 2000))
+        cache.put("newest", "mp3", b"3333")
+        assert not os.path.exists(os.path.join(directory, "old.mp3"))
+        assert os.path.exists(os.path.join(directory, "new.mp3"))
+        assert cache.get_stats()["disk_bytes"] == 8
+
+
+def test_stats_and_contains():
+    """Hits, misses and bytes served are counted; contains() counts neither."""
+    with tempfile.TemporaryDirectory() as directory:
+        cache = TTSCache(directory, memory_bytes=100, disk_bytes=100)
+        assert not cache.contains("a", "mp3")
+        cache.put("a", "mp3", b"abcdef")
+        assert cache.contains("a", "mp3")
+        assert cache.get("a", "mp3") == b"abcdef"
+        assert cache.get("missing", "mp3") is None
+        stats = cache.get_stats()
+        assert stats["memory_hits"] == 1 and stats["misses"] == 1
+        assert stats["hit_ratio"] == 0.5
+        assert stats["bytes_served"] == 6
+
+        cache.clear()
+        assert not cache.contains("a", "mp3")
+        assert cache.get_stats()["disk_bytes"] == 0
+
+
+def test_clips_survive_a_restart():
+    """A new cache on the same directory serves clips written by an earlier one."""
+    with tempfile.TemporaryDirectory() as directory:
+        TTSCache(directory, memory_bytes=100, disk_bytes=100).put("a", "wav", b"RIFF")
+        cache = TTSCache(directory, memory_bytes=100, disk_bytes=100)
+        assert cache.get("a", "wav") == b"RIFF"
+        assert cache.get("a", "wav") == b"RIFF"
+        stats = cache.get_stats()
+        assert stats["disk_hits"] == 1 and stats["memory_hits"] == 1
+
+
+if __name__ == "__main__":
+    test_keys_ignore_whitespace_only()
+    test_memory_tier_evicts_least_recently_used()
+    test_disk_tier_evicts_oldest_files()
+    test_stats_and_contains()
+    test_clips_survive_a_restart()
+    print("✓ All TTS cache tests passed")
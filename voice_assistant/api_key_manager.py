@@ -2,20 +2,23 @@
 
 from voice_assistant.config import Config
 
+# Config attribute holding the API key for each service and model. Keys are
+# looked up when requested, so keys loaded from the settings file are picked up.
 API_KEY_MAPPING= {
     "transcription":{
-        "openai": Config.OPENAI_API_KEY,
-        "groq": Config.GROQ_API_KEY,
-        "deepgram": Config.DEEPGRAM_API_KEY
+        "openai": "OPENAI_API_KEY",
+        "groq": "GROQ_API_KEY",
+        "deepgram": "DEEPGRAM_API_KEY"
     },
     "response":{
-        "openai":Config.OPENAI_API_KEY,
-        "groq": Config.GROQ_API_KEY
+        "openai": "OPENAI_API_KEY",
+        "groq": "GROQ_API_KEY"
     },
     "tts": {
-        "openai": Config.OPENAI_API_KEY,
-        "deepgram":Config.DEEPGRAM_API_KEY,
-        "elevenlabs": Config.ELEVENLABS_API_KEY
+        "openai": "OPENAI_API_KEY",
+        "deepgram": "DEEPGRAM_API_KEY",
+        "elevenlabs": "ELEVENLABS_API_KEY",
+        "cartesia": "CARTESIA_API_KEY"
     }
 }
 
@@ -26,7 +29,8 @@ def get_api_key(service, model):
     Returns:
     str: The API key for the transcription, response or tts service.
     """
-    return API_KEY_MAPPING.get(service, {}).get(model)
+    attribute = API_KEY_MAPPING.get(service, {}).get(model)
+    return getattr(Config, attribute) if attribute else None
 
 def get_transcription_api_key():
     """
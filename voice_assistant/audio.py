@@ -2,9 +2,13 @@
 
 import speech_recognition as sr
 import pygame
+import pyaudio
+import threading
 import time
 import logging
+import wave
 import pydub
+from array import array
 from io import BytesIO
 from pydub import AudioSegment
 from functools import lru_cache
@@ -12,6 +16,32 @@ from functools import lru_cache
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Playback volume (0.0 - 1.0) applied to every played file
+_playback_volume = 1.0
+
+def set_volume(volume):
+    """
+    Set the playback volume for subsequent audio.
+
+    Args:
+    volume (float): Volume between 0.0 and 1.0 (clamped).
+
+    Returns:
+    float: The volume that was set.
+    """
+    global _playback_volume
+    _playback_volume = min(1.0, max(0.0, volume))
+    return _playback_volume
+
+def get_volume():
+    """
+    Get the current playback volume.
+
+    Returns:
+    float: Volume between 0.0 and 1.0.
+    """
+    return _playback_volume
+
 @lru_cache(maxsize=None)
 def get_recognizer():
     """
@@ -19,9 +49,68 @@ def get_recognizer():
     """
     return sr.Recognizer()
 
+class _CaptureTee:
+    """
+    Wrap a microphone stream, keeping a copy of everything read from it.
+
+    While it is active, a background thread passes the audio captured so far
+    (as WAV bytes) to a callback every interval seconds, so it can be
+    transcribed while the user is still speaking.
+    """
+
+    def __init__(self, stream, sample_rate, sample_width, on_audio, interval):
+        self._stream = stream
+        self._sample_rate = sample_rate
+        self._sample_width = sample_width
+        self._on_audio = on_audio
+        self._interval = interval
+        self._data = bytearray()
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def read(self, size):
+        chunk = self._stream.read(size)
+        with self._lock:
+            self._data.extend(chunk)
+        return chunk
+
+    def stop(self):
+        """Stop passing audio to the callback."""
+        self._done.set()
+
+    def close(self):
+        self.stop()
+        self._stream.close()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+    def _run(self):
+        sent = 0
+        while not self._done.wait(self._interval):
+            with self._lock:
+                data = bytes(self._data)
+            if len(data) == sent:
+                continue
+            sent = len(data)
+            buffer = BytesIO()
+            with wave.open(buffer, "wb") as wav_file:
+                wav_file.setnchannels(1)
+                wav_file.setsampwidth(self._sample_width)
+                wav_file.setframerate(self._sample_rate)
+                wav_file.writeframes(data)
+            try:
+                # Runs on this thread, so a slow callback delays the next snapshot instead of overlapping it
+                self._on_audio(buffer.getvalue())
+            except Exception as e:
+                logging.error(f"Partial audio callback failed: {e}")
+
+
 def record_audio(file_path, timeout=10, phrase_time_limit=None, retries=3, energy_threshold=2000, 
                  pause_threshold=1, phrase_threshold=0.1, dynamic_energy_threshold=True, 
-                 calibration_duration=1):
+                 calibration_duration=1, on_audio=None, audio_interval=0.5):
     """
     Record audio from the microphone and save it as an MP3 file.
     
@@ -35,6 +124,9 @@ def record_audio(file_path, timeout=10, phrase_time_limit=None, retries=3, energ
     phrase_threshold (float): Minimum length of a phrase to consider for recording (in seconds).
     dynamic_energy_threshold (bool): Whether to enable dynamic energy threshold adjustment.
     calibration_duration (float): Duration of the ambient noise calibration (in seconds).
+    on_audio (callable): Called every audio_interval seconds during the recording with the WAV
+        bytes captured so far (e.g. to transcribe partial speech).
+    audio_interval (float): Seconds between on_audio calls.
     """
     recognizer = get_recognizer()
     recognizer.energy_threshold = energy_threshold
@@ -48,8 +140,16 @@ def record_audio(file_path, timeout=10, phrase_time_limit=None, retries=3, energ
                 logging.info("Calibrating for ambient noise...")
                 recognizer.adjust_for_ambient_noise(source, duration=calibration_duration)
                 logging.info("Recording started")
-                # Listen for the first phrase and extract it into audio data
-                audio_data = recognizer.listen(source, timeout=timeout, phrase_time_limit=phrase_time_limit)
+                tee = None
+                if on_audio:
+                    tee = source.stream = _CaptureTee(source.stream, source.SAMPLE_RATE, source.SAMPLE_WIDTH,
+                                                      on_audio, audio_interval)
+                try:
+                    # Listen for the first phrase and extract it into audio data
+                    audio_data = recognizer.listen(source, timeout=timeout, phrase_time_limit=phrase_time_limit)
+                finally:
+                    if tee:
+                        tee.stop()
                 logging.info("Recording complete")
 
                 # Convert the recorded audio data to an MP3 file
@@ -76,6 +176,7 @@ def play_audio(file_path):
     try:
         pygame.mixer.init()
         pygame.mixer.music.load(file_path)
+        pygame.mixer.music.set_volume(_playback_volume)
         pygame.mixer.music.play()
         while pygame.mixer.music.get_busy():
             pygame.time.wait(100)
@@ -84,4 +185,107 @@ def play_audio(file_path):
     except Exception as e:
         logging.error(f"An unexpected error occurred while playing audio: {e}")
     finally:
-        pygame.mixer.quit()
\ No newline at end of file
+        pygame.mixer.quit()
+
+
+def play_audio_queue(file_queue, on_first_audio=None):
+    """
+    Play audio files from a queue back to back until a None sentinel arrives.
+
+    The mixer stays initialized across files so consecutive segments play
+    without the re-initialization gap of calling play_audio per file.
+
+    Args:
+    file_queue (queue.Queue): Queue of audio file paths, terminated by None.
+    on_first_audio (callable): Called once, right before the first file starts playing.
+    """
+    started = False
+    try:
+        pygame.mixer.init()
+        while True:
+            file_path = file_queue.get()
+            if file_path is None:
+                break
+            try:
+                pygame.mixer.music.load(file_path)
+                if not started:
+                    started = True
+                    if on_first_audio:
+                        on_first_audio()
+                pygame.mixer.music.set_volume(_playback_volume)
+                pygame.mixer.music.play()
+                while pygame.mixer.music.get_busy():
+                    pygame.time.wait(10)
+            except pygame.error as e:
+                logging.error(f"Failed to play audio segment {file_path}: {e}")
+    except Exception as e:
+        logging.error(f"An unexpected error occurred while playing audio: {e}")
+    finally:
+        pygame.mixer.quit()
+
+
+class PCMPlayer:
+    """
+    Play raw PCM chunks on the output device as they arrive.
+
+    The output stream is opened on the first chunk and kept open until
+    close(), so consecutive chunks play without gaps. The playback volume is
+    applied to every chunk.
+    """
+
+    _FORMATS = {"int16": (pyaudio.paInt16, "h"), "float32": (pyaudio.paFloat32, "f")}
+
+    def __init__(self, sample_rate, channels=1, sample_format="int16"):
+        """
+        Args:
+        sample_rate (int): Samples per second.
+        channels (int): Number of interleaved channels.
+        sample_format (str): 'int16' or 'float32'.
+        """
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.sample_format = sample_format
+        self._pa_format, self._typecode = self._FORMATS[sample_format]
+        self._frame_bytes = array(self._typecode).itemsize * channels
+        self._pending = b""
+        self._audio = None
+        self._stream = None
+
+    def write(self, chunk):
+        """
+        Play a chunk of PCM data, blocking until the device has accepted it.
+
+        Args:
+        chunk (bytes): PCM data; a partial frame at the end is kept for the next chunk.
+        """
+        data = self._pending + chunk
+        usable = len(data) - len(data) % self._frame_bytes
+        data, self._pending = data[:usable], data[usable:]
+        if not data:
+            return
+        if self._stream is None:
+            self._audio = pyaudio.PyAudio()
+            self._stream = self._audio.open(format=self._pa_format, channels=self.channels,
+                                            rate=self.sample_rate, output=True)
+        self._stream.write(self._apply_volume(data))
+
+    def close(self):
+        """Let the buffered audio finish and release the output device."""
+        if self._stream is not None:
+            try:
+                self._stream.stop_stream()
+                self._stream.close()
+            finally:
+                self._audio.terminate()
+                self._stream = None
+                self._audio = None
+
+    def _apply_volume(self, data):
+        if _playback_volume >= 1.0:
+            return data
+        samples = array(self._typecode, data)
+        if self._typecode == "h":
+            samples = array("h", (int(sample * _playback_volume) for sample in samples))
+        else:
+            samples = array("f", (sample * _playback_volume for sample in samples))
+        return samples.tobytes()
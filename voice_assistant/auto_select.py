@@ -0,0 +1,252 @@
+# voice_assistant/auto_select.py
+
+import logging
+import statistics
+import threading
+import time
+from collections import deque
+
+import requests
+
+from voice_assistant.config import Config
+from voice_assistant.api_key_manager import API_KEY_MAPPING, get_api_key
+from voice_assistant.circuit_breaker import breakers, OPEN
+
+# Service names used by API_KEY_MAPPING for each stage kind
+SERVICES = {"stt": "transcription", "llm": "response", "tts": "tts"}
+
+# Config attribute holding the configured model of each stage kind
+_MODEL_SETTINGS = {"stt": "TRANSCRIPTION_MODEL", "llm": "RESPONSE_MODEL", "tts": "TTS_MODEL"}
+
+# Cheap authenticated endpoints used to probe reachability and round-trip time
+_CLOUD_PROBES = {
+    "openai": ("https://api.openai.com/v1/models", lambda key: {"Authorization": f"Bearer {key}"}),
+    "groq": ("https://api.groq.com/openai/v1/models", lambda key: {"Authorization": f"Bearer {key}"}),
+    "deepgram": ("https://api.deepgram.com/v1/projects", lambda key: {"Authorization": f"Token {key}"}),
+    "elevenlabs": ("https://api.elevenlabs.io/v1/user", lambda key: {"xi-api-key": key}),
+    "cartesia": ("https://api.cartesia.ai/voices",
+                 lambda key: {"X-API-Key": key, "Cartesia-Version": "2024-06-10"}),
+}
+
+
+def _local_probe_url(provider):
+    return {
+        "ollama": "http://localhost:11434/api/tags",
+        "lmstudio": f"{Config.LMSTUDIO_BASE_URL}/v1/models",
+        "melotts": f"http://localhost:{Config.TTS_PORT_LOCAL}/",
+        "piper": Config.PIPER_SERVER_URL,
+        "fastwhisperapi": "http://localhost:8000/info",
+    }.get(provider)
+
+
+class ProviderSelector:
+    """
+    Resolve the 'auto' model value to the currently fastest healthy provider.
+
+    Latency and errors come from live traffic (every call made through the
+    circuit breakers) and from cheap periodic probes of the candidates of
+    every stage set to 'auto'. Candidates are only compared on the same
+    measure: by their median live latency once every healthy candidate has
+    enough live samples, otherwise all by Config.AUTO_BASELINE_LATENCY plus
+    their probe round trip. To avoid thrashing, the current pick is kept for at least
+    Config.AUTO_MIN_DWELL_SECONDS and only replaced by a provider that is
+    faster by more than Config.AUTO_SWITCH_MARGIN, unless it becomes unhealthy.
+    """
+
+    def __init__(self):
+        """Initialize the selector and start listening to live call outcomes."""
+        self._lock = threading.Lock()
+        self._latencies = {}
+        self._errors = {}
+        self._probes = {}
+        self._current = {}
+        self._since = {}
+        self._probe_thread = None
+        breakers.add_observer(self.record)
+
+    def record(self, kind: str, provider: str, latency: float = None, ok: bool = True):
+        """
+        Record the outcome of a live provider call.
+
+        Args:
+            kind: 'stt', 'llm' or 'tts'.
+            provider: The provider name.
+            latency: Seconds the call took (time to first token for streams).
+            ok: False if the call failed.
+        """
+        key = (kind, provider)
+        with self._lock:
+            self._errors.setdefault(key, deque(maxlen=Config.AUTO_WINDOW)).append(not ok)
+            if ok and latency is not None:
+                self._latencies.setdefault(key, deque(maxlen=Config.AUTO_WINDOW)).append(latency)
+
+    def candidates(self, kind: str) -> list:
+        """
+        Get the providers 'auto' may choose from for a stage.
+
+        Args:
+            kind: 'stt', 'llm' or 'tts'.
+
+        Returns:
+            list: Providers from Config.AUTO_CANDIDATES that have their API key.
+        """
+        service = SERVICES[kind]
+        return [
+            provider for provider in Config.AUTO_CANDIDATES[kind]
+            if provider not in API_KEY_MAPPING.get(service, {}) or get_api_key(service, provider)
+        ]
+
+    def pick(self, kind: str) -> str:
+        """
+        Pick the provider for the next turn.
+
+        Args:
+            kind: 'stt', 'llm' or 'tts'.
+
+        Returns:
+            str: The provider name.
+
+        Raises:
+            ValueError: If no candidate has its API key.
+        """
+        self._ensure_probing()
+        candidates = self.candidates(kind)
+        if not candidates:
+            raise ValueError(f"No {kind} provider is configured for 'auto'")
+
+        scores = self._scores(kind, candidates)
+        best = min(candidates, key=lambda provider: scores[provider])
+        now = time.monotonic()
+        with self._lock:
+            current = self._current.get(kind)
+            if current in scores and scores[current] != float("inf"):
+                settled = now - self._since[kind] < Config.AUTO_MIN_DWELL_SECONDS
+                marginal = scores[best] > scores[current] * (1 - Config.AUTO_SWITCH_MARGIN)
+                if settled or marginal:
+                    return current
+            if scores[best] == float("inf"):
+                # Nothing looks healthy; keep the current pick or fall back to the first candidate
+                return current if current in scores else candidates[0]
+            if best != current:
+                logging.info(f"Auto {kind} provider: {current or 'none'} -> {best} "
+                             f"({scores[best]:.2f}s expected)")
+                self._current[kind] = best
+                self._since[kind] = now
+            return best
+
+    def get_stats(self) -> dict:
+        """
+        Get the selector's view of every candidate.
+
+        Returns:
+            dict: Stage kind to {provider: {'score', 'samples', 'error_rate', 'probe'}},
+                plus the current pick under 'current'.
+        """
+        stats = {}
+        for kind in SERVICES:
+            providers = {}
+            scores = self._scores(kind, Config.AUTO_CANDIDATES[kind])
+            for provider in Config.AUTO_CANDIDATES[kind]:
+                key = (kind, provider)
+                with self._lock:
+                    samples = len(self._latencies.get(key, ()))
+                    errors = list(self._errors.get(key, ()))
+                    probe = self._probes.get(provider)
+                providers[provider] = {
+                    "score": scores[provider],
+                    "samples": samples,
+                    "error_rate": sum(errors) / len(errors) if errors else 0.0,
+                    "probe": probe,
+                }
+            stats[kind] = {"current": self._current.get(kind), "providers": providers}
+        return stats
+
+    def _scores(self, kind, candidates):
+        healthy, live = [], {}
+        for provider in candidates:
+            if self._healthy(kind, provider):
+                healthy.append(provider)
+                with self._lock:
+                    latencies = list(self._latencies.get((kind, provider), ()))
+                if len(latencies) >= Config.AUTO_MIN_SAMPLES:
+                    live[provider] = statistics.median(latencies)
+        scores = dict.fromkeys(candidates, float("inf"))
+        if healthy and len(live) == len(healthy):
+            scores.update(live)
+            return scores
+        # Probe round trips are not comparable with live request latencies, so use them for all
+        for provider in healthy:
+            with self._lock:
+                probed = provider in self._probes
+                probe = self._probes.get(provider)
+            if not probed or probe is not None:
+                rtt = probe if probe is not None else Config.AUTO_UNKNOWN_RTT
+                scores[provider] = Config.AUTO_BASELINE_LATENCY[kind] + rtt
+        return scores
+
+    def _healthy(self, kind, provider):
+        if breakers.get(kind, provider).state == OPEN:
+            return False
+        with self._lock:
+            errors = list(self._errors.get((kind, provider), ()))
+        return len(errors) < Config.AUTO_MIN_SAMPLES or sum(errors) / len(errors) < Config.AUTO_MAX_ERROR_RATE
+
+    def _ensure_probing(self):
+        with self._lock:
+            if self._probe_thread is not None:
+                return
+            self._probe_thread = threading.Thread(target=self._probe_loop, daemon=True)
+        self._probe_thread.start()
+
+    def _probe_loop(self):
+        while True:
+            auto_kinds = [kind for kind, setting in _MODEL_SETTINGS.items() if getattr(Config, setting) == "auto"]
+            providers = {provider for kind in auto_kinds for provider in self.candidates(kind)}
+            for provider in providers:
+                rtt = self._probe(provider)
+                with self._lock:
+                    self._probes[provider] = rtt
+            time.sleep(Config.AUTO_PROBE_INTERVAL)
+
+    def _probe(self, provider):
+        """Return the probe round trip in seconds, or None if the provider looks unhealthy."""
+        if provider in _CLOUD_PROBES:
+            url, headers = _CLOUD_PROBES[provider]
+            service = next(s for s in SERVICES.values() if provider in API_KEY_MAPPING.get(s, {}))
+            headers = headers(get_api_key(service, provider))
+            healthy = lambda status: status < 500 and status not in (401, 403)
+        else:
+            url = _local_probe_url(provider)
+            if url is None:
+                # In-process engines (faster-whisper, pyttsx3) have nothing to probe
+                return 0.0
+            headers = {}
+            healthy = lambda status: status < 500
+        start = time.perf_counter()
+        try:
+            response = requests.get(url, headers=headers, timeout=Config.AUTO_PROBE_TIMEOUT)
+        except requests.RequestException as e:
+            logging.debug(f"Probe of {provider} failed: {e}")
+            return None
+        if not healthy(response.status_code):
+            logging.debug(f"Probe of {provider} returned {response.status_code}")
+            return None
+        return time.perf_counter() - start
+
+
+def resolve_model(kind: str, model: str) -> str:
+    """
+    Resolve a configured model value, picking a provider when it is 'auto'.
+
+    Args:
+        kind: 'stt', 'llm' or 'tts'.
+        model: The configured model.
+
+    Returns:
+        str: A concrete provider name.
+    """
+    return auto_selector.pick(kind) if model == "auto" else model
+
+
+# Global instance
+auto_selector = ProviderSelector()
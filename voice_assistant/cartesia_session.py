@@ -0,0 +1,212 @@
+# voice_assistant/cartesia_session.py
+
+import json
+import logging
+import os
+import threading
+import time
+
+from cartesia import Cartesia
+
+from voice_assistant.config import Config
+from voice_assistant.audio import PCMPlayer
+
+# Cartesia raw encodings and the matching PCMPlayer sample formats
+_SAMPLE_FORMATS = {"pcm_s16le": "int16", "pcm_f32le": "float32"}
+
+
+class CartesiaSession:
+    """
+    Long-lived Cartesia connection reused across turns.
+
+    The client is built once, voice embeddings are fetched once and kept in
+    Config.CARTESIA_VOICE_CACHE_FILE, and one output stream stays open for the
+    whole session. Audio is requested in Config.CARTESIA_OUTPUT_FORMAT
+    (16-bit PCM at 22.05 kHz by default, half the bytes of 32-bit float at
+    44.1 kHz). speak_stream() uses the websocket transport, sending text
+    segments as continuations of one context while audio plays.
+    """
+
+    def __init__(self, api_key: str):
+        """
+        Args:
+            api_key: The Cartesia API key.
+        """
+        self.api_key = api_key
+        self.client = Cartesia(api_key=api_key)
+        self._lock = threading.Lock()
+        self._embeddings = self._load_embeddings()
+        self._player = None
+        self._websocket = None
+
+    def get_voice_embedding(self, voice_id: str) -> list:
+        """
+        Get a voice embedding, fetching it from Cartesia only the first time.
+
+        Args:
+            voice_id: The Cartesia voice id.
+
+        Returns:
+            list: The voice embedding.
+        """
+        with self._lock:
+            embedding = self._embeddings.get(voice_id)
+        if embedding is not None:
+            return embedding
+        embedding = self.client.voices.get(id=voice_id)["embedding"]
+        with self._lock:
+            self._embeddings[voice_id] = embedding
+            self._save_embeddings()
+        return embedding
+
+    def speak(self, text: str, on_first_audio=None):
+        """
+        Synthesize text over server-sent events and play it as it arrives.
+
+        Args:
+            text: The text to speak.
+            on_first_audio: Called once right before the first audio is played.
+        """
+        start = time.perf_counter()
+        outputs = self.client.tts.sse(
+            model_id=Config.TTS_VOICES["cartesia"]["model"],
+            transcript=text,
+            voice_embedding=self.get_voice_embedding(Config.TTS_VOICES["cartesia"]["voice"]),
+            stream=True,
+            output_format=Config.CARTESIA_OUTPUT_FORMAT,
+        )
+        self._play(outputs, start, on_first_audio)
+
+    def speak_stream(self, segments, on_first_audio=None):
+        """
+        Speak text segments as they are produced, over one websocket context.
+
+        Every segment is sent as a continuation of the same context, so
+        Cartesia keeps the prosody across segments and starts speaking before
+        the last one is known.
+
+        Args:
+            segments: Iterable of text segments, e.g. sentences from an LLM stream.
+            on_first_audio: Called once right before the first audio is played.
+        """
+        voice = Config.TTS_VOICES["cartesia"]
+        embedding = self.get_voice_embedding(voice["voice"])
+        errors = []
+        try:
+            context = self._get_websocket().context()
+        except Exception:
+            self._drop_websocket()
+            raise
+
+        def send():
+            try:
+                for segment in segments:
+                    context.send(
+                        model_id=voice["model"],
+                        transcript=segment,
+                        voice_embedding=embedding,
+                        continue_=True,
+                        output_format=Config.CARTESIA_OUTPUT_FORMAT,
+                    )
+            except Exception as e:
+                errors.append(e)
+            finally:
+                context.no_more_inputs()
+
+        sender = threading.Thread(target=send, daemon=True)
+        start = time.perf_counter()
+        sender.start()
+        try:
+            self._play(context.receive(), start, on_first_audio)
+        except Exception:
+            # The socket may have been closed by the server; the next turn reconnects
+            self._drop_websocket()
+            raise
+        sender.join()
+        if errors:
+            self._drop_websocket()
+            raise errors[0]
+
+    def close(self):
+        """Close the websocket and release the output device."""
+        with self._lock:
+            if self._websocket is not None:
+                self._websocket.close()
+                self._websocket = None
+            if self._player is not None:
+                self._player.close()
+                self._player = None
+
+    def _play(self, outputs, start, on_first_audio=None):
+        player = self._get_player()
+        first = True
+        for output in outputs:
+            if first:
+                first = False
+                logging.info(f"cartesia TTS first audio after {(time.perf_counter() - start) * 1000:.0f}ms")
+                if on_first_audio:
+                    on_first_audio()
+            player.write(output["audio"])
+
+    def _get_player(self):
+        with self._lock:
+            if self._player is None:
+                output_format = Config.CARTESIA_OUTPUT_FORMAT
+                self._player = PCMPlayer(output_format["sample_rate"],
+                                         sample_format=_SAMPLE_FORMATS[output_format["encoding"]])
+            return self._player
+
+    def _get_websocket(self):
+        with self._lock:
+            if self._websocket is None:
+                self._websocket = self.client.tts.websocket()
+            return self._websocket
+
+    def _drop_websocket(self):
+        with self._lock:
+            websocket, self._websocket = self._websocket, None
+        if websocket is not None:
+            try:
+                websocket.close()
+            except Exception as e:
+                logging.debug(f"Closing the Cartesia websocket failed: {e}")
+
+    def _load_embeddings(self):
+        try:
+            with open(Config.CARTESIA_VOICE_CACHE_FILE) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_embeddings(self):
+        try:
+            directory = os.path.dirname(Config.CARTESIA_VOICE_CACHE_FILE)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(Config.CARTESIA_VOICE_CACHE_FILE, "w") as f:
+                json.dump(self._embeddings, f)
+        except OSError as e:
+            logging.warning(f"Could not save Cartesia voice embeddings: {e}")
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_cartesia_session(api_key: str) -> CartesiaSession:
+    """
+    Get the shared Cartesia session, creating it on first use or when the API key changes.
+
+    Args:
+        api_key: The Cartesia API key.
+
+    Returns:
+        CartesiaSession: The session.
+    """
+    global _session
+    with _session_lock:
+        if _session is None or _session.api_key != api_key:
+            if _session is not None:
+                _session.close()
+            _session = CartesiaSession(api_key)
+        return _session
@@ -0,0 +1,140 @@
+# voice_assistant/chat_history.py
+
+import logging
+
+from voice_assistant.config import Config
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Rough per-message overhead of the chat format (role markers, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Upper bound on cached per-message counts before the cache is reset
+_MAX_CACHED_MESSAGES = 4096
+
+
+class HistoryWindow:
+    """
+    Keep the prompt within a per-model token budget.
+
+    Token counts are cached per message, so each call only counts messages
+    that were appended since the previous turn.
+    """
+
+    def __init__(self):
+        """Initialize the history window."""
+        self._token_cache = {}
+        self._encoding = None
+        self.last_stats = {}
+
+    def count_tokens(self, message: dict) -> int:
+        """
+        Count the tokens of a single chat message, using the cache when possible.
+
+        Args:
+            message: A chat message with 'role' and 'content'.
+
+        Returns:
+            int: The number of tokens the message adds to the prompt.
+        """
+        key = (message.get("role"), message.get("content") or "")
+        count = self._token_cache.get(key)
+        if count is None:
+            if len(self._token_cache) >= _MAX_CACHED_MESSAGES:
+                self._token_cache.clear()
+            count = self._count_text_tokens(key[1]) + MESSAGE_OVERHEAD_TOKENS
+            self._token_cache[key] = count
+        return count
+
+    def count_messages(self, messages: list) -> int:
+        """
+        Count the tokens of a list of chat messages.
+
+        Args:
+            messages: The chat messages.
+
+        Returns:
+            int: The total token count.
+        """
+        return sum(self.count_tokens(message) for message in messages)
+
+    def apply(self, messages: list, model_name: str) -> list:
+        """
+        Select the leading system messages plus the most recent turns that fit the budget.
+
+        Args:
+            messages: The full chat history.
+            model_name: The LLM name used to look up the token budget.
+
+        Returns:
+            list: The messages to send. The input list is not modified.
+        """
+        budget = get_token_budget(model_name)
+
+        head = []
+        for message in messages:
+            if message.get("role") != "system":
+                break
+            head.append(message)
+        body = messages[len(head):]
+
+        used = self.count_messages(head)
+        total = used + self.count_messages(body)
+
+        kept = []
+        for message in reversed(body):
+            tokens = self.count_tokens(message)
+            # The latest message is always sent, even if it alone exceeds the budget
+            if kept and used + tokens > budget:
+                break
+            kept.append(message)
+            used += tokens
+        kept.reverse()
+
+        # Don't start the window with an assistant reply whose question was dropped
+        while len(kept) > 1 and len(kept) < len(body) and kept[0].get("role") == "assistant":
+            used -= self.count_tokens(kept.pop(0))
+
+        window = head + kept
+        self.last_stats = {
+            "model": model_name,
+            "budget": budget,
+            "messages_total": len(messages),
+            "messages_sent": len(window),
+            "tokens_total": total,
+            "tokens_sent": used,
+            "tokens_saved": total - used,
+        }
+        if total > used:
+            logging.info(f"History window for {model_name}: sent {len(window)}/{len(messages)} messages, "
+                         f"{used}/{total} tokens (saved {total - used} tokens, "
+                         f"{100 * (total - used) / total:.0f}%)")
+        return window
+
+    def _count_text_tokens(self, text: str) -> int:
+        if tiktoken is not None:
+            if self._encoding is None:
+                self._encoding = tiktoken.get_encoding("cl100k_base")
+            return len(self._encoding.encode(text))
+        # Without tiktoken, ~4 characters per token is close enough for budgeting
+        return (len(text) + 3) // 4
+
+
+def get_token_budget(model_name: str) -> int:
+    """
+    Get the prompt token budget configured for an LLM.
+
+    Args:
+        model_name: The LLM name (e.g. Config.GROQ_LLM).
+
+    Returns:
+        int: The token budget for the chat history.
+    """
+    return Config.HISTORY_TOKEN_BUDGETS.get(model_name, Config.DEFAULT_HISTORY_TOKEN_BUDGET)
+
+
+# Global instance
+history_window = HistoryWindow()
@@ -0,0 +1,344 @@
+# voice_assistant/circuit_breaker.py
+
+import logging
+import threading
+import time
+from collections import deque
+
+from voice_assistant.config import Config
+from voice_assistant.api_key_manager import API_KEY_MAPPING, get_api_key
+from voice_assistant.utils import resume_stream, resume_stream_async
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Track a provider's recent failures and latency and stop calling it while it is degraded.
+
+    The breaker opens after Config.BREAKER_FAILURE_THRESHOLD consecutive
+    failures, or when the error rate over the last Config.BREAKER_WINDOW calls
+    reaches Config.BREAKER_ERROR_RATE. Calls slower than
+    Config.BREAKER_SLOW_CALL_SECONDS count as failures. After
+    Config.BREAKER_RECOVERY_SECONDS one half-open probe is let through; its
+    outcome closes the breaker again or re-opens it.
+    """
+
+    def __init__(self, name: str, on_change=None):
+        """
+        Args:
+            name: Breaker name, e.g. 'llm:groq'.
+            on_change: Called with the breaker whenever its state changes.
+        """
+        self.name = name
+        self.state = CLOSED
+        self._on_change = on_change
+        self._lock = threading.Lock()
+        self._outcomes = deque(maxlen=Config.BREAKER_WINDOW)
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        """
+        Check whether a call may be made now.
+
+        Returns:
+            bool: True if the breaker is closed, or if this call is the half-open probe.
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self._opened_at >= Config.BREAKER_RECOVERY_SECONDS:
+                self._set_state(HALF_OPEN)
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self, latency: float):
+        """
+        Record a completed call.
+
+        Args:
+            latency: Seconds the call took (time to first token for streams).
+        """
+        if latency > Config.BREAKER_SLOW_CALL_SECONDS:
+            logging.warning(f"{self.name} took {latency:.1f}s, counting as a failure")
+            self.record_failure()
+            return
+        with self._lock:
+            self._outcomes.append(False)
+            self._consecutive_failures = 0
+            self._probe_in_flight = False
+            if self.state != CLOSED:
+                self._set_state(CLOSED)
+
+    def record_failure(self):
+        """Record a failed call."""
+        with self._lock:
+            self._outcomes.append(True)
+            self._consecutive_failures += 1
+            self._probe_in_flight = False
+            if self.state == HALF_OPEN or self._should_open():
+                self._opened_at = time.monotonic()
+                if self.state != OPEN:
+                    self._set_state(OPEN)
+
+    def release(self):
+        """Give back a half-open probe whose outcome is unknown, so another call can probe."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def _should_open(self):
+        if self._consecutive_failures >= Config.BREAKER_FAILURE_THRESHOLD:
+            return True
+        if len(self._outcomes) < Config.BREAKER_WINDOW:
+            return False
+        return sum(self._outcomes) / len(self._outcomes) >= Config.BREAKER_ERROR_RATE
+
+    def _set_state(self, state):
+        logging.warning(f"Circuit breaker {self.name}: {self.state} -> {state}")
+        self.state = state
+        if self._on_change:
+            # Called with the lock held; listeners must not call back into the breaker
+            self._on_change(self)
+
+
+class BreakerRegistry:
+    """One circuit breaker per (kind, provider), with fallback across a chain of providers."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._lock = threading.Lock()
+        self._breakers = {}
+        self._listeners = []
+        self._observers = []
+
+    def get(self, kind: str, provider: str) -> CircuitBreaker:
+        """
+        Get the breaker for a provider, creating it on first use.
+
+        Args:
+            kind: 'stt', 'llm' or 'tts'.
+            provider: The provider name.
+
+        Returns:
+            CircuitBreaker: The provider's breaker.
+        """
+        key = f"{kind}:{provider}"
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                breaker = self._breakers[key] = CircuitBreaker(key, self._notify)
+            return breaker
+
+    def get_states(self) -> dict:
+        """
+        Get the state of every breaker.
+
+        Returns:
+            dict: Breaker name ('kind:provider') to 'closed', 'open' or 'half_open'.
+        """
+        with self._lock:
+            return {name: breaker.state for name, breaker in self._breakers.items()}
+
+    def add_listener(self, callback):
+        """
+        Register a callback for breaker state changes.
+
+        Args:
+            callback: Called with the breaker name and its new state.
+        """
+        self._listeners.append(callback)
+
+    def add_observer(self, callback):
+        """
+        Register a callback for the outcome of every provider call.
+
+        Args:
+            callback: Called with the kind, provider, latency in seconds (None on
+                failure) and whether the call succeeded.
+        """
+        self._observers.append(callback)
+
+    def call(self, kind: str, chain: list, fn, answered_by=None):
+        """
+        Call the first provider in the chain whose breaker allows it, falling back on failure.
+
+        Args:
+            kind: 'stt', 'llm' or 'tts'.
+            chain: Provider names in order of preference.
+            fn: Called with a provider name, returns the result or raises.
+            answered_by: Called with a result, returns the provider that produced it when
+                that can differ from the one fn was called with (e.g. a hedged call).
+
+        Returns:
+            tuple: (provider that answered, result).
+
+        Raises:
+            Exception: The last provider's error if every provider failed or was open.
+        """
+        last_error = None
+        for provider in self._allowed(kind, chain):
+            start = time.perf_counter()
+            try:
+                result = fn(provider)
+            except Exception as e:
+                self._failed(kind, provider, e)
+                last_error = e
+                continue
+            if answered_by and answered_by(result) != provider:
+                # The provider lost a hedged race, which says nothing about its health
+                self.get(kind, provider).release()
+                provider = answered_by(result)
+            self._succeeded(kind, chain, provider, start)
+            return provider, result
+        raise last_error or RuntimeError(f"No {kind} provider available (all circuits open)")
+
+    async def call_async(self, kind: str, chain: list, fn):
+        """
+        Async variant of call.
+
+        Args:
+            kind: 'stt', 'llm' or 'tts'.
+            chain: Provider names in order of preference.
+            fn: Called with a provider name, returns an awaitable of the result.
+
+        Returns:
+            tuple: (provider that answered, result).
+        """
+        last_error = None
+        for provider in self._allowed(kind, chain):
+            start = time.perf_counter()
+            try:
+                result = await fn(provider)
+            except Exception as e:
+                self._failed(kind, provider, e)
+                last_error = e
+                continue
+            self._succeeded(kind, chain, provider, start)
+            return provider, result
+        raise last_error or RuntimeError(f"No {kind} provider available (all circuits open)")
+
+    def stream(self, kind: str, chain: list, open_stream):
+        """
+        Open a stream on the first healthy provider, falling back until one yields a first token.
+
+        Args:
+            kind: 'stt', 'llm' or 'tts'.
+            chain: Provider names in order of preference.
+            open_stream: Called with a provider name, returns (provider that serves it, iterator).
+
+        Returns:
+            tuple: (provider that serves the stream, iterator over its deltas).
+        """
+        def first_token(provider):
+            served_by, iterator = open_stream(provider)
+            iterator = iter(iterator)
+            return served_by, iterator, next(iterator, None)
+
+        provider, (_, iterator, first) = self.call(kind, chain, first_token, lambda result: result[0])
+        return provider, self._resume(kind, provider, first, iterator)
+
+    async def stream_async(self, kind: str, chain: list, open_stream):
+        """
+        Async variant of stream.
+
+        Args:
+            kind: 'stt', 'llm' or 'tts'.
+            chain: Provider names in order of preference.
+            open_stream: Called with a provider name, returns an awaitable of
+                (provider that serves it, async iterator).
+
+        Returns:
+            tuple: (provider that serves the stream, async iterator over its deltas).
+        """
+        async def first_token(provider):
+            served_by, iterator = await open_stream(provider)
+            iterator = aiter(iterator)
+            return served_by, iterator, await anext(iterator, None)
+
+        provider, (served_by, iterator, first) = await self.call_async(kind, chain, first_token)
+        return served_by, self._resume_async(kind, provider, first, iterator)
+
+    def _allowed(self, kind, chain):
+        for provider in chain:
+            breaker = self.get(kind, provider)
+            if breaker.allow():
+                yield provider
+            else:
+                logging.info(f"Skipping {provider} {kind}: circuit {breaker.state}")
+
+    def _succeeded(self, kind, chain, provider, start):
+        latency = time.perf_counter() - start
+        self.get(kind, provider).record_success(latency)
+        self._observe(kind, provider, latency, True)
+        if provider != chain[0]:
+            logging.info(f"Fell back to {provider} for {kind}")
+
+    def _failed(self, kind, provider, error):
+        self.get(kind, provider).record_failure()
+        self._observe(kind, provider, None, False)
+        logging.warning(f"{provider} {kind} failed: {error}")
+
+    def _resume(self, kind, provider, first, iterator):
+        try:
+            yield from resume_stream(first, iterator)
+        except Exception:
+            # A stream failing part way still counts against its provider
+            self.get(kind, provider).record_failure()
+            self._observe(kind, provider, None, False)
+            raise
+
+    async def _resume_async(self, kind, provider, first, iterator):
+        try:
+            async for item in resume_stream_async(first, iterator):
+                yield item
+        except Exception:
+            self.get(kind, provider).record_failure()
+            self._observe(kind, provider, None, False)
+            raise
+
+    def _observe(self, kind, provider, latency, ok):
+        for callback in self._observers:
+            try:
+                callback(kind, provider, latency, ok)
+            except Exception as e:
+                logging.error(f"Breaker observer failed: {e}")
+
+    def _notify(self, breaker):
+        for callback in self._listeners:
+            try:
+                callback(breaker.name, breaker.state)
+            except Exception as e:
+                logging.error(f"Breaker listener failed: {e}")
+
+
+def fallback_chain(service: str, primary: str, fallbacks: list) -> list:
+    """
+    Build the provider chain for a service.
+
+    Args:
+        service: 'transcription', 'response' or 'tts'.
+        primary: The configured provider.
+        fallbacks: Providers to try after it, in order.
+
+    Returns:
+        list: The primary followed by the fallbacks, without duplicates or
+            providers that are missing their API key.
+    """
+    chain = [primary]
+    for provider in fallbacks:
+        if provider in chain:
+            continue
+        if provider in API_KEY_MAPPING.get(service, {}) and not get_api_key(service, provider):
+            continue
+        chain.append(provider)
+    return chain
+
+
+# Global instance
+breakers = BreakerRegistry()
@@ -11,9 +11,10 @@ class Config:
     Configuration class to hold the model selection and API keys.
 
     Attributes:
-        TRANSCRIPTION_MODEL (str): The model to use for transcription ('openai', 'groq', 'deepgram', 'fastwhisperapi', 'faster-whisper', 'local').
-        RESPONSE_MODEL (str): The model to use for response generation ('openai', 'groq', 'ollama', 'lmstudio', 'local').
-        TTS_MODEL (str): The model to use for text-to-speech ('openai', 'deepgram', 'elevenlabs', 'melotts', 'cartesia', 'piper', 'local').
+        TRANSCRIPTION_MODEL (str): The model to use for transcription ('openai', 'groq', 'deepgram', 'fastwhisperapi', 'faster-whisper', 'local', 'auto').
+        RESPONSE_MODEL (str): The model to use for response generation ('openai', 'groq', 'ollama', 'lmstudio', 'local', 'auto').
+        TTS_MODEL (str): The model to use for text-to-speech ('openai', 'deepgram', 'elevenlabs', 'melotts', 'cartesia', 'piper', 'local', 'auto').
+            'auto' picks the fastest healthy provider from AUTO_CANDIDATES on every turn.
         OPENAI_API_KEY (str): API key for OpenAI services.
         GROQ_API_KEY (str): API key for Groq services.
         DEEPGRAM_API_KEY (str): API key for Deepgram services.
@@ -22,11 +23,54 @@ class Config:
         LOCAL_MODEL_PATH (str): Path to the local model.
         LMSTUDIO_BASE_URL (str): Base URL for LM Studio local server.
         FASTER_WHISPER_MODEL (str): Model size for faster-whisper.
+        PIPELINED_TURNS (bool): Speak the response sentence by sentence while it is still generating.
+        HISTORY_WINDOWING (bool): Send only the most recent turns that fit the model's token budget.
+        HISTORY_TOKEN_BUDGETS (dict): Prompt token budget per LLM name.
+        VOICE_BUDGET_ENABLED (bool): Cap response tokens per model and stop the stream after a
+            number of sentences that depends on the question type.
+        VOICE_MAX_TOKENS (dict): Response token cap per LLM name for a 'standard' question.
+        HISTORY_SUMMARIZATION (bool): Compact older turns into a rolling summary between turns.
+        SUMMARY_MODEL (str): Response model used for summaries (ideally a cheap local one).
+        MEMORY_ENABLED (bool): Retrieve relevant snippets from past conversations into the prompt.
+        RESPONSE_CACHE_ENABLED (bool): Answer repeated and near-duplicate queries from a cache.
+        TTS_CACHE_ENABLED (bool): Reuse synthesized audio for repeated text, from memory or TTS_CACHE_DIR.
+        TTS_VOICES (dict): Model and voice used per TTS provider.
+        CARTESIA_OUTPUT_FORMAT (dict): Raw audio format requested from Cartesia.
+        CARTESIA_WEBSOCKET (bool): In pipelined turns, send sentences to Cartesia as continuations of one
+            websocket context instead of one request per sentence.
+        TTS_STREAMING (bool): Play OpenAI, ElevenLabs, Deepgram, Piper and MeloTTS speech as it streams
+            in instead of waiting for the whole file.
+        LONG_TEXT_MODE (bool): Synthesize texts of LONG_TEXT_MIN_CHARS or more in sentence chunks on
+            LONG_TEXT_WORKERS parallel workers and play the chunks back in order.
+        LOCAL_LLM_PRELOAD (bool): Load the Ollama/LM Studio model at startup instead of on the first turn.
+        OLLAMA_KEEP_ALIVE (str): How long Ollama keeps the model loaded ('30m', '-1' to pin forever).
+        LMSTUDIO_TTL (int): Seconds LM Studio keeps a just-in-time loaded model after its last request.
+        ROUTING_ENABLED (bool): Send simple turns to ROUTING_FAST_MODEL and complex ones to the heavy model.
+        RETRY_ENABLED (bool): Retry transient provider failures (429, 5xx, network errors) with
+            jittered exponential backoff, honoring Retry-After up to RETRY_MAX_DELAY and giving up
+            when a provider asks for a longer wait.
+        RATE_LIMITS_ENABLED (bool): Pace requests client-side with the token buckets in RATE_LIMITS.
+        RATE_LIMITS (dict): Client-side token-bucket limit per provider ('rate' per second, 'burst'),
+            to be set to the limits of the user's own plan.
+        TURN_DEADLINE_ENABLED (bool): Give each turn a deadline, counted from the end of speech and split
+            into STAGE_BUDGETS, passed to provider calls as timeouts; a turn that runs out of time
+            degrades instead of hanging.
+        CIRCUIT_BREAKERS_ENABLED (bool): Stop calling a failing provider for a while and fall back to the
+            next one in STT_FALLBACK_CHAIN, LLM_FALLBACK_CHAIN or TTS_FALLBACK_CHAIN.
+        HEDGING_ENABLED (bool): Send a slow STT or LLM request to a secondary provider as well once the
+            primary exceeds its observed p90 latency, using whichever answers first.
+        LOCAL_INTENTS (bool): Answer commands like "repeat that" or "what time is it" without the LLM.
+        SPECULATIVE_GENERATION (bool): While the user is still speaking, transcribe the audio so far every
+            SPECULATION_INTERVAL seconds and start the LLM once the partial transcript has been stable for
+            SPECULATION_STABLE_MS, keeping the result if the final transcript matches. Needs faster-whisper.
     """
     # Model selection
-    TRANSCRIPTION_MODEL = 'deepgram'  # possible values: openai, groq, deepgram, fastwhisperapi, faster-whisper
-    RESPONSE_MODEL = 'openai'  # possible values: openai, groq, ollama, lmstudio
-    TTS_MODEL = 'openai'  # possible values: openai, deepgram, elevenlabs, melotts, cartesia, piper
+    TRANSCRIPTION_MODEL = 'deepgram'  # possible values: openai, groq, deepgram, fastwhisperapi, faster-whisper, auto
+    RESPONSE_MODEL = 'openai'  # possible values: openai, groq, ollama, lmstudio, auto
+    TTS_MODEL = 'openai'  # possible values: openai, deepgram, elevenlabs, melotts, cartesia, piper, auto
+
+    # Overlap LLM generation, TTS and playback instead of running them in sequence
+    PIPELINED_TURNS = os.getenv("PIPELINED_TURNS", "false").lower() == "true"
 
     # Piper Server configuration
     PIPER_SERVER_URL = os.getenv("PIPER_SERVER_URL")
@@ -40,10 +84,194 @@ class Config:
     GROQ_LLM="llama3-8b-8192"
     OPENAI_LLM="gpt-4o"
 
+    # Local fast-path intents ("repeat that", "louder", "what time is it", ...)
+    LOCAL_INTENTS = os.getenv("LOCAL_INTENTS", "true").lower() == "true"
+    VOLUME_STEP = 0.2
+
+    # Client-side rate limiting (per provider and API key) and retries
+    RETRY_ENABLED = os.getenv("RETRY_ENABLED", "true").lower() == "true"
+    RETRY_MAX_ATTEMPTS = 3
+    RETRY_BASE_DELAY = 0.25  # seconds, doubled on every attempt
+    RETRY_MAX_DELAY = 4.0  # also the longest Retry-After waited out
+    RATE_LIMITS_ENABLED = os.getenv("RATE_LIMITS_ENABLED", "false").lower() == "true"
+    RATE_LIMITS = {
+        "openai": {"rate": 8.0, "burst": 10},
+        "groq": {"rate": 0.5, "burst": 5},  # Groq free tier (30 requests per minute); raise on paid plans
+        "deepgram": {"rate": 5.0, "burst": 10},
+        "elevenlabs": {"rate": 2.0, "burst": 3},
+        "cartesia": {"rate": 2.0, "burst": 3},
+    }
+
+    # End-to-end turn deadline with per-stage budgets (seconds)
+    TURN_DEADLINE_ENABLED = os.getenv("TURN_DEADLINE_ENABLED", "true").lower() == "true"
+    TURN_DEADLINE_SECONDS = 25.0  # from the end of speech to the first audio
+    STAGE_BUDGETS = {
+        "capture": 30.0,  # longest phrase recorded, outside the turn deadline
+        "stt": 8.0,
+        "llm_first_token": 8.0,
+        "tts_first_chunk": 6.0,
+    }
+    DEADLINE_FALLBACK_MESSAGE = "Sorry, that took too long. Could you say it again?"
+    DEADLINE_FALLBACK_TIMEOUT = 10.0  # seconds to synthesize the fallback message (outside the spent turn budget)
+
+    # Circuit breakers and provider fallback chains (tried after the configured model)
+    CIRCUIT_BREAKERS_ENABLED = os.getenv("CIRCUIT_BREAKERS_ENABLED", "true").lower() == "true"
+    STT_FALLBACK_CHAIN = ["groq", "faster-whisper"]
+    LLM_FALLBACK_CHAIN = ["groq", "ollama"]
+    TTS_FALLBACK_CHAIN = ["openai", "deepgram"]
+    BREAKER_FAILURE_THRESHOLD = 3  # consecutive failures that open the circuit
+    BREAKER_WINDOW = 20  # recent calls the error rate is computed over
+    BREAKER_ERROR_RATE = 0.5
+    BREAKER_SLOW_CALL_SECONDS = 10.0  # slower calls count as failures
+    BREAKER_RECOVERY_SECONDS = 30.0  # time before a half-open probe is allowed
+    LLM_UNAVAILABLE_MESSAGE = "Sorry, I can't reach my language model right now. Please try again in a moment."
+
+    # Hedged requests: after the primary's p90 latency, also ask the secondary provider
+    HEDGING_ENABLED = os.getenv("HEDGING_ENABLED", "false").lower() == "true"
+    HEDGE_STT_SECONDARY = os.getenv("HEDGE_STT_SECONDARY", "groq")  # possible values: openai, groq, deepgram, faster-whisper
+    HEDGE_LLM_SECONDARY = os.getenv("HEDGE_LLM_SECONDARY", "groq")  # possible values: openai, groq, ollama, lmstudio
+    HEDGE_QUANTILE = 0.9
+    HEDGE_MIN_SAMPLES = 5  # samples needed before the observed quantile is trusted
+    HEDGE_DEFAULT_DELAY = 3.0  # seconds, used until enough samples exist
+    HEDGE_LATENCY_WINDOW = 50
+    HEDGE_TIMEOUT = 30.0  # seconds to wait for either provider when the call has no timeout of its own
+
+    # Automatic provider selection for models set to 'auto'
+    AUTO_CANDIDATES = {
+        "stt": ["groq", "deepgram", "openai", "faster-whisper"],
+        "llm": ["groq", "openai", "ollama"],
+        "tts": ["deepgram", "openai", "cartesia", "elevenlabs"],
+    }
+    AUTO_BASELINE_LATENCY = {"stt": 1.0, "llm": 1.0, "tts": 1.0}  # expected seconds before live samples exist
+    AUTO_UNKNOWN_RTT = 0.5  # probe round trip assumed before the first probe
+    AUTO_WINDOW = 20  # live calls kept per provider
+    AUTO_MIN_SAMPLES = 3  # live calls every candidate needs before live latencies replace the probe estimates
+    AUTO_MAX_ERROR_RATE = 0.5
+    AUTO_SWITCH_MARGIN = 0.2  # a challenger must be this much faster to take over
+    AUTO_MIN_DWELL_SECONDS = 60.0  # minimum time between switches
+    AUTO_PROBE_INTERVAL = 60.0
+    AUTO_PROBE_TIMEOUT = 3.0
+
+    # Speculative LLM start on stable partial transcripts, decoded with faster-whisper during capture
+    SPECULATIVE_GENERATION = os.getenv("SPECULATIVE_GENERATION", "false").lower() == "true"
+    SPECULATION_STABLE_MS = 300
+    SPECULATION_INTERVAL = 0.5  # seconds between partial transcriptions of the audio captured so far
+
+    # Query-complexity routing between a fast model and the heavy RESPONSE_MODEL
+    ROUTING_ENABLED = os.getenv("ROUTING_ENABLED", "false").lower() == "true"
+    ROUTING_FAST_MODEL = os.getenv("ROUTING_FAST_MODEL", "groq")  # possible values: groq, ollama, lmstudio
+    ROUTING_HEAVY_MODEL = None  # None uses RESPONSE_MODEL
+    ROUTING_SIMPLE_MAX_WORDS = 8
+    ROUTING_SIMPLE_PATTERNS = [
+        r"^(hi|hello|hey|thanks|thank you|cheers|ok|okay|cool|great|nice|yes|no|yeah|nope|sure)\b[\w\s,!.']{0,30}$",
+        r"^(good (morning|afternoon|evening|night))\b",
+    ]
+    ROUTING_COMPLEX_KEYWORDS = {
+        "why", "explain", "compare", "difference", "analyze", "analyse", "summarize", "summarise",
+        "plan", "write", "code", "debug", "calculate", "solve", "prove", "translate", "recommend",
+        "pros", "cons", "step", "steps", "detail", "detailed",
+    }
+
+    # Chat history windowing: prompt token budget per LLM, leaving room for the reply
+    HISTORY_WINDOWING = os.getenv("HISTORY_WINDOWING", "true").lower() == "true"
+    HISTORY_TOKEN_BUDGETS = {
+        "llama3-8b-8192": 6000,
+        "llama3:8b": 6000,
+        "gpt-4o": 16000,
+    }
+    DEFAULT_HISTORY_TOKEN_BUDGET = 3000
+
+    # Voice generation budget: token cap per LLM, scaled and sentence-limited per question type
+    VOICE_BUDGET_ENABLED = os.getenv("VOICE_BUDGET_ENABLED", "false").lower() == "true"
+    VOICE_MAX_TOKENS = {
+        "llama3-8b-8192": 250,
+        "llama3:8b": 250,
+        "gpt-4o": 250,
+    }
+    DEFAULT_VOICE_MAX_TOKENS = 250
+    VOICE_BUDGET_PROFILES = {
+        "brief": {"token_scale": 0.4, "max_sentences": 2},
+        "standard": {"token_scale": 1.0, "max_sentences": 4},
+        "detailed": {"token_scale": 2.0, "max_sentences": 10},
+    }
+    VOICE_DETAILED_KEYWORDS = {
+        "explain", "describe", "steps", "list", "story", "detail", "detailed", "compare", "how to", "how do",
+    }
+
+    # Background summarization of older turns
+    HISTORY_SUMMARIZATION = os.getenv("HISTORY_SUMMARIZATION", "false").lower() == "true"
+    SUMMARY_MODEL = os.getenv("SUMMARY_MODEL", "ollama")  # possible values: ollama, lmstudio, groq, openai
+    SUMMARY_TRIGGER_TOKENS = 2000  # compact once the history is this large
+    SUMMARY_KEEP_MESSAGES = 6  # most recent messages that are never summarized
+    SUMMARY_MAX_WORDS = 150
+
+    # Long-term conversational memory (local embedding index)
+    MEMORY_ENABLED = os.getenv("MEMORY_ENABLED", "false").lower() == "true"
+    MEMORY_DIR = ".verbi_memory"
+    MEMORY_EMBEDDING_MODEL = "BAAI/bge-small-en-v1.5"  # used when fastembed is installed
+    MEMORY_TOP_K = 3
+    MEMORY_MIN_SCORE = 0.35
+    MEMORY_SNIPPET_CHARS = 300
+
+    # Response cache for repeated and near-duplicate queries
+    RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "false").lower() == "true"
+    RESPONSE_CACHE_MAX_ENTRIES = 256
+    RESPONSE_CACHE_TTL = 3600  # seconds
+    RESPONSE_CACHE_SIMILARITY = 0.9  # 0-1, 1.0 disables near-duplicate hits
+    RESPONSE_CACHE_CONTEXT_MESSAGES = 2  # preceding messages that are part of the key
+    RESPONSE_CACHE_FILLER_WORDS = {"please", "hey", "verbi", "um", "uh", "so", "okay", "ok"}
+    # Near-duplicates may only differ in these words (and in punctuation); any other word must match exactly
+    RESPONSE_CACHE_STOPWORDS = {
+        "a", "an", "the", "is", "are", "was", "were", "be", "do", "does", "did", "can", "could",
+        "would", "will", "you", "me", "i", "us", "tell", "what", "what's", "whats", "of", "to",
+        "for", "about", "in", "on", "at", "it", "it's", "this", "that", "just", "like",
+    }
+    # Queries whose answer depends on the moment or on what was just said are never cached
+    RESPONSE_CACHE_SKIP_PATTERNS = [
+        r"\b(time|date|day|today|tonight|tomorrow|yesterday|now|weather|news|latest|current)\b",
+        r"\b(repeat|again|random|joke|story)\b",
+    ]
+
+    # TTS audio cache (in-memory LRU in front of a size-capped directory that survives restarts)
+    TTS_CACHE_ENABLED = os.getenv("TTS_CACHE_ENABLED", "true").lower() == "true"
+    TTS_CACHE_DIR = ".verbi_tts_cache"
+    TTS_CACHE_MEMORY_BYTES = 16 * 1024 * 1024
+    TTS_CACHE_DISK_BYTES = 256 * 1024 * 1024
+
+    # Streaming TTS playback (raw 16-bit mono PCM straight to the output device)
+    TTS_STREAMING = os.getenv("TTS_STREAMING", "true").lower() == "true"
+    TTS_STREAM_SAMPLE_RATES = {"openai": 24000, "elevenlabs": 22050, "deepgram": 24000}
+    TTS_STREAM_CHUNK_BYTES = 4096
+
+    # Persistent Cartesia session
+    CARTESIA_OUTPUT_FORMAT = {"container": "raw", "encoding": "pcm_s16le", "sample_rate": 22050}  # or pcm_f32le
+    CARTESIA_VOICE_CACHE_FILE = ".verbi_tts_cache/cartesia_voices.json"
+    CARTESIA_WEBSOCKET = os.getenv("CARTESIA_WEBSOCKET", "true").lower() == "true"
+
+    # Long-text mode (parallel sentence-chunk synthesis with ordered playback)
+    LONG_TEXT_MODE = os.getenv("LONG_TEXT_MODE", "true").lower() == "true"
+    LONG_TEXT_MIN_CHARS = 300  # shorter texts are synthesized in one request
+    LONG_TEXT_CHUNK_CHARS = 250  # sentences are merged into chunks of up to this many characters
+    LONG_TEXT_WORKERS = 4  # chunks synthesized at once, on a thread pool
+
+    # Voices per TTS provider (part of the TTS cache key)
+    TTS_VOICES = {
+        "openai": {"model": "tts-1", "voice": "nova"},
+        "deepgram": {"model": "aura-arcas-en", "voice": ""},  # "aura-luna-en"
+        "elevenlabs": {"model": "eleven_turbo_v2", "voice": "Paul J."},
+        "cartesia": {"model": "sonic-english", "voice": "f114a467-c40a-4db8-964d-aaba89cd08fa"},
+    }
+
     # Local Models Configuration
     LMSTUDIO_BASE_URL = os.getenv("LMSTUDIO_BASE_URL", "http://localhost:1234")
     FASTER_WHISPER_MODEL = os.getenv("FASTER_WHISPER_MODEL", "base")  # Options: tiny, base, small, medium, large-v3
 
+    # Local LLM preloading and keep-alive
+    LOCAL_LLM_PRELOAD = os.getenv("LOCAL_LLM_PRELOAD", "true").lower() == "true"
+    LOCAL_LLM_PRIME_SYSTEM_PROMPT = True  # send the system prompt with the warm-up so its prefix is cached
+    OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+    LMSTUDIO_TTL = int(os.getenv("LMSTUDIO_TTL", "1800"))
+
     # API keys and paths
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
     GROQ_API_KEY = os.getenv("GROQ_API_KEY")
@@ -55,6 +283,12 @@ class Config:
     # for serving the MeloTTS model
     TTS_PORT_LOCAL = 5150
 
+    # MeloTTS server tuning (voice_assistant/local_tts_api.py)
+    MELO_TORCH_THREADS = int(os.getenv("MELO_TORCH_THREADS", "0"))  # CPU threads for torch, 0 keeps torch's default
+    MELO_WARMUP_TEXT = "Hello, I am ready."  # synthesized at startup; empty to skip
+    MELO_MAX_BATCH = 8  # requests with the same speaker and speed run as one batch
+    MELO_BATCH_WINDOW_MS = 10  # how long a batch waits for compatible requests
+
     # temp file generated by the initial STT model
     INPUT_AUDIO = "test.mp3"
 
@@ -92,6 +326,56 @@ class Config:
                 if "tts_model" in settings:
                     Config.TTS_MODEL = settings["tts_model"]
 
+                if "pipelined_turns" in settings:
+                    Config.PIPELINED_TURNS = bool(settings["pipelined_turns"])
+
+                if "local_intents" in settings:
+                    Config.LOCAL_INTENTS = bool(settings["local_intents"])
+                if "retry_enabled" in settings:
+                    Config.RETRY_ENABLED = bool(settings["retry_enabled"])
+                if "rate_limits_enabled" in settings:
+                    Config.RATE_LIMITS_ENABLED = bool(settings["rate_limits_enabled"])
+                if "rate_limits" in settings:
+                    Config.RATE_LIMITS.update(settings["rate_limits"])
+                if "turn_deadline_enabled" in settings:
+                    Config.TURN_DEADLINE_ENABLED = bool(settings["turn_deadline_enabled"])
+                if "turn_deadline_seconds" in settings:
+                    Config.TURN_DEADLINE_SECONDS = float(settings["turn_deadline_seconds"])
+                if "stage_budgets" in settings:
+                    Config.STAGE_BUDGETS.update(settings["stage_budgets"])
+                if "circuit_breakers_enabled" in settings:
+                    Config.CIRCUIT_BREAKERS_ENABLED = bool(settings["circuit_breakers_enabled"])
+                if "stt_fallback_chain" in settings:
+                    Config.STT_FALLBACK_CHAIN = list(settings["stt_fallback_chain"])
+                if "llm_fallback_chain" in settings:
+                    Config.LLM_FALLBACK_CHAIN = list(settings["llm_fallback_chain"])
+                if "tts_fallback_chain" in settings:
+                    Config.TTS_FALLBACK_CHAIN = list(settings["tts_fallback_chain"])
+                if "hedging_enabled" in settings:
+                    Config.HEDGING_ENABLED = bool(settings["hedging_enabled"])
+                if "hedge_stt_secondary" in settings:
+                    Config.HEDGE_STT_SECONDARY = settings["hedge_stt_secondary"]
+                if "hedge_llm_secondary" in settings:
+                    Config.HEDGE_LLM_SECONDARY = settings["hedge_llm_secondary"]
+                if "auto_candidates" in settings:
+                    Config.AUTO_CANDIDATES.update(settings["auto_candidates"])
+                if "auto_switch_margin" in settings:
+                    Config.AUTO_SWITCH_MARGIN = float(settings["auto_switch_margin"])
+                if "auto_min_dwell_seconds" in settings:
+                    Config.AUTO_MIN_DWELL_SECONDS = float(settings["auto_min_dwell_seconds"])
+                if "speculative_generation" in settings:
+                    Config.SPECULATIVE_GENERATION = bool(settings["speculative_generation"])
+                if "speculation_stable_ms" in settings:
+                    Config.SPECULATION_STABLE_MS = int(settings["speculation_stable_ms"])
+                if "speculation_interval" in settings:
+                    Config.SPECULATION_INTERVAL = float(settings["speculation_interval"])
+                if "routing_enabled" in settings:
+                    Config.ROUTING_ENABLED = bool(settings["routing_enabled"])
+                if "routing_fast_model" in settings:
+                    Config.ROUTING_FAST_MODEL = settings["routing_fast_model"]
+                if "routing_heavy_model" in settings:
+                    Config.ROUTING_HEAVY_MODEL = settings["routing_heavy_model"]
+
                 # Update LLM models
                 if "openai_llm" in settings:
                     Config.OPENAI_LLM = settings["openai_llm"]
@@ -100,11 +384,51 @@ class Config:
                 if "ollama_llm" in settings:
                     Config.OLLAMA_LLM = settings["ollama_llm"]
 
+                if "history_windowing" in settings:
+                    Config.HISTORY_WINDOWING = bool(settings["history_windowing"])
+                if "history_token_budgets" in settings:
+                    Config.HISTORY_TOKEN_BUDGETS.update(settings["history_token_budgets"])
+
+                if "history_summarization" in settings:
+                    Config.HISTORY_SUMMARIZATION = bool(settings["history_summarization"])
+                if "voice_budget_enabled" in settings:
+                    Config.VOICE_BUDGET_ENABLED = bool(settings["voice_budget_enabled"])
+                if "voice_max_tokens" in settings:
+                    Config.VOICE_MAX_TOKENS.update(settings["voice_max_tokens"])
+                if "summary_model" in settings:
+                    Config.SUMMARY_MODEL = settings["summary_model"]
+
+                if "memory_enabled" in settings:
+                    Config.MEMORY_ENABLED = bool(settings["memory_enabled"])
+
+                if "response_cache_enabled" in settings:
+                    Config.RESPONSE_CACHE_ENABLED = bool(settings["response_cache_enabled"])
+                if "tts_cache_enabled" in settings:
+                    Config.TTS_CACHE_ENABLED = bool(settings["tts_cache_enabled"])
+                if "tts_streaming" in settings:
+                    Config.TTS_STREAMING = bool(settings["tts_streaming"])
+                if "cartesia_output_format" in settings:
+                    Config.CARTESIA_OUTPUT_FORMAT.update(settings["cartesia_output_format"])
+                if "cartesia_websocket" in settings:
+                    Config.CARTESIA_WEBSOCKET = bool(settings["cartesia_websocket"])
+                if "long_text_mode" in settings:
+                    Config.LONG_TEXT_MODE = bool(settings["long_text_mode"])
+                if "long_text_workers" in settings:
+                    Config.LONG_TEXT_WORKERS = max(1, int(settings["long_text_workers"]))
+                if "tts_voices" in settings:
+                    Config.TTS_VOICES.update(settings["tts_voices"])
+
                 # Update local model settings
                 if "lmstudio_base_url" in settings:
                     Config.LMSTUDIO_BASE_URL = settings["lmstudio_base_url"]
                 if "faster_whisper_model" in settings:
                     Config.FASTER_WHISPER_MODEL = settings["faster_whisper_model"]
+                if "local_llm_preload" in settings:
+                    Config.LOCAL_LLM_PRELOAD = bool(settings["local_llm_preload"])
+                if "ollama_keep_alive" in settings:
+                    Config.OLLAMA_KEEP_ALIVE = settings["ollama_keep_alive"]
+                if "lmstudio_ttl" in settings:
+                    Config.LMSTUDIO_TTL = int(settings["lmstudio_ttl"])
 
                 # Update API keys if provided
                 if settings.get("openai_api_key"):
@@ -138,11 +462,11 @@ class Config:
             ValueError: If a required environment variable is not set.
         """
         Config._validate_model('TRANSCRIPTION_MODEL', [
-            'openai', 'groq', 'deepgram', 'fastwhisperapi', 'faster-whisper', 'local'])
+            'openai', 'groq', 'deepgram', 'fastwhisperapi', 'faster-whisper', 'local', 'auto'])
         Config._validate_model('RESPONSE_MODEL', [
-            'openai', 'groq', 'ollama', 'lmstudio', 'local'])
+            'openai', 'groq', 'ollama', 'lmstudio', 'local', 'auto'])
         Config._validate_model('TTS_MODEL', [
-            'openai', 'deepgram', 'elevenlabs', 'melotts', 'cartesia', 'local', 'piper', 'pyttsx3'])
+            'openai', 'deepgram', 'elevenlabs', 'melotts', 'cartesia', 'local', 'piper', 'pyttsx3', 'auto'])
 
         Config._validate_api_key('TRANSCRIPTION_MODEL', 'openai', 'OPENAI_API_KEY')
         Config._validate_api_key('TRANSCRIPTION_MODEL', 'groq', 'GROQ_API_KEY')
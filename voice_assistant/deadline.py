@@ -0,0 +1,99 @@
+# voice_assistant/deadline.py
+
+import logging
+import time
+
+from voice_assistant.config import Config
+
+# Stages of a turn, in order
+STAGES = ("capture", "stt", "llm_first_token", "tts_first_chunk")
+
+
+class TurnDeadline:
+    """
+    End-to-end deadline for one turn, split into per-stage budgets.
+
+    Each stage may take at most its budget from Config.STAGE_BUDGETS and never
+    more than what is left of the turn, so a slow stage eats into the time of
+    the stages after it instead of extending the turn. The turn's time runs
+    from the end of speech: capture is only limited by its own budget, and
+    finishing it restarts the clock.
+    """
+
+    def __init__(self, total: float = None, budgets: dict = None):
+        """
+        Args:
+            total: Seconds for the whole turn (Config.TURN_DEADLINE_SECONDS by default).
+            budgets: Stage name to seconds (Config.STAGE_BUDGETS by default).
+        """
+        self.total = total or Config.TURN_DEADLINE_SECONDS
+        self.budgets = budgets or Config.STAGE_BUDGETS
+        self.started_at = time.perf_counter()
+        self._stage_started = {}
+
+    def remaining(self) -> float:
+        """Seconds left in the turn (0 once the deadline has passed)."""
+        return max(self.total - (time.perf_counter() - self.started_at), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        """True once the turn deadline has passed."""
+        return self.remaining() <= 0
+
+    def timeout(self, stage: str) -> float:
+        """
+        Get the timeout to pass to the provider call of a stage.
+
+        Args:
+            stage: One of STAGES.
+
+        Returns:
+            float: The stage budget, capped at the time left in the turn (at least 0.1s).
+        """
+        if stage == "capture":
+            return self.budgets[stage]
+        return max(min(self.budgets[stage], self.remaining()), 0.1)
+
+    def start(self, stage: str) -> float:
+        """
+        Mark the start of a stage.
+
+        Args:
+            stage: One of STAGES.
+
+        Returns:
+            float: The stage's timeout.
+        """
+        self._stage_started[stage] = time.perf_counter()
+        return self.timeout(stage)
+
+    def finish(self, stage: str) -> bool:
+        """
+        Mark the end of a stage and log how much budget is left.
+
+        Args:
+            stage: One of STAGES.
+
+        Returns:
+            bool: True if the stage finished within its budget.
+        """
+        now = time.perf_counter()
+        elapsed = now - self._stage_started.get(stage, self.started_at)
+        if stage == "capture":
+            self.started_at = now
+        budget = self.budgets[stage]
+        within = elapsed <= budget
+        log = logging.info if within else logging.warning
+        log(f"Stage {stage} took {elapsed:.2f}s of its {budget:.2f}s budget, "
+            f"{self.remaining():.2f}s left in the turn")
+        return within
+
+    def should_degrade(self) -> bool:
+        """
+        Check whether the rest of the turn no longer fits the remaining budget.
+
+        Returns:
+            bool: True if less time is left than the LLM and TTS stages need.
+        """
+        needed = self.budgets["llm_first_token"] + self.budgets["tts_first_chunk"]
+        return self.remaining() < needed
@@ -0,0 +1,118 @@
+# voice_assistant/generation_budget.py
+
+import logging
+import re
+import sys
+
+from voice_assistant.config import Config
+from voice_assistant.router import classify_turn
+from voice_assistant.segmenter import SentenceSegmenter
+
+# A word with its trailing whitespace; sentence cuts only happen at whitespace,
+# so feeding the segmenter piece by piece finds the exact cut position
+_PIECE_RE = re.compile(r"\S+\s*|\s+")
+
+
+def classify_question(text: str) -> str:
+    """
+    Classify how long a spoken answer to the user's turn should be.
+
+    Args:
+        text: The user's transcribed text.
+
+    Returns:
+        str: 'brief', 'standard' or 'detailed' (a key of Config.VOICE_BUDGET_PROFILES).
+    """
+    if classify_turn(text) == "simple":
+        return "brief"
+    lowered = text.lower()
+    if any(re.search(rf"\b{re.escape(keyword)}\b", lowered) for keyword in Config.VOICE_DETAILED_KEYWORDS):
+        return "detailed"
+    return "standard"
+
+
+class GenerationBudget:
+    """
+    Token cap and sentence limit for one spoken response.
+
+    The token cap is passed to the provider as max_tokens (num_predict for
+    Ollama). The sentence limit is enforced on the stream with take(), which
+    trims the delta that completes the last allowed sentence.
+
+    Attributes:
+        question_type (str): 'brief', 'standard' or 'detailed'.
+        max_tokens (int): Token cap sent to the provider.
+        max_sentences (int): Sentences to speak before the stream is stopped.
+        spoken_tokens (int): Deltas passed through so far.
+        exhausted (bool): True once the sentence limit has been reached.
+    """
+
+    def __init__(self, question_type: str, max_tokens: int, max_sentences: int):
+        self.question_type = question_type
+        self.max_tokens = max_tokens
+        self.max_sentences = max_sentences
+        self.spoken_tokens = 0
+        self.exhausted = False
+        # Only real sentence ends count, never clause cuts
+        self._segmenter = SentenceSegmenter(clause_chars=sys.maxsize)
+        self._sentences = 0
+
+    def take(self, delta: str) -> str:
+        """
+        Pass a delta through the sentence limit.
+
+        Args:
+            delta: The next piece of generated text.
+
+        Returns:
+            str: The part of the delta within budget (empty once exhausted).
+        """
+        if self.exhausted:
+            return ""
+        kept = []
+        for piece in _PIECE_RE.findall(delta):
+            kept.append(piece)
+            self._sentences += len(self._segmenter.feed(piece))
+            if self._sentences >= self.max_sentences:
+                self.exhausted = True
+                break
+        text = "".join(kept)
+        if self.exhausted:
+            text = text.rstrip()
+        if text:
+            self.spoken_tokens += 1
+        return text
+
+    def log_usage(self, generated_tokens: int):
+        """
+        Log tokens generated against tokens passed on to be spoken.
+
+        Args:
+            generated_tokens: Deltas received from the provider.
+        """
+        stop = f", stopped after {self.max_sentences} sentences" if self.exhausted else ""
+        logging.info(f"Voice budget ({self.question_type}): generated {generated_tokens} tokens, "
+                     f"spoke {self.spoken_tokens} (cap {self.max_tokens} tokens{stop})")
+
+
+def get_generation_budget(llm_name: str, chat_history: list):
+    """
+    Build the generation budget for a live turn.
+
+    Args:
+        llm_name: The LLM generating the response.
+        chat_history: The chat history ending with the user's message.
+
+    Returns:
+        GenerationBudget: The budget, or None if Config.VOICE_BUDGET_ENABLED is off.
+    """
+    if not Config.VOICE_BUDGET_ENABLED:
+        return None
+    user_text = ""
+    if chat_history and chat_history[-1].get("role") == "user":
+        user_text = chat_history[-1].get("content") or ""
+    question_type = classify_question(user_text)
+    profile = Config.VOICE_BUDGET_PROFILES[question_type]
+    base_tokens = Config.VOICE_MAX_TOKENS.get(llm_name, Config.DEFAULT_VOICE_MAX_TOKENS)
+    max_tokens = max(int(base_tokens * profile["token_scale"]), 16)
+    return GenerationBudget(question_type, max_tokens, profile["max_sentences"])
@@ -0,0 +1,246 @@
+# voice_assistant/hedging.py
+
+import logging
+import queue
+import threading
+import time
+from collections import deque
+
+from voice_assistant.config import Config
+from voice_assistant.utils import resume_stream
+from voice_assistant.api_key_manager import API_KEY_MAPPING, get_api_key
+
+# The race of the hedged attempt running on the current thread
+_attempt = threading.local()
+
+
+class LatencyTracker:
+    """Rolling window of observed latencies per (kind, provider)."""
+
+    def __init__(self, window: int = None):
+        """
+        Args:
+            window: Number of recent samples kept per provider.
+        """
+        self.window = window or Config.HEDGE_LATENCY_WINDOW
+        self._lock = threading.Lock()
+        self._samples = {}
+
+    def record(self, key, seconds: float):
+        """Record one latency sample."""
+        with self._lock:
+            self._samples.setdefault(key, deque(maxlen=self.window)).append(seconds)
+
+    def quantile(self, key, q: float):
+        """
+        Get a latency quantile.
+
+        Args:
+            key: The (kind, provider) key.
+            q: The quantile, e.g. 0.9.
+
+        Returns:
+            float: The quantile in seconds, or None with fewer than Config.HEDGE_MIN_SAMPLES samples.
+        """
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if len(samples) < Config.HEDGE_MIN_SAMPLES:
+            return None
+        return samples[min(int(q * len(samples)), len(samples) - 1)]
+
+
+def hedge_cancelled() -> bool:
+    """
+    Check whether the current thread runs a hedged attempt whose race is already decided.
+
+    Returns:
+        bool: True if the attempt's result will be discarded, so it should stop early.
+    """
+    race_over = getattr(_attempt, "race_over", None)
+    return race_over is not None and race_over.is_set()
+
+
+def hedge_partner(service: str, primary: str, secondary: str):
+    """
+    Check whether a secondary provider can hedge a primary one.
+
+    Args:
+        service: 'transcription' or 'response'.
+        primary: The primary provider.
+        secondary: The configured secondary provider.
+
+    Returns:
+        str: The secondary provider, or None if it is unset, the same as the
+            primary, or missing its API key.
+    """
+    if not secondary or secondary == primary:
+        return None
+    if secondary in API_KEY_MAPPING.get(service, {}) and not get_api_key(service, secondary):
+        return None
+    return secondary
+
+
+class Hedger:
+    """
+    Hedge slow provider calls with a second provider.
+
+    The primary is called first. If it has not answered within its observed
+    p90 latency (Config.HEDGE_QUANTILE), or fails before then, the same
+    request is sent to the secondary and whichever succeeds first wins. Once
+    the race is decided the loser is cancelled: it stops retrying, and its
+    result is discarded (streams are closed, which aborts their HTTP request)
+    as soon as its provider call returns.
+    """
+
+    def __init__(self, tracker: LatencyTracker = None):
+        """
+        Args:
+            tracker: Latency tracker to learn hedge delays from.
+        """
+        self.tracker = tracker or LatencyTracker()
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def call(self, kind: str, primary: str, secondary: str, fn, discard=None, timeout: float = None):
+        """
+        Run fn on the primary provider, hedging to the secondary when it is slow or fails.
+
+        Args:
+            kind: What is being called ('stt', 'llm'), used to key latencies.
+            primary: The primary provider.
+            secondary: The secondary provider, or None to only track latency.
+            fn: Called with a provider name, returns the result.
+            discard: Called with a losing result that arrives after the winner.
+            timeout: Seconds to wait for an answer (Config.HEDGE_TIMEOUT by default).
+
+        Returns:
+            tuple: (winning provider, result).
+
+        Raises:
+            TimeoutError: If neither provider answered within the timeout.
+        """
+        self._count(primary, "calls")
+        if not secondary:
+            start = time.perf_counter()
+            result = fn(primary)
+            self.tracker.record((kind, primary), time.perf_counter() - start)
+            return primary, result
+
+        delay = self.tracker.quantile((kind, primary), Config.HEDGE_QUANTILE)
+        if delay is None:
+            delay = Config.HEDGE_DEFAULT_DELAY
+        timeout = timeout or Config.HEDGE_TIMEOUT
+        deadline = time.perf_counter() + timeout
+
+        results = queue.Queue()
+        race_over = threading.Event()
+
+        def attempt(provider):
+            _attempt.race_over = race_over
+            start = time.perf_counter()
+            try:
+                value, error = fn(provider), None
+            except Exception as e:
+                value, error = None, e
+            if error is None:
+                self.tracker.record((kind, provider), time.perf_counter() - start)
+            with self._lock:
+                lost = race_over.is_set()
+                if error is None and not lost:
+                    race_over.set()
+            if lost:
+                if error is None and discard:
+                    discard(value)
+                return
+            results.put((provider, value, error))
+
+        threading.Thread(target=attempt, args=(primary,), daemon=True).start()
+        try:
+            provider, value, error = results.get(timeout=min(delay, timeout))
+            if error is None:
+                return provider, value
+            logging.info(f"{primary} {kind} failed ({error}), hedging with {secondary}")
+            errors, pending = [error], 1
+        except queue.Empty:
+            logging.info(f"{primary} {kind} slower than {delay:.2f}s, hedging with {secondary}")
+            errors, pending = [], 2
+        self._count(primary, "hedged")
+        threading.Thread(target=attempt, args=(secondary,), daemon=True).start()
+
+        while pending:
+            try:
+                provider, value, error = results.get(timeout=max(deadline - time.perf_counter(), 0))
+            except queue.Empty:
+                self._give_up(race_over, results, discard)
+                raise TimeoutError(f"Neither {primary} nor {secondary} answered {kind} within {timeout:.1f}s")
+            pending -= 1
+            if error is None:
+                break
+            errors.append(error)
+        else:
+            raise errors[-1]
+
+        self._count(primary, "races")
+        self._count(secondary, "races")
+        self._count(provider, "wins")
+        logging.info(f"Hedged {kind} won by {provider}")
+        return provider, value
+
+    def stream(self, kind: str, primary: str, secondary: str, open_stream, timeout: float = None):
+        """
+        Race two streams on their first token.
+
+        Args:
+            kind: What is being called, used to key latencies.
+            primary: The primary provider.
+            secondary: The secondary provider, or None to only track latency.
+            open_stream: Called with a provider name, returns an iterator of deltas.
+            timeout: Seconds to wait for a first token (Config.HEDGE_TIMEOUT by default).
+
+        Returns:
+            tuple: (winning provider, iterator over the winner's deltas).
+        """
+        def first_token(provider):
+            iterator = iter(open_stream(provider))
+            return iterator, next(iterator, None)
+
+        def close(value):
+            iterator = value[0]
+            if hasattr(iterator, "close"):
+                iterator.close()
+
+        provider, (iterator, first) = self.call(kind, primary, secondary, first_token, close, timeout)
+        return provider, resume_stream(first, iterator)
+
+    def get_stats(self) -> dict:
+        """
+        Get hedging statistics.
+
+        Returns:
+            dict: Provider to 'calls' (as primary), 'hedged', 'races', 'wins',
+                'hedge_rate' and 'win_rate'.
+        """
+        with self._lock:
+            stats = {provider: dict(counts) for provider, counts in self._stats.items()}
+        for counts in stats.values():
+            counts["hedge_rate"] = counts["hedged"] / counts["calls"] if counts["calls"] else 0.0
+            counts["win_rate"] = counts["wins"] / counts["races"] if counts["races"] else 0.0
+        return stats
+
+    def _give_up(self, race_over, results, discard):
+        # A success queued just before the race ended is discarded like a late one
+        with self._lock:
+            race_over.set()
+        while not results.empty():
+            _, value, error = results.get()
+            if error is None and discard:
+                discard(value)
+
+    def _count(self, provider, field):
+        with self._lock:
+            counts = self._stats.setdefault(provider, {"calls": 0, "hedged": 0, "races": 0, "wins": 0})
+            counts[field] += 1
+
+
+# Global instance
+hedger = Hedger()
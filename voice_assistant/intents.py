@@ -0,0 +1,151 @@
+# voice_assistant/intents.py
+
+import re
+from datetime import datetime
+
+# Politeness and wake words stripped before matching, so "hey Verbi, could you
+# repeat that please" matches the same pattern as "repeat that"
+_FILLER_RE = re.compile(
+    r"\b(hey|hi|ok|okay|verbi|please|can you|could you|would you|will you|just|um|uh)\b"
+)
+_PUNCTUATION_RE = re.compile(r"[^\w\s']")
+_SPACE_RE = re.compile(r"\s+")
+
+
+class IntentResult:
+    """
+    Outcome of a locally handled intent.
+
+    Attributes:
+        name (str): The intent name.
+        action (str): What the caller should do ('exit', 'repeat', 'volume_up',
+            'volume_down', 'clear_history', 'speak').
+        response (str): Text to speak, or None if the intent needs no spoken answer.
+    """
+
+    def __init__(self, name: str, action: str, response: str = None):
+        self.name = name
+        self.action = action
+        self.response = response
+
+    def __repr__(self):
+        return f"IntentResult(name={self.name!r}, action={self.action!r}, response={self.response!r})"
+
+
+def normalize_command(text: str) -> str:
+    """
+    Normalize a transcript for intent matching.
+
+    Args:
+        text: The user's transcribed text.
+
+    Returns:
+        str: Lowercased text without punctuation, filler or wake words.
+    """
+    text = _PUNCTUATION_RE.sub(" ", text.lower())
+    text = _FILLER_RE.sub(" ", text)
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+class IntentEngine:
+    """
+    Answer common voice commands locally, without an LLM round trip.
+
+    All registered patterns are compiled into a single alternation with one
+    named group per intent, so matching a transcript is one regex call.
+    """
+
+    def __init__(self):
+        """Initialize an engine with no intents."""
+        self._intents = {}
+        self._pattern = None
+
+    def register(self, name: str, patterns: list, handler):
+        """
+        Register an intent.
+
+        Args:
+            name: Unique intent name (a valid identifier).
+            patterns: Regexes matched against the whole normalized transcript.
+            handler: Called with the normalized transcript, returns an IntentResult.
+        """
+        self._intents[name] = (patterns, handler)
+        self._pattern = None
+
+    def unregister(self, name: str):
+        """Remove an intent if it is registered."""
+        if self._intents.pop(name, None) is not None:
+            self._pattern = None
+
+    def match(self, text: str):
+        """
+        Match a transcript against the registered intents.
+
+        Args:
+            text: The user's transcribed text.
+
+        Returns:
+            IntentResult: The handled intent, or None if the LLM should answer.
+        """
+        if self._pattern is None:
+            self._compile()
+        if self._pattern is None:
+            return None
+        command = normalize_command(text)
+        match = self._pattern.fullmatch(command)
+        if match is None:
+            return None
+        name = match.lastgroup
+        return self._intents[name][1](command)
+
+    def _compile(self):
+        alternatives = [
+            f"(?P<{name}>{'|'.join(f'(?:{p})' for p in patterns)})"
+            for name, (patterns, _) in self._intents.items()
+        ]
+        self._pattern = re.compile("|".join(alternatives)) if alternatives else None
+
+
+def _tell_time(command):
+    # %-I is glibc-only; strip the leading zero by hand so this also works on Windows
+    now = datetime.now()
+    return IntentResult("time", "speak", f"It's {now.strftime('%I').lstrip('0')}:{now.strftime('%M %p')}.")
+
+
+def _tell_date(command):
+    now = datetime.now()
+    return IntentResult("date", "speak", f"Today is {now.strftime('%A, %B')} {now.day}.")
+
+
+def build_default_engine() -> IntentEngine:
+    """
+    Build the engine with the built-in intents.
+
+    Returns:
+        IntentEngine: Engine handling exit, repeat, volume, time, date and clear.
+    """
+    engine = IntentEngine()
+    engine.register("exit", [r".*\b(goodbye|good bye|arrivederci)\b.*"],
+                    lambda command: IntentResult("exit", "exit", None))
+    engine.register("repeat", [r"(repeat|say) (that|it)( again)?", r"repeat", r"come again",
+                               r"what did you (just )?say", r"pardon"],
+                    lambda command: IntentResult("repeat", "repeat", None))
+    engine.register("volume_up", [r"(louder|speak up|volume up|turn (it )?up( the volume)?)"],
+                    lambda command: IntentResult("volume_up", "volume_up", None))
+    engine.register("volume_down", [r"(quieter|softer|volume down|turn (it )?down( the volume)?)"],
+                    lambda command: IntentResult("volume_down", "volume_down", None))
+    engine.register("time", [r"what time is it( now)?", r"what's the time( now)?", r"tell me the time",
+                             r"what is the time( now)?"],
+                    _tell_time)
+    engine.register("date", [r"what day is (it|today)", r"what's the date( today)?",
+                             r"what is the date( today)?", r"what's today's date"],
+                    _tell_date)
+    engine.register("clear_history", [r"(clear|reset|forget) (the |our |this )?(conversation|chat|history)",
+                                      r"start over"],
+                    lambda command: IntentResult("clear_history", "clear_history",
+                                                 "Okay, I've cleared our conversation."))
+    return engine
+
+
+# Global instance
+intent_engine = build_default_engine()
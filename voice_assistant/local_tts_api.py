@@ -1,33 +1,41 @@
 from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, Field
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel
 from melo.api import TTS
 from config import Config
+from segmenter import split_sentences
+import io
+import logging
+import queue
+import threading
+import time
+import wave
+from collections import Counter
+from concurrent.futures import Future
+import numpy as np
 import torch
-import uuid
 
 app = FastAPI()
 
 class TextToSpeechRequest(BaseModel):
     """
     Model representing a text-to-speech request.
-    
+
     Attributes:
         text (str): The text to convert to speech.
         language (str): The language of the text.
         accent (str): The accent to use for the speech.
         speed (float): The speed of the speech.
-        filename (str): The desired name for the output audio file.
     """
     text: str
     language: str = 'EN'
     accent: str = 'EN-US'
     speed: float = 1.0
-    filename: str = Field(default_factory=lambda: f"{uuid.uuid4()}.wav")
 
 def get_device():
     """
     Determine the appropriate device for running the TTS model.
-    
+
     Returns:
         str: The device to use ('cuda', 'mps', or 'cpu').
     """
@@ -40,38 +48,208 @@ def get_device():
 
 # Initialize the TTS model
 device = get_device()  # Determine the appropriate device
+if device == 'cpu' and Config.MELO_TORCH_THREADS:
+    torch.set_num_threads(Config.MELO_TORCH_THREADS)
 model = TTS(language='EN', device=device)
 speaker_ids = model.hps.data.spk2id
+sample_rate = model.hps.data.sampling_rate
+
+
+def synthesize_pcm(text, speaker_id, speed=1.0):
+    """
+    Synthesize text in memory and log the real-time factor.
+
+    Args:
+        text (str): The text to convert to speech.
+        speaker_id (int): The speaker to use.
+        speed (float): The speed of the speech.
+
+    Returns:
+        tuple: (16-bit mono PCM bytes at sample_rate, real-time factor).
+    """
+    start = time.perf_counter()
+    with torch.inference_mode():
+        audio = model.tts_to_file(text, speaker_id, None, speed=speed, quiet=True)
+    elapsed = time.perf_counter() - start
+    # Real-time factor: seconds of compute per second of audio (below 1 is faster than real time)
+    rtf = elapsed / max(len(audio) / sample_rate, 1e-6)
+    logging.info(f"Synthesized {len(audio) / sample_rate:.2f}s of audio in {elapsed:.2f}s (RTF {rtf:.3f})")
+    return (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16).tobytes(), rtf
+
+
+def to_wav(pcm):
+    """Wrap 16-bit mono PCM in a WAV container."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(pcm)
+    return buffer.getvalue()
+
+
+class SynthesisScheduler:
+    """
+    Single owner of the model, fed by a request queue.
+
+    FastAPI runs endpoints on a thread pool, and the model must not be used
+    from several threads at once. Every synthesis goes through this queue
+    instead. Requests with the same speaker and speed that arrive within
+    Config.MELO_BATCH_WINDOW_MS of each other are batched, up to
+    Config.MELO_MAX_BATCH. A batch runs back to back on the model thread
+    (MeloTTS has no batched inference API) and each result is routed back
+    to its caller.
+    """
+
+    def __init__(self, max_batch, window):
+        """
+        Args:
+            max_batch (int): Largest number of requests run as one batch.
+            window (float): Seconds to wait for compatible requests to join a batch.
+        """
+        self.max_batch = max_batch
+        self.window = window
+        self._queue = queue.Queue()
+        self._deferred = []
+        self._lock = threading.Lock()
+        self.queue_depth_histogram = Counter()
+        self.batch_size_histogram = Counter()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def submit(self, text, speaker_id, speed=1.0):
+        """
+        Queue a synthesis and wait for its result.
+
+        Returns:
+            tuple: (16-bit mono PCM bytes, real-time factor), as from synthesize_pcm.
+        """
+        future = Future()
+        self._queue.put(((speaker_id, speed), text, future))
+        return future.result()
+
+    def get_metrics(self):
+        """
+        Get queue and batching metrics.
+
+        Returns:
+            dict: Current queue depth, and histograms of the queue depth seen when
+                each batch started and of batch sizes.
+        """
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize() + len(self._deferred),
+                "queue_depth_histogram": dict(sorted(self.queue_depth_histogram.items())),
+                "batch_size_histogram": dict(sorted(self.batch_size_histogram.items())),
+                "batches": sum(self.batch_size_histogram.values()),
+                "requests": sum(size * count for size, count in self.batch_size_histogram.items()),
+            }
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            for _, text, future in batch:
+                try:
+                    future.set_result(synthesize_pcm(text, *batch[0][0]))
+                except Exception as e:
+                    future.set_exception(e)
+
+    def _next_batch(self):
+        first = self._deferred.pop(0) if self._deferred else self._queue.get()
+        with self._lock:
+            self.queue_depth_histogram[self._queue.qsize() + len(self._deferred)] += 1
+        batch = [first]
+        # Requests skipped by an earlier batch go first, in arrival order
+        for item in list(self._deferred):
+            if len(batch) < self.max_batch and item[0] == first[0]:
+                self._deferred.remove(item)
+                batch.append(item)
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            try:
+                item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            if item[0] == first[0]:
+                batch.append(item)
+            else:
+                self._deferred.append(item)
+        with self._lock:
+            self.batch_size_histogram[len(batch)] += 1
+        return batch
+
+
+# Warm up so the first request does not pay for lazy initialization
+if Config.MELO_WARMUP_TEXT:
+    synthesize_pcm(Config.MELO_WARMUP_TEXT, speaker_ids['EN-US'])
+
+scheduler = SynthesisScheduler(Config.MELO_MAX_BATCH, Config.MELO_BATCH_WINDOW_MS / 1000)
 
 
 @app.post("/generate-audio/")
 def generate_audio(request: TextToSpeechRequest):
     """
-    Generate an audio file from the given text.
+    Generate audio from the given text.
 
     Args:
         request (TextToSpeechRequest): The request containing text and other parameters.
 
     Returns:
-        dict: A dictionary containing a message and the file path of the generated audio.
-    
+        Response: The WAV audio, with the synthesis real-time factor in the X-Real-Time-Factor header.
+
     Raises:
         HTTPException: If the specified accent is invalid or if there is an error during audio generation.
     """
     if request.accent not in speaker_ids:
         raise HTTPException(status_code=400, detail="Invalid accent specified")
-    
+
     try:
-        # Use the provided filename or generate a unique one
-        output_filename = request.filename
-        
-        # Generate the audio file
-        model.tts_to_file(request.text, speaker_ids[request.accent], output_filename, speed=request.speed)
-        
-        return {"message": "Audio file generated successfully", "file_path": output_filename}
+        pcm, rtf = scheduler.submit(request.text, speaker_ids[request.accent], request.speed)
+        return Response(content=to_wav(pcm), media_type="audio/wav",
+                        headers={"X-Real-Time-Factor": f"{rtf:.4f}"})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+
+@app.post("/generate-audio/stream")
+def generate_audio_stream(request: TextToSpeechRequest):
+    """
+    Synthesize sentence by sentence and stream raw PCM over chunked HTTP.
+
+    Each sentence is sent as soon as it is synthesized, so the client can
+    start playback after the first one. The sample rate is in the
+    X-Sample-Rate header.
+
+    Args:
+        request (TextToSpeechRequest): The request containing text and other parameters.
+
+    Returns:
+        StreamingResponse: 16-bit mono PCM chunks, one per sentence.
+
+    Raises:
+        HTTPException: If the specified accent is invalid.
+    """
+    if request.accent not in speaker_ids:
+        raise HTTPException(status_code=400, detail="Invalid accent specified")
+    sentences = split_sentences(request.text) or [request.text]
+
+    def chunks():
+        for sentence in sentences:
+            yield scheduler.submit(sentence, speaker_ids[request.accent], request.speed)[0]
+
+    return StreamingResponse(chunks(), media_type="audio/pcm",
+                             headers={"X-Sample-Rate": str(sample_rate)})
+
+
+@app.get("/metrics")
+def metrics():
+    """
+    Report the scheduler's queue depth and batch-size histograms.
+
+    Returns:
+        dict: The metrics from SynthesisScheduler.get_metrics.
+    """
+    return scheduler.get_metrics()
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=Config.TTS_PORT_LOCAL)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=Config.TTS_PORT_LOCAL)
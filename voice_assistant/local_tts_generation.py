@@ -2,19 +2,24 @@ import requests
 from voice_assistant.config import Config
 
 
-def generate_audio_file_melotts(text, language='EN', accent='EN-US', speed=1.0, filename=None):
+def generate_audio_file_melotts(text, language='EN', accent='EN-US', speed=1.0, filename=None, timeout=None):
     """
-    Generate an audio file from the given text using the FastAPI endpoint.
+    Generate audio from the given text using the FastAPI endpoint.
+
+    The server returns the WAV bytes, which are written locally, so the
+    server and the client do not need to share a filesystem.
 
     Args:
         text (str): The text to convert to speech.
         language (str): The language of the text. Default is 'EN'.
         accent (str): The accent to use for the speech. Default is 'EN-US'.
         speed (float): The speed of the speech. Default is 1.0.
-        filename (str, optional): The desired name for the output audio file. If None, a unique name will be generated.
+        filename (str, optional): Where to save the audio. If None, the audio is only returned.
+        timeout (float, optional): Seconds to wait for the server. If None, waits indefinitely.
 
     Returns:
-        dict: A dictionary containing the message and the file path of the generated audio.
+        dict: The WAV bytes ('audio'), the file path they were saved to ('file_path')
+            and the server's synthesis real-time factor ('real_time_factor').
     """
     # Define the API endpoint
     url = f"http://localhost:{Config.TTS_PORT_LOCAL}/generate-audio/"
@@ -27,20 +32,25 @@ def generate_audio_file_melotts(text, language='EN', accent='EN-US', speed=1.0,
         "speed": speed
     }
 
-    if filename:
-        payload["filename"] = filename
-
     # Set the headers
     headers = {
         "Content-Type": "application/json"
     }
 
     # Make the POST request
-    response = requests.post(url, json=payload, headers=headers)
+    response = requests.post(url, json=payload, headers=headers, timeout=timeout)
 
     # Check the response
     if response.status_code == 200:
-        return response.json()
+        if filename:
+            with open(filename, "wb") as f:
+                f.write(response.content)
+        rtf = response.headers.get("X-Real-Time-Factor")
+        return {
+            "audio": response.content,
+            "file_path": filename,
+            "real_time_factor": float(rtf) if rtf else None,
+        }
     else:
         response.raise_for_status()
 
@@ -56,6 +66,7 @@ if __name__ == "__main__":
         )
         print("Audio file generated successfully")
         print("File path:", result.get("file_path"))
+        print("Real-time factor:", result.get("real_time_factor"))
     except requests.HTTPError as http_err:
         print(f"HTTP error occurred: {http_err}")
     except Exception as err:
@@ -0,0 +1,128 @@
+# voice_assistant/long_text.py
+
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from voice_assistant.audio import play_audio_queue
+from voice_assistant.segmenter import split_long_text
+from voice_assistant.temp_file_manager import temp_file_manager
+from voice_assistant.text_to_speech import text_to_speech, STREAMING_TTS_MODELS
+from voice_assistant.pipeline import get_output_format
+from voice_assistant.cartesia_session import get_cartesia_session
+from voice_assistant.config import Config
+
+
+def is_long_text(text: str) -> bool:
+    """
+    Check whether a text should be spoken in long-text mode.
+
+    Args:
+        text: The text to speak.
+
+    Returns:
+        bool: True if Config.LONG_TEXT_MODE is set and the text has at least
+            Config.LONG_TEXT_MIN_CHARS characters.
+    """
+    return Config.LONG_TEXT_MODE and len(text) >= Config.LONG_TEXT_MIN_CHARS
+
+
+def speak_long_text(text: str, tts_model: str, api_key: str, local_model_path: str = None,
+                    on_first_audio=None, timeout: float = None) -> list:
+    """
+    Speak a long text by synthesizing its chunks in parallel and playing them in order.
+
+    Up to Config.LONG_TEXT_WORKERS chunks are synthesized at once, each into
+    its own segment file. A playback thread plays the files strictly in
+    order, back to back on one mixer, as soon as each one and all earlier
+    ones are ready, so the total time approaches that of the slowest chunk
+    rather than the sum of all of them. Cartesia speaks the chunks over one
+    websocket context instead (or one after the other without
+    Config.CARTESIA_WEBSOCKET), since it plays audio itself.
+
+    Args:
+        text: The text to speak.
+        tts_model: The TTS model (resolve 'auto' first).
+        api_key: The API key for the TTS service.
+        local_model_path: The path to the local model (if applicable).
+        on_first_audio: Called once when the first chunk starts playing.
+        timeout: Seconds to wait for the TTS service per chunk.
+
+    Returns:
+        list: The audio files that were played, in order (empty for Cartesia).
+    """
+    chunks = split_long_text(text, Config.LONG_TEXT_CHUNK_CHARS)
+    if not chunks:
+        return []
+    start = time.perf_counter()
+
+    if tts_model in STREAMING_TTS_MODELS:
+        _speak_streamed(chunks, tts_model, api_key, local_model_path, on_first_audio, timeout)
+        return []
+
+    file_format = get_output_format(tts_model)
+    paths = [temp_file_manager.get_segment_file(file_format, index) for index in range(len(chunks))]
+    play_queue = queue.Queue()
+    player = threading.Thread(target=play_audio_queue, args=(play_queue, on_first_audio), daemon=True)
+    player.start()
+
+    played = []
+    # Every engine synthesizes outside this process (cloud APIs, the MeloTTS/Piper servers,
+    # the macOS 'say' command), so threads are enough to run chunks in parallel
+    executor = ThreadPoolExecutor(max_workers=Config.LONG_TEXT_WORKERS, thread_name_prefix="long_text")
+    try:
+        # An output file is always passed, so natively streaming models synthesize to files here
+        futures = [
+            executor.submit(_synthesize_chunk, tts_model, api_key, chunk, path, local_model_path, timeout)
+            for chunk, path in zip(chunks, paths)
+        ]
+        for index, future in enumerate(futures):
+            try:
+                path = future.result()
+            except Exception as e:
+                logging.error(f"Long-text chunk {index} failed: {e}")
+                continue
+            if not os.path.exists(path):
+                logging.error(f"Long-text chunk {index} produced no audio, skipping it")
+                continue
+            played.append(path)
+            play_queue.put(path)
+        logging.info(f"Synthesized {len(chunks)} chunks in {time.perf_counter() - start:.2f}s "
+                     f"with {Config.LONG_TEXT_WORKERS} workers")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        play_queue.put(None)
+        player.join()
+    return played
+
+
+def _speak_streamed(chunks, tts_model, api_key, local_model_path, on_first_audio, timeout):
+    started = threading.Event()
+
+    def first_audio():
+        if not started.is_set():
+            started.set()
+            if on_first_audio:
+                on_first_audio()
+
+    if tts_model == "cartesia" and Config.CARTESIA_WEBSOCKET:
+        try:
+            get_cartesia_session(api_key).speak_stream(iter(chunks), on_first_audio=first_audio)
+            return
+        except Exception as e:
+            logging.error(f"Cartesia websocket failed ({e}), speaking the chunks one by one")
+    for chunk in chunks:
+        text_to_speech(tts_model, api_key, chunk, None, local_model_path, timeout=timeout,
+                       on_first_audio=first_audio)
+
+
+def _synthesize_chunk(tts_model, api_key, text, output_file_path, local_model_path, timeout):
+    """Synthesize one chunk to a file."""
+    if os.path.exists(output_file_path):
+        # Segment files are reused between responses; a stale one must not be played
+        os.remove(output_file_path)
+    text_to_speech(tts_model, api_key, text, output_file_path, local_model_path, timeout=timeout)
+    return output_file_path
@@ -0,0 +1,335 @@
+# voice_assistant/memory.py
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+import numpy as np
+
+from voice_assistant.config import Config
+
+try:
+    from fastembed import TextEmbedding
+except ImportError:
+    TextEmbedding = None
+
+# Prefix of the system message that carries retrieved memories into the prompt
+MEMORY_PREFIX = "Relevant snippets from earlier conversations with this user:\n"
+
+_WORD_RE = re.compile(r"[a-z0-9']+")
+
+
+class HashingEmbedder:
+    """
+    Dependency-free embedder based on feature hashing of words and word pairs.
+
+    Used when fastembed is not installed. It only captures lexical overlap,
+    but it is deterministic across runs and costs microseconds per message.
+    """
+
+    name = "hashing-v1"
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def embed(self, texts: list) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            words = _WORD_RE.findall(text.lower())
+            features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+            for feature in features:
+                digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+                value = int.from_bytes(digest, "little")
+                sign = 1.0 if value & 1 else -1.0
+                vectors[row, (value >> 1) % self.dim] += sign
+        return _normalize(vectors)
+
+
+class FastEmbedEmbedder:
+    """Small ONNX sentence embedding model that runs well on CPU."""
+
+    def __init__(self, model_name: str):
+        self.name = model_name
+        self._model = TextEmbedding(model_name=model_name)
+        self.dim = len(next(iter(self._model.embed(["dimension probe"]))))
+
+    def embed(self, texts: list) -> np.ndarray:
+        vectors = np.array(list(self._model.embed(texts)), dtype=np.float32)
+        return _normalize(vectors)
+
+
+def _normalize(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def get_embedder():
+    """
+    Get the best available embedder.
+
+    Returns:
+        object: A FastEmbedEmbedder if fastembed is installed, otherwise a HashingEmbedder.
+    """
+    if TextEmbedding is not None:
+        try:
+            return FastEmbedEmbedder(Config.MEMORY_EMBEDDING_MODEL)
+        except Exception as e:
+            logging.warning(f"Failed to load embedding model {Config.MEMORY_EMBEDDING_MODEL}: {e}")
+    return HashingEmbedder()
+
+
+class ConversationMemory:
+    """
+    Long-term conversational memory backed by an append-only vector index.
+
+    Vectors are stored as raw normalized float32 rows in vectors.f32 and read
+    through a memory map, so appends are a single write and a search is one
+    matrix-vector product. Message texts live alongside in messages.jsonl.
+    """
+
+    def __init__(self, directory: str = None, embedder=None):
+        """
+        Args:
+            directory: Directory holding the index files (Config.MEMORY_DIR by default).
+            embedder: Embedder to use (get_embedder() by default).
+        """
+        self.directory = directory or Config.MEMORY_DIR
+        self.embedder = embedder or get_embedder()
+        self._vectors_path = os.path.join(self.directory, "vectors.f32")
+        self._messages_path = os.path.join(self.directory, "messages.jsonl")
+        self._info_path = os.path.join(self.directory, "index.json")
+        # Unreadable lines of messages.jsonl are moved here instead of being dropped
+        self._rejected_path = os.path.join(self.directory, "messages.rejected.jsonl")
+        self._lock = threading.Lock()
+        self._vectors = None
+        self._messages = []
+        self._hashes = set()
+        self._load()
+
+    def __len__(self):
+        return len(self._messages)
+
+    def add_messages(self, messages: list) -> int:
+        """
+        Embed and append user/assistant messages that are not indexed yet.
+
+        Args:
+            messages: Chat messages with 'role' and 'content'.
+
+        Returns:
+            int: The number of messages added.
+        """
+        new = []
+        with self._lock:
+            seen = set()
+            for message in messages:
+                if message.get("role") not in ("user", "assistant"):
+                    continue
+                content = (message.get("content") or "").strip()
+                digest = _message_hash(message["role"], content)
+                if not content or digest in self._hashes or digest in seen:
+                    continue
+                seen.add(digest)
+                new.append({"role": message["role"], "content": content, "hash": digest, "time": time.time()})
+
+            if not new:
+                return 0
+
+            vectors = self.embedder.embed([entry["content"] for entry in new])
+            os.makedirs(self.directory, exist_ok=True)
+            sizes = [os.path.getsize(path) if os.path.exists(path) else 0
+                     for path in (self._vectors_path, self._messages_path)]
+            try:
+                with open(self._vectors_path, "ab") as f:
+                    f.write(vectors.astype(np.float32).tobytes())
+                with open(self._messages_path, "a") as f:
+                    for entry in new:
+                        f.write(json.dumps(entry) + "\n")
+            except Exception:
+                # Roll both files back so vector row i keeps matching message i
+                for path, size in zip((self._vectors_path, self._messages_path), sizes):
+                    if os.path.exists(path):
+                        os.truncate(path, size)
+                raise
+            # Only mark messages as indexed once both appends succeeded, so a failure is retried later
+            self._hashes.update(seen)
+            self._messages.extend(new)
+            self._vectors = None  # re-map on next search
+            self._write_info()
+        return len(new)
+
+    def search(self, query: str, k: int = None, min_score: float = None) -> list:
+        """
+        Find the stored messages most similar to a query.
+
+        Args:
+            query: The text to search for, usually the user's latest turn.
+            k: Maximum number of results (Config.MEMORY_TOP_K by default).
+            min_score: Minimum cosine similarity (Config.MEMORY_MIN_SCORE by default).
+
+        Returns:
+            list: (score, message) tuples, best first.
+        """
+        k = k or Config.MEMORY_TOP_K
+        min_score = Config.MEMORY_MIN_SCORE if min_score is None else min_score
+        with self._lock:
+            if not self._messages:
+                return []
+            start = time.perf_counter()
+            matrix = self._get_vectors()
+            query_vector = self.embedder.embed([query])[0]
+            scores = matrix @ query_vector
+            k = min(k, len(scores))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            results = [(float(scores[i]), self._messages[i]) for i in top if scores[i] >= min_score]
+            logging.debug(f"Memory search over {len(scores)} messages took "
+                          f"{(time.perf_counter() - start) * 1000:.1f} ms")
+        return results
+
+    def build_context_message(self, query: str, exclude: list = None):
+        """
+        Build a system message with the snippets most relevant to a query.
+
+        Args:
+            query: The user's latest turn.
+            exclude: Messages already in the prompt, which are not repeated.
+
+        Returns:
+            dict: A system message, or None if nothing relevant was found.
+        """
+        in_prompt = {_message_hash(m.get("role"), (m.get("content") or "").strip()) for m in (exclude or [])}
+        snippets = []
+        # Over-fetch, since the closest matches are often already in the prompt
+        for score, message in self.search(query, k=Config.MEMORY_TOP_K + len(in_prompt)):
+            if message["hash"] in in_prompt:
+                continue
+            if len(snippets) >= Config.MEMORY_TOP_K:
+                break
+            speaker = "User" if message["role"] == "user" else "Assistant"
+            snippets.append(f"- {speaker}: {message['content'][:Config.MEMORY_SNIPPET_CHARS]}")
+        if not snippets:
+            return None
+        return {"role": "system", "content": MEMORY_PREFIX + "\n".join(snippets)}
+
+    def _get_vectors(self):
+        if self._vectors is None:
+            count = len(self._messages)
+            self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode="r",
+                                      shape=(count, self.embedder.dim))
+        return self._vectors
+
+    def _load(self):
+        if not os.path.exists(self._info_path):
+            # Leftover rows without index.json can't be trusted to line up; start clean
+            self._remove_files()
+            return
+        try:
+            self._read_index()
+        except Exception as e:
+            # The files are left alone, so nothing the user has said is lost; memory stays off this session
+            self._messages = []
+            self._hashes = set()
+            raise RuntimeError(f"Failed to load conversation memory from {self.directory}: {e}") from e
+
+    def _read_index(self):
+        with open(self._info_path) as f:
+            info = json.load(f)
+        same_embedder = info.get("embedder") == self.embedder.name and info.get("dim") == self.embedder.dim
+
+        # Line i of messages.jsonl belongs to vector row i, so unreadable lines keep their row number
+        lines = []
+        if os.path.exists(self._messages_path):
+            with open(self._messages_path) as f:
+                lines = f.readlines()
+        messages, rows, rejected = [], [], []
+        for row, line in enumerate(lines):
+            message = _parse_message(line)
+            if message is None:
+                rejected.append(line)
+            else:
+                messages.append(message)
+                rows.append(row)
+
+        row_bytes = 4 * self.embedder.dim
+        vector_rows = os.path.getsize(self._vectors_path) // row_bytes if os.path.exists(self._vectors_path) else 0
+        if not same_embedder:
+            logging.warning("Memory index was built with a different embedder, re-embedding its messages")
+            vectors = self._embed_messages(messages)
+        else:
+            vectors = np.zeros((len(messages), self.embedder.dim), dtype=np.float32)
+            stored = np.memmap(self._vectors_path, dtype=np.float32, mode="r",
+                               shape=(vector_rows, self.embedder.dim)) if vector_rows else None
+            # Messages whose vector never made it to disk (e.g. a crash mid-append) are embedded again
+            missing = [i for i, row in enumerate(rows) if row >= vector_rows]
+            for i, row in enumerate(rows):
+                if row < vector_rows:
+                    vectors[i] = stored[row]
+            if missing:
+                vectors[missing] = self._embed_messages([messages[i] for i in missing])
+            del stored
+
+        if rejected:
+            logging.warning(f"Skipped {len(rejected)} unreadable memory entries, "
+                            f"kept in {os.path.basename(self._rejected_path)}")
+            with open(self._rejected_path, "a") as f:
+                f.writelines(line if line.endswith("\n") else line + "\n" for line in rejected)
+        aligned = rows == list(range(vector_rows)) and len(lines) == vector_rows
+        if not same_embedder or rejected or not aligned:
+            self._rewrite(messages, vectors)
+
+        self._messages = messages
+        self._hashes = {message["hash"] for message in messages}
+        logging.info(f"Loaded conversation memory with {len(self._messages)} messages")
+
+    def _embed_messages(self, messages):
+        if not messages:
+            return np.zeros((0, self.embedder.dim), dtype=np.float32)
+        return self.embedder.embed([message["content"] for message in messages]).astype(np.float32)
+
+    def _rewrite(self, messages, vectors):
+        """Replace both files with rows that line up, then update index.json."""
+        with open(self._vectors_path + ".tmp", "wb") as f:
+            f.write(np.asarray(vectors, dtype=np.float32).tobytes())
+        with open(self._messages_path + ".tmp", "w") as f:
+            for message in messages:
+                f.write(json.dumps(message) + "\n")
+        os.replace(self._vectors_path + ".tmp", self._vectors_path)
+        os.replace(self._messages_path + ".tmp", self._messages_path)
+        self._messages = messages
+        self._write_info()
+
+    def _remove_files(self):
+        for path in (self._vectors_path, self._messages_path, self._info_path):
+            try:
+                if os.path.exists(path):
+                    os.remove(path)
+            except OSError as e:
+                logging.error(f"Failed to remove {path}: {e}")
+
+    def _write_info(self):
+        with open(self._info_path, "w") as f:
+            json.dump({"embedder": self.embedder.name, "dim": self.embedder.dim,
+                       "count": len(self._messages)}, f)
+
+
+def _message_hash(role, content):
+    return hashlib.sha1(f"{role}\0{content}".encode()).hexdigest()
+
+
+def _parse_message(line):
+    """Parse one line of messages.jsonl, returning None if it is not a complete entry."""
+    try:
+        message = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(message, dict):
+        return None
+    if not all(isinstance(message.get(key), str) for key in ("role", "content", "hash")):
+        return None
+    return message
@@ -0,0 +1,124 @@
+# voice_assistant/model_warmup.py
+
+import logging
+import threading
+import time
+
+import ollama
+from openai import OpenAI
+
+from voice_assistant.config import Config
+
+# Model-ready state of the local LLM: 'idle', 'loading', 'ready' or 'failed'
+_model_state = {"model": None, "state": "idle", "detail": ""}
+_state_lock = threading.Lock()
+
+
+def get_model_state() -> dict:
+    """
+    Get the model-ready state of the local LLM.
+
+    Returns:
+        dict: 'model' (provider name), 'state' ('idle', 'loading', 'ready', 'failed') and 'detail'.
+    """
+    with _state_lock:
+        return dict(_model_state)
+
+
+def _set_model_state(model, state, detail="", on_state_change=None):
+    with _state_lock:
+        _model_state.update({"model": model, "state": state, "detail": detail})
+    if on_state_change:
+        on_state_change(get_model_state())
+
+
+def get_ollama_keep_alive():
+    """
+    Get the keep-alive value to send with Ollama requests.
+
+    Returns:
+        str or int: Config.OLLAMA_KEEP_ALIVE, as an int when it is numeric (e.g. -1 to pin forever).
+    """
+    keep_alive = Config.OLLAMA_KEEP_ALIVE
+    try:
+        return int(keep_alive)
+    except (TypeError, ValueError):
+        return keep_alive
+
+
+def preload_local_llm(model: str, system_prompt: str = None, on_state_change=None) -> bool:
+    """
+    Load a local LLM ahead of the first turn and pin it in memory.
+
+    Ollama is asked to keep the model loaded for Config.OLLAMA_KEEP_ALIVE and
+    LM Studio for Config.LMSTUDIO_TTL seconds. When a system prompt is given
+    and Config.LOCAL_LLM_PRIME_SYSTEM_PROMPT is set, it is sent with the warm-up
+    request so the server has its prefix cached for the first real turn.
+
+    Args:
+        model: The response model ('ollama' or 'lmstudio'); other models are ignored.
+        system_prompt: The assistant's system prompt.
+        on_state_change: Called with get_model_state() whenever the state changes.
+
+    Returns:
+        bool: True if the model is loaded and ready.
+    """
+    if model not in ('ollama', 'lmstudio'):
+        _set_model_state(model, "idle", "", on_state_change)
+        return False
+
+    _set_model_state(model, "loading", "", on_state_change)
+    messages = []
+    if system_prompt and Config.LOCAL_LLM_PRIME_SYSTEM_PROMPT:
+        messages.append({"role": "system", "content": system_prompt})
+    messages.append({"role": "user", "content": "Hi"})
+
+    start = time.perf_counter()
+    try:
+        if model == 'ollama':
+            ollama.chat(
+                model=Config.OLLAMA_LLM,
+                messages=messages,
+                options={"num_predict": 1},
+                keep_alive=get_ollama_keep_alive(),
+            )
+            name = Config.OLLAMA_LLM
+        else:
+            client = OpenAI(base_url=Config.LMSTUDIO_BASE_URL + "/v1", api_key="lm-studio")
+            client.chat.completions.create(
+                model="local-model",
+                messages=messages,
+                max_tokens=1,
+                extra_body={"ttl": Config.LMSTUDIO_TTL},
+            )
+            name = "LM Studio model"
+    except Exception as e:
+        logging.error(f"Failed to preload {model} model: {e}")
+        _set_model_state(model, "failed", str(e), on_state_change)
+        return False
+
+    elapsed = time.perf_counter() - start
+    logging.info(f"Preloaded {name} in {elapsed:.1f}s")
+    _set_model_state(model, "ready", name, on_state_change)
+    return True
+
+
+def start_preload(model: str, system_prompt: str = None, on_state_change=None) -> threading.Thread:
+    """
+    Run preload_local_llm on a background thread.
+
+    Args:
+        model: The response model ('ollama' or 'lmstudio').
+        system_prompt: The assistant's system prompt.
+        on_state_change: Called with get_model_state() whenever the state changes.
+
+    Returns:
+        threading.Thread: The started thread.
+    """
+    thread = threading.Thread(
+        target=preload_local_llm,
+        args=(model, system_prompt, on_state_change),
+        daemon=True
+    )
+    thread.start()
+    return thread
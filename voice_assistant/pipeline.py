@@ -0,0 +1,183 @@
+# voice_assistant/pipeline.py
+
+import logging
+import queue
+import threading
+import time
+
+from voice_assistant.audio import play_audio_queue
+from voice_assistant.segmenter import SentenceSegmenter
+from voice_assistant.temp_file_manager import temp_file_manager
+from voice_assistant.text_to_speech import text_to_speech, streams_playback
+from voice_assistant.cartesia_session import get_cartesia_session
+from voice_assistant.config import Config
+
+
+def get_output_format(tts_model: str) -> str:
+    """
+    Get the audio file format produced by a TTS model.
+
+    Args:
+        tts_model: The TTS model name.
+
+    Returns:
+        str: 'mp3' or 'wav'.
+    """
+    if tts_model in ('openai', 'elevenlabs', 'cartesia'):
+        return 'mp3'
+    return 'wav'
+
+
+class PipelinedSpeaker:
+    """
+    Overlap LLM generation, TTS and playback within one turn.
+
+    Segments are synthesized on a TTS worker thread while later tokens are
+    still being generated, and a playback thread plays the finished segment
+    files strictly in order. With Cartesia and Config.CARTESIA_WEBSOCKET,
+    segments are instead sent as continuations of one websocket context.
+    """
+
+    def __init__(self, tts_model: str, api_key: str, local_model_path: str = None,
+                 speech_ended_at: float = None, on_first_audio=None, timeout: float = None):
+        """
+        Args:
+            tts_model: The TTS model to synthesize segments with.
+            api_key: The API key for the TTS service.
+            local_model_path: The path to the local model (if applicable).
+            speech_ended_at: time.perf_counter() timestamp of the user's end of speech,
+                used to report time to first audio.
+            on_first_audio: Called once when the first segment starts playing.
+            timeout: Seconds to wait for the TTS service per segment.
+        """
+        self.tts_model = tts_model
+        self.timeout = timeout
+        self.api_key = api_key
+        self.local_model_path = local_model_path
+        self.speech_ended_at = speech_ended_at if speech_ended_at is not None else time.perf_counter()
+        self.on_first_audio = on_first_audio
+        self.first_audio_latency = None
+        self.audio_files = []
+
+        self._file_format = get_output_format(tts_model)
+        self._streams_itself = streams_playback(tts_model)
+        self._continuous = tts_model == "cartesia" and Config.CARTESIA_WEBSOCKET
+        self._segment_index = 0
+        self._tts_queue = queue.Queue()
+        self._play_queue = queue.Queue()
+
+        self._tts_thread = threading.Thread(target=self._tts_worker, daemon=True)
+        self._tts_thread.start()
+        self._play_thread = None
+        if not self._streams_itself:
+            self._play_thread = threading.Thread(
+                target=play_audio_queue,
+                args=(self._play_queue, self._mark_first_audio),
+                daemon=True
+            )
+            self._play_thread.start()
+
+    def add_segment(self, text: str):
+        """Queue a text segment for synthesis and playback."""
+        self._tts_queue.put((self._segment_index, text))
+        self._segment_index += 1
+
+    def finish(self):
+        """Wait until every queued segment has been synthesized and played."""
+        self._tts_queue.put(None)
+        self._tts_thread.join()
+        if self._play_thread:
+            self._play_thread.join()
+
+    def _tts_worker(self):
+        try:
+            if self._continuous and self._speak_continuous():
+                return
+            while True:
+                item = self._tts_queue.get()
+                if item is None:
+                    break
+                self._speak_segment(*item)
+        finally:
+            self._play_queue.put(None)
+
+    def _speak_segment(self, index, text):
+        if self._streams_itself:
+            # Streaming models play inside text_to_speech, which reports when the first audio starts
+            text_to_speech(self.tts_model, self.api_key, text, None, self.local_model_path,
+                           timeout=self.timeout, on_first_audio=self._mark_first_audio)
+            return
+        output_file = temp_file_manager.get_segment_file(self._file_format, index)
+        text_to_speech(self.tts_model, self.api_key, text, output_file, self.local_model_path,
+                       timeout=self.timeout)
+        self.audio_files.append(output_file)
+        self._play_queue.put(output_file)
+
+    def _speak_continuous(self):
+        """
+        Send queued segments to one Cartesia websocket context as they arrive.
+
+        Returns:
+            bool: True if every segment was handled, False if the websocket failed
+                and the remaining segments still need to be spoken one by one.
+        """
+        state = {"done": False}
+
+        def segments():
+            while True:
+                item = self._tts_queue.get()
+                if item is None:
+                    state["done"] = True
+                    return
+                yield item[1]
+
+        try:
+            get_cartesia_session(self.api_key).speak_stream(segments(), on_first_audio=self._mark_first_audio)
+            return True
+        except Exception as e:
+            logging.error(f"Cartesia websocket failed ({e}), speaking the remaining segments one by one")
+            return state["done"]
+
+    def _mark_first_audio(self):
+        if self.first_audio_latency is not None:
+            return
+        self.first_audio_latency = time.perf_counter() - self.speech_ended_at
+        logging.info(f"Time from end of speech to first audio: {self.first_audio_latency:.3f}s")
+        if self.on_first_audio:
+            self.on_first_audio()
+
+
+def speak_pipelined(token_stream, tts_model: str, api_key: str, local_model_path: str = None,
+                    speech_ended_at: float = None, on_first_audio=None, audio_files: list = None,
+                    timeout: float = None) -> str:
+    """
+    Speak an LLM token stream sentence by sentence while it is still generating.
+
+    Args:
+        token_stream: Iterable of text deltas, e.g. from generate_response_stream.
+        tts_model: The TTS model to synthesize segments with.
+        api_key: The API key for the TTS service.
+        local_model_path: The path to the local model (if applicable).
+        speech_ended_at: time.perf_counter() timestamp of the user's end of speech.
+        on_first_audio: Called once when the first segment starts playing.
+        audio_files: If given, filled with the synthesized segment files, in order.
+        timeout: Seconds to wait for the TTS service per segment.
+
+    Returns:
+        str: The full response text.
+    """
+    segmenter = SentenceSegmenter()
+    speaker = PipelinedSpeaker(tts_model, api_key, local_model_path, speech_ended_at, on_first_audio, timeout)
+    parts = []
+    try:
+        for delta in token_stream:
+            parts.append(delta)
+            for segment in segmenter.feed(delta):
+                speaker.add_segment(segment)
+        for segment in segmenter.flush():
+            speaker.add_segment(segment)
+    finally:
+        speaker.finish()
+        if audio_files is not None:
+            audio_files[:] = speaker.audio_files
+    return "".join(parts)
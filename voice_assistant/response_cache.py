@@ -0,0 +1,214 @@
+# voice_assistant/response_cache.py
+
+import difflib
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from voice_assistant.config import Config
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s']")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_query(text: str) -> str:
+    """
+    Normalize user text so trivially different phrasings share a cache key.
+
+    Args:
+        text: The user's transcribed text.
+
+    Returns:
+        str: Lowercased text without punctuation or filler words.
+    """
+    text = _PUNCTUATION_RE.sub(" ", text.lower())
+    words = [word for word in _SPACE_RE.split(text) if word and word not in Config.RESPONSE_CACHE_FILLER_WORDS]
+    return " ".join(words)
+
+
+def content_words(query: str) -> tuple:
+    """
+    Get the words of a normalized query that carry its meaning.
+
+    Args:
+        query: Text from normalize_query.
+
+    Returns:
+        tuple: The words not in Config.RESPONSE_CACHE_STOPWORDS, in order.
+    """
+    return tuple(word for word in query.split() if word not in Config.RESPONSE_CACHE_STOPWORDS)
+
+
+class ResponseCache:
+    """
+    LRU cache of LLM responses with a TTL and near-duplicate lookup.
+
+    Entries are keyed on the model, the normalized user text and a hash of the
+    preceding messages, so the same question in a different context misses.
+    A near-duplicate must have exactly the same content words (see
+    content_words) and only differ in stopwords, so "what is 12 plus 31"
+    never gets the answer to "what is 12 plus 30". Queries matching
+    Config.RESPONSE_CACHE_SKIP_PATTERNS (time, weather, "repeat that", ...)
+    are never cached.
+    """
+
+    def __init__(self, max_entries: int = None, ttl: float = None, similarity_threshold: float = None):
+        """
+        Args:
+            max_entries: Maximum number of cached responses (LRU eviction beyond this).
+            ttl: Seconds a response stays valid.
+            similarity_threshold: Minimum similarity (0-1) for a near-duplicate hit.
+        """
+        self.max_entries = max_entries or Config.RESPONSE_CACHE_MAX_ENTRIES
+        self.ttl = ttl or Config.RESPONSE_CACHE_TTL
+        self.similarity_threshold = similarity_threshold or Config.RESPONSE_CACHE_SIMILARITY
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._skip_patterns = [re.compile(p, re.IGNORECASE) for p in Config.RESPONSE_CACHE_SKIP_PATTERNS]
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self.skipped = 0
+
+    def lookup(self, model_name: str, messages: list):
+        """
+        Find a cached response for the last user message.
+
+        Args:
+            model_name: The LLM the response would be generated with.
+            messages: The chat history ending with the user's message.
+
+        Returns:
+            str: The cached response, or None on a miss.
+        """
+        key = self._make_key(model_name, messages)
+        if key is None:
+            with self._lock:
+                self.skipped += 1
+            return None
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[1] <= self.ttl:
+                self._entries.move_to_end(key)
+                self.exact_hits += 1
+                return entry[0]
+
+            # Near-duplicate lookup within the same model and context, among queries with the same content words
+            words = content_words(key[2])
+            best_key, best_ratio = None, 0.0
+            for other_key, (_, stored_at) in self._entries.items():
+                if other_key[:2] != key[:2] or now - stored_at > self.ttl:
+                    continue
+                if not words or content_words(other_key[2]) != words:
+                    continue
+                ratio = difflib.SequenceMatcher(None, key[2], other_key[2]).ratio()
+                if ratio > best_ratio:
+                    best_key, best_ratio = other_key, ratio
+            if best_key is not None and best_ratio >= self.similarity_threshold:
+                self._entries.move_to_end(best_key)
+                self.similar_hits += 1
+                return self._entries[best_key][0]
+
+            self.misses += 1
+        return None
+
+    def store(self, model_name: str, messages: list, response: str):
+        """
+        Cache a response for the last user message.
+
+        Args:
+            model_name: The LLM that generated the response.
+            messages: The chat history the response was generated for.
+            response: The generated response text.
+        """
+        key = self._make_key(model_name, messages)
+        if key is None or not response:
+            return
+        with self._lock:
+            self._entries[key] = (response, time.monotonic())
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def clear(self):
+        """Remove all cached responses."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> dict:
+        """
+        Get hit-rate metrics.
+
+        Returns:
+            dict: Hit, miss and skip counts, the hit rate over cacheable lookups and the entry count.
+        """
+        with self._lock:
+            hits = self.exact_hits + self.similar_hits
+            lookups = hits + self.misses
+            return {
+                "exact_hits": self.exact_hits,
+                "similar_hits": self.similar_hits,
+                "misses": self.misses,
+                "skipped": self.skipped,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+            }
+
+    def _make_key(self, model_name, messages):
+        if not messages or messages[-1].get("role") != "user":
+            return None
+        text = messages[-1].get("content") or ""
+        if any(pattern.search(text) for pattern in self._skip_patterns):
+            return None
+        query = normalize_query(text)
+        if not query:
+            return None
+
+        # Only the turns right before the question count as its context
+        context = [
+            f"{m.get('role')}:{normalize_query(m.get('content') or '')}"
+            for m in messages[:-1][-Config.RESPONSE_CACHE_CONTEXT_MESSAGES:]
+            if m.get("role") != "system"
+        ] if Config.RESPONSE_CACHE_CONTEXT_MESSAGES > 0 else []
+        context_hash = hashlib.sha1("\n".join(context).encode()).hexdigest()
+        return (model_name, context_hash, query)
+
+    def _evict(self):
+        now = time.monotonic()
+        expired = [key for key, (_, stored_at) in self._entries.items() if now - stored_at > self.ttl]
+        for key in expired:
+            del self._entries[key]
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+def cached_stream(stream, model_name: str, messages: list):
+    """
+    Pass a response stream through, caching the full text once it completes.
+
+    A stream that is abandoned or fails part way is not cached.
+
+    Args:
+        stream: Iterable of text deltas.
+        model_name: The LLM generating the response.
+        messages: The chat history the response is generated for.
+
+    Yields:
+        str: The deltas of the underlying stream.
+    """
+    parts = []
+    for delta in stream:
+        parts.append(delta)
+        yield delta
+    response_cache.store(model_name, messages, "".join(parts))
+    stats = response_cache.get_stats()
+    logging.debug(f"Response cache hit rate {stats['hit_rate']:.0%} "
+                  f"({stats['exact_hits']} exact, {stats['similar_hits']} similar, {stats['misses']} misses)")
+
+
+# Global instance
+response_cache = ResponseCache()
@@ -1,104 +1,575 @@
 # voice_assistant/response_generation.py
 
 import logging
+import time
 
-from openai import OpenAI
-from groq import Groq
+from openai import OpenAI, AsyncOpenAI
+from groq import Groq, AsyncGroq
 import ollama
 
 from voice_assistant.config import Config
+from voice_assistant.utils import client_timeout, sdk_retries, get_async_client
+from voice_assistant.chat_history import history_window
+from voice_assistant.response_cache import response_cache, cached_stream
+from voice_assistant.model_warmup import get_ollama_keep_alive
+from voice_assistant.router import turn_router
+from voice_assistant.generation_budget import get_generation_budget
+from voice_assistant.hedging import hedger, hedge_partner
+from voice_assistant.circuit_breaker import breakers, fallback_chain
+from voice_assistant.retry import retry_policy
+from voice_assistant.api_key_manager import get_api_key
+from voice_assistant.auto_select import resolve_model
 
+# Timing statistics of the most recently completed response stream
+_last_stream_stats = {}
 
-def generate_response(model:str, api_key:str, chat_history:list, local_model_path:str=None):
+
+def generate_response(model:str, api_key:str, chat_history:list, local_model_path:str=None, timeout:float=None):
     """
     Generate a response using the specified model.
-    
+
+    Thin wrapper that consumes generate_response_stream and joins the deltas.
+
     Args:
     model (str): The model to use for response generation ('openai', 'groq', 'local').
     api_key (str): The API key for the response generation service.
     chat_history (list): The chat history as a list of messages.
     local_model_path (str): The path to the local model (if applicable).
+    timeout (float): Seconds to wait for the first token before the provider counts as failed.
 
     Returns:
-    str: The generated response text.
+    str: The generated response text, or None if every provider failed (callers speak
+        Config.LLM_UNAVAILABLE_MESSAGE and keep it out of the chat history).
     """
     try:
-        if model == 'openai':
-            return _generate_openai_response(api_key, chat_history)
-        elif model == 'groq':
-            return _generate_groq_response(api_key, chat_history)
-        elif model == 'ollama':
-            return _generate_ollama_response(chat_history)
-        elif model == 'lmstudio':
-            return _generate_lmstudio_response(chat_history)
-        elif model == 'local':
-            # Placeholder for local LLM response generation
-            return "Generated response from local model"
-        else:
-            raise ValueError("Unsupported response generation model")
+        return "".join(generate_response_stream(model, api_key, chat_history, local_model_path, timeout=timeout))
     except Exception as e:
         logging.error(f"Failed to generate response: {e}")
-        return "Error in generating response"
+        return None
 
-def _generate_openai_response(api_key, chat_history):
-    client = OpenAI(api_key=api_key)
-    response = client.chat.completions.create(
+
+def generate_response_stream(model:str, api_key:str, chat_history:list, local_model_path:str=None,
+                             use_cache:bool=True, live_turn:bool=True, timeout:float=None):
+    """
+    Stream a response token by token using the provider's native streaming mode.
+
+    Time-to-first-token and tokens/sec are logged when the stream finishes and
+    can be read back with get_last_stream_stats(). When Config.HISTORY_WINDOWING
+    is set, only the most recent turns that fit the model's token budget are sent.
+    When Config.RESPONSE_CACHE_ENABLED is set, repeated queries are answered
+    from the response cache without calling the provider. When
+    Config.ROUTING_ENABLED is set, simple turns go to Config.ROUTING_FAST_MODEL.
+    When Config.VOICE_BUDGET_ENABLED is set, the response is capped in tokens
+    and stopped after a number of sentences that depends on the question type.
+    When Config.HEDGING_ENABLED is set, Config.HEDGE_LLM_SECONDARY is started as
+    well if the first token takes longer than the model's observed p90, and the
+    stream that produces a token first is used. When
+    Config.CIRCUIT_BREAKERS_ENABLED is set, a failing model is skipped for a
+    while and the next model in Config.LLM_FALLBACK_CHAIN answers instead.
+    Opening the stream is rate limited and retried on transient failures until
+    the first token arrives (see voice_assistant.retry). 'auto' picks the
+    fastest healthy provider (see voice_assistant.auto_select).
+
+    Args:
+    model (str): The model to use for response generation ('openai', 'groq', 'ollama', 'lmstudio', 'local', 'auto').
+    api_key (str): The API key for the response generation service.
+    chat_history (list): The chat history as a list of messages.
+    local_model_path (str): The path to the local model (if applicable).
+    use_cache (bool): Set to False for context-sensitive requests that must not use the response cache.
+    live_turn (bool): Set to False for background requests (e.g. summaries) that must not be
+        cached, routed or limited by the voice budget.
+    timeout (float): Seconds to wait for the first token (and between tokens) before the
+        provider counts as failed; with circuit breakers on, the next provider is tried.
+
+    Yields:
+    str: Text deltas as they arrive from the provider.
+    """
+    request = _ResponseRequest(model, api_key, chat_history, use_cache, live_turn)
+    if request.cached is not None:
+        yield request.cached
+        return
+    model, api_key = request.model, request.api_key
+    chat_history, max_tokens, budget = request.chat_history, request.max_tokens, request.budget
+
+    primary, primary_key = model, api_key
+
+    def open_provider(provider):
+        key = primary_key if provider == primary else get_api_key("response", provider)
+        return retry_policy.stream(provider, key, lambda: _open_stream(
+            provider, key, chat_history, max_tokens, timeout), timeout)
+
+    def open_hedged(provider):
+        if Config.HEDGING_ENABLED and live_turn and provider == primary:
+            secondary = hedge_partner("response", primary, Config.HEDGE_LLM_SECONDARY)
+            return hedger.stream("llm", primary, secondary, open_provider, timeout)
+        return provider, open_provider(provider)
+
+    start = time.perf_counter()
+    if Config.CIRCUIT_BREAKERS_ENABLED and live_turn:
+        chain = fallback_chain("response", primary, Config.LLM_FALLBACK_CHAIN)
+        model, stream = breakers.stream("llm", chain, open_hedged)
+    else:
+        model, stream = open_hedged(primary)
+
+    stream = _measure_stream(model, stream, start)
+    if budget:
+        stream = _enforce_budget(budget, stream)
+    if request.route:
+        stream = turn_router.track(request.route, model, stream)
+    if request.use_cache:
+        stream = cached_stream(stream, request.llm_name, request.full_history)
+    yield from stream
+
+
+def get_llm_name(model:str):
+    """
+    Get the LLM name a response provider is configured to use.
+
+    Args:
+    model (str): The response generation model ('openai', 'groq', 'ollama', 'lmstudio', 'local').
+
+    Returns:
+    str: The configured LLM name, or the provider name if it has none.
+    """
+    return {
+        'openai': Config.OPENAI_LLM,
+        'groq': Config.GROQ_LLM,
+        'ollama': Config.OLLAMA_LLM,
+    }.get(model, model)
+
+
+def get_last_stream_stats():
+    """
+    Get timing statistics of the most recently completed response stream.
+
+    Returns:
+    dict: 'model', 'ttft' (seconds to first token), 'tokens', 'duration' and 'tokens_per_sec'.
+    """
+    return dict(_last_stream_stats)
+
+
+async def generate_response_async(model:str, api_key:str, chat_history:list, local_model_path:str=None):
+    """
+    Async variant of generate_response built on the providers' async clients.
+
+    Args:
+    model (str): The model to use for response generation ('openai', 'groq', 'ollama', 'lmstudio', 'local').
+    api_key (str): The API key for the response generation service.
+    chat_history (list): The chat history as a list of messages.
+    local_model_path (str): The path to the local model (if applicable).
+
+    Returns:
+    str: The generated response text, or None if the provider failed.
+    """
+    try:
+        parts = []
+        async for delta in generate_response_stream_async(model, api_key, chat_history, local_model_path):
+            parts.append(delta)
+        return "".join(parts)
+    except Exception as e:
+        logging.error(f"Failed to generate response: {e}")
+        return None
+
+
+async def generate_response_stream_async(model:str, api_key:str, chat_history:list, local_model_path:str=None,
+                                         use_cache:bool=True, live_turn:bool=True):
+    """
+    Async variant of generate_response_stream.
+
+    Uses AsyncOpenAI, AsyncGroq and ollama's AsyncClient, kept per event loop
+    and reused across calls, so many concurrent turns can share one event loop
+    and its connections. Routing, the response cache, history windowing,
+    the voice budget, rate limiting, retries and circuit breakers behave as in
+    the sync version; hedging is sync-only.
+
+    Args:
+    model (str): The model to use for response generation ('openai', 'groq', 'ollama', 'lmstudio', 'local').
+    api_key (str): The API key for the response generation service.
+    chat_history (list): The chat history as a list of messages.
+    local_model_path (str): The path to the local model (if applicable).
+    use_cache (bool): Set to False for context-sensitive requests that must not use the response cache.
+    live_turn (bool): Set to False for background requests (e.g. summaries) that must not be
+        cached, routed or limited by the voice budget.
+
+    Yields:
+    str: Text deltas as they arrive from the provider.
+    """
+    request = _ResponseRequest(model, api_key, chat_history, use_cache, live_turn)
+    if request.cached is not None:
+        yield request.cached
+        return
+    model, api_key = request.model, request.api_key
+    chat_history, max_tokens, budget = request.chat_history, request.max_tokens, request.budget
+
+    primary, primary_key = model, api_key
+
+    async def open_provider(provider):
+        key = primary_key if provider == primary else get_api_key("response", provider)
+        return provider, await retry_policy.stream_async(provider, key, lambda: _open_stream_async(
+            provider, key, chat_history, max_tokens))
+
+    start = time.perf_counter()
+    if Config.CIRCUIT_BREAKERS_ENABLED and live_turn:
+        chain = fallback_chain("response", primary, Config.LLM_FALLBACK_CHAIN)
+        model, stream = await breakers.stream_async("llm", chain, open_provider)
+    else:
+        model, stream = await open_provider(primary)
+
+    stream = _measure_stream_async(model, stream, start)
+    if budget:
+        stream = _enforce_budget_async(budget, stream)
+
+    parts = []
+    start = time.perf_counter()
+    first_token = None
+    async for delta in stream:
+        if first_token is None:
+            first_token = time.perf_counter() - start
+        parts.append(delta)
+        yield delta
+    if request.route:
+        turn_router.record(request.route, model, first_token, time.perf_counter() - start)
+    if request.use_cache:
+        response_cache.store(request.llm_name, request.full_history, "".join(parts))
+
+
+class _ResponseRequest:
+    """
+    The parts of a generation request shared by the sync and async streams.
+
+    Routes the turn, resolves 'auto', looks up the response cache and, on a
+    miss, applies the history window and the voice budget.
+    """
+
+    def __init__(self, model, api_key, chat_history, use_cache, live_turn):
+        self.route = None
+        if live_turn and Config.ROUTING_ENABLED:
+            self.route, model, api_key = turn_router.route(model, api_key, chat_history)
+        if model == 'auto':
+            model = resolve_model("llm", model)
+            api_key = get_api_key("response", model)
+        self.model = model
+        self.api_key = api_key
+        self.llm_name = get_llm_name(model)
+        self.full_history = chat_history
+        self.chat_history = chat_history
+        self.budget = None
+        self.max_tokens = None
+
+        self.use_cache = use_cache and live_turn and Config.RESPONSE_CACHE_ENABLED
+        self.cached = response_cache.lookup(self.llm_name, chat_history) if self.use_cache else None
+        if self.cached is not None:
+            logging.info(f"Response cache hit (hit rate {response_cache.get_stats()['hit_rate']:.0%})")
+            return
+
+        if Config.HISTORY_WINDOWING:
+            self.chat_history = history_window.apply(chat_history, self.llm_name)
+        self.budget = get_generation_budget(self.llm_name, chat_history) if live_turn else None
+        self.max_tokens = self.budget.max_tokens if self.budget else None
+
+
+def _open_stream(model, api_key, chat_history, max_tokens=None, timeout=None):
+    """Start the provider's native response stream."""
+    if model == 'openai':
+        return _stream_openai_response(api_key, chat_history, max_tokens, timeout)
+    elif model == 'groq':
+        return _stream_groq_response(api_key, chat_history, max_tokens, timeout)
+    elif model == 'ollama':
+        return _stream_ollama_response(chat_history, max_tokens, timeout)
+    elif model == 'lmstudio':
+        return _stream_lmstudio_response(chat_history, max_tokens, timeout)
+    elif model == 'local':
+        # Placeholder for local LLM response generation
+        return iter(["Generated response from local model"])
+    else:
+        raise ValueError("Unsupported response generation model")
+
+
+def _open_stream_async(model, api_key, chat_history, max_tokens=None):
+    """Async counterpart of _open_stream."""
+    if model == 'openai':
+        return _stream_openai_response_async(api_key, chat_history, max_tokens)
+    elif model == 'groq':
+        return _stream_groq_response_async(api_key, chat_history, max_tokens)
+    elif model == 'ollama':
+        return _stream_ollama_response_async(chat_history, max_tokens)
+    elif model == 'lmstudio':
+        return _stream_lmstudio_response_async(chat_history, max_tokens)
+    elif model == 'local':
+        # Placeholder for local LLM response generation
+        return _iterate_async(["Generated response from local model"])
+    else:
+        raise ValueError("Unsupported response generation model")
+
+
+def _measure_stream(model, stream, start=None):
+    """
+    Pass deltas through while recording time-to-first-token and throughput.
+    Each non-empty delta is counted as one token, which matches how the
+    providers chunk their streams closely enough for monitoring. A hedged
+    stream passes the time the request started, since its first token has
+    already arrived when measuring begins.
+    """
+    start = start or time.perf_counter()
+    first_token_at = None
+    tokens = 0
+    try:
+        for delta in stream:
+            if not delta:
+                continue
+            if first_token_at is None:
+                first_token_at = time.perf_counter()
+            tokens += 1
+            yield delta
+    finally:
+        _record_stream_stats(model, start, first_token_at, tokens)
+
+
+async def _measure_stream_async(model, stream, start=None):
+    """Async counterpart of _measure_stream."""
+    start = start or time.perf_counter()
+    first_token_at = None
+    tokens = 0
+    try:
+        async for delta in stream:
+            if not delta:
+                continue
+            if first_token_at is None:
+                first_token_at = time.perf_counter()
+            tokens += 1
+            yield delta
+    finally:
+        _record_stream_stats(model, start, first_token_at, tokens)
+
+
+def _enforce_budget(budget, stream):
+    """
+    Stop a measured stream once the budget's sentence limit is reached.
+    Closing the stream closes the provider connection, so no further tokens
+    are generated.
+    """
+    try:
+        for delta in stream:
+            text = budget.take(delta)
+            if text:
+                yield text
+            if budget.exhausted:
+                break
+    finally:
+        stream.close()
+        budget.log_usage(_last_stream_stats.get("tokens", 0))
+
+
+async def _enforce_budget_async(budget, stream):
+    """Async counterpart of _enforce_budget."""
+    try:
+        async for delta in stream:
+            text = budget.take(delta)
+            if text:
+                yield text
+            if budget.exhausted:
+                break
+    finally:
+        await stream.aclose()
+        budget.log_usage(_last_stream_stats.get("tokens", 0))
+
+
+def _token_limit(max_tokens):
+    """Keyword arguments capping an OpenAI-compatible completion, if a cap is set."""
+    return {"max_tokens": max_tokens} if max_tokens else {}
+
+
+def _record_stream_stats(model, start, first_token_at, tokens):
+    global _last_stream_stats
+    end = time.perf_counter()
+    ttft = (first_token_at - start) if first_token_at is not None else None
+    generation_time = (end - first_token_at) if first_token_at is not None else 0.0
+    tokens_per_sec = tokens / generation_time if generation_time > 0 else 0.0
+    _last_stream_stats = {
+        "model": model,
+        "ttft": ttft,
+        "tokens": tokens,
+        "duration": end - start,
+        "tokens_per_sec": tokens_per_sec,
+    }
+    if ttft is not None:
+        logging.info(f"{model} stream: first token after {ttft:.3f}s, "
+                     f"{tokens} tokens at {tokens_per_sec:.1f} tokens/sec")
+
+
+def _stream_openai_response(api_key, chat_history, max_tokens=None, timeout=None):
+    client = OpenAI(api_key=api_key, **client_timeout(timeout), **sdk_retries())
+    stream = client.chat.completions.create(
         model=Config.OPENAI_LLM,
-        messages=chat_history
+        messages=chat_history,
+        stream=True,
+        **_token_limit(max_tokens)
     )
-    return response.choices[0].message.content
+    for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
 
 
-def _generate_groq_response(api_key, chat_history):
-    client = Groq(api_key=api_key)
-    response = client.chat.completions.create(
+def _stream_groq_response(api_key, chat_history, max_tokens=None, timeout=None):
+    client = Groq(api_key=api_key, **client_timeout(timeout), **sdk_retries())
+    stream = client.chat.completions.create(
         model=Config.GROQ_LLM,
-        messages=chat_history
+        messages=chat_history,
+        stream=True,
+        **_token_limit(max_tokens)
     )
-    return response.choices[0].message.content
+    for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
 
 
-def _generate_ollama_response(chat_history):
-    response = ollama.chat(
+def _stream_ollama_response(chat_history, max_tokens=None, timeout=None):
+    client = ollama.Client(timeout=timeout) if timeout else ollama
+    stream = client.chat(
         model=Config.OLLAMA_LLM,
         messages=chat_history,
+        stream=True,
+        keep_alive=get_ollama_keep_alive(),
+        options={"num_predict": max_tokens} if max_tokens else None,
     )
-    return response['message']['content']
+    for chunk in stream:
+        content = chunk['message']['content']
+        if content:
+            yield content
 
 
-def _generate_lmstudio_response(chat_history):
+def _stream_lmstudio_response(chat_history, max_tokens=None, timeout=None):
     """
-    Generate response using LM Studio local server.
+    Stream a response from the LM Studio local server.
 
     Args:
         chat_history (list): The chat history as a list of messages.
+        max_tokens (int): Token cap for the response (500 if not given).
+        timeout (float): Seconds to wait for the server before giving up.
 
-    Returns:
-        str: The generated response text.
+    Yields:
+        str: Text deltas as they arrive.
     """
     try:
-        from openai import OpenAI
-        from voice_assistant.config import Config
-
         # Use OpenAI-compatible API which properly handles message history
         client = OpenAI(
             base_url=Config.LMSTUDIO_BASE_URL + "/v1",
-            api_key="lm-studio"  # LM Studio doesn't require a real API key
+            api_key="lm-studio",  # LM Studio doesn't require a real API key
+            **client_timeout(timeout), **sdk_retries()
         )
 
         # Make completion request with full chat history
-        completion = client.chat.completions.create(
+        stream = client.chat.completions.create(
             model="local-model",  # LM Studio uses whatever model is loaded
             messages=chat_history,
             temperature=0.7,
-            max_tokens=500
+            max_tokens=max_tokens or 500,
+            stream=True,
+            extra_body={"ttl": Config.LMSTUDIO_TTL}
         )
 
-        response_text = completion.choices[0].message.content
-        logging.info(f"Response: {response_text}")
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    except Exception as e:
+        logging.error(f"LM Studio generation error: {e}")
+        raise Exception(f"Failed to generate response with LM Studio: {e}")
+
+
+async def _iterate_async(items):
+    for item in items:
+        yield item
+
+
+async def _stream_openai_response_async(api_key, chat_history, max_tokens=None):
+    client = get_async_client(("openai", api_key), lambda: AsyncOpenAI(api_key=api_key, **sdk_retries()))
+    stream = await client.chat.completions.create(
+        model=Config.OPENAI_LLM,
+        messages=chat_history,
+        stream=True,
+        **_token_limit(max_tokens)
+    )
+    async for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+async def _stream_groq_response_async(api_key, chat_history, max_tokens=None):
+    client = get_async_client(("groq", api_key), lambda: AsyncGroq(api_key=api_key, **sdk_retries()))
+    stream = await client.chat.completions.create(
+        model=Config.GROQ_LLM,
+        messages=chat_history,
+        stream=True,
+        **_token_limit(max_tokens)
+    )
+    async for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
 
-        return response_text
+async def _stream_ollama_response_async(chat_history, max_tokens=None):
+    client = get_async_client(("ollama",), ollama.AsyncClient)
+    stream = await client.chat(
+        model=Config.OLLAMA_LLM,
+        messages=chat_history,
+        stream=True,
+        keep_alive=get_ollama_keep_alive(),
+        options={"num_predict": max_tokens} if max_tokens else None,
+    )
+    async for chunk in stream:
+        content = chunk['message']['content']
+        if content:
+            yield content
+
+
+async def _stream_lmstudio_response_async(chat_history, max_tokens=None):
+    try:
+        base_url = Config.LMSTUDIO_BASE_URL + "/v1"
+        client = get_async_client(("lmstudio", base_url), lambda: AsyncOpenAI(
+            base_url=base_url,
+            api_key="lm-studio",  # LM Studio doesn't require a real API key
+            **sdk_retries()
+        ))
+        stream = await client.chat.completions.create(
+            model="local-model",  # LM Studio uses whatever model is loaded
+            messages=chat_history,
+            temperature=0.7,
+            max_tokens=max_tokens or 500,
+            stream=True,
+            extra_body={"ttl": Config.LMSTUDIO_TTL}
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
 
     except Exception as e:
         logging.error(f"LM Studio generation error: {e}")
-        raise Exception(f"Failed to generate response with LM Studio: {e}")
\ No newline at end of file
+        raise Exception(f"Failed to generate response with LM Studio: {e}")
+
+
+def _generate_openai_response(api_key, chat_history):
+    return "".join(_stream_openai_response(api_key, chat_history))
+
+
+def _generate_groq_response(api_key, chat_history):
+    return "".join(_stream_groq_response(api_key, chat_history))
+
+
+def _generate_ollama_response(chat_history):
+    return "".join(_stream_ollama_response(chat_history))
+
+
+def _generate_lmstudio_response(chat_history):
+    """
+    Generate response using LM Studio local server.
+
+    Args:
+        chat_history (list): The chat history as a list of messages.
+
+    Returns:
+        str: The generated response text.
+    """
+    response_text = "".join(_stream_lmstudio_response(chat_history))
+    logging.info(f"Response: {response_text}")
+    return response_text
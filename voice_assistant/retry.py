@@ -0,0 +1,318 @@
+# voice_assistant/retry.py
+
+import asyncio
+import hashlib
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+from voice_assistant.config import Config
+from voice_assistant.hedging import hedge_cancelled
+from voice_assistant.utils import resume_stream, resume_stream_async
+
+# HTTP statuses worth retrying: rate limited, or a transient server error
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+
+# Exception class names of transient network failures across the SDKs
+# (openai/groq APIConnectionError, requests and httpx errors)
+_TRANSIENT_ERROR_NAMES = {"APIConnectionError", "ConnectionError", "ConnectError", "ReadError", "RemoteProtocolError"}
+
+
+class TokenBucket:
+    """Token bucket allowing `rate` requests per second with bursts of up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: int):
+        """
+        Args:
+            rate: Tokens added per second.
+            capacity: Maximum tokens held, i.e. the largest burst.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: float = None) -> float:
+        """
+        Take one token, waiting until one is available.
+
+        Args:
+            timeout: Longest wait in seconds, or None to wait as long as needed.
+
+        Returns:
+            float: Seconds spent waiting.
+
+        Raises:
+            TimeoutError: If no token becomes available within the timeout.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                wait = (1 - self._tokens) / self.rate
+            if timeout is not None and waited + wait > timeout:
+                raise TimeoutError(f"Rate limit allows no request within {timeout:.2f}s")
+            time.sleep(wait)
+            waited += wait
+
+
+def get_status_code(error):
+    """
+    Get the HTTP status of a provider error, if it carries one.
+
+    Args:
+        error: The exception raised by an SDK or HTTP client.
+
+    Returns:
+        int: The status code, or None.
+    """
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def get_retry_after(error):
+    """
+    Read the Retry-After header of a provider error.
+
+    Args:
+        error: The exception raised by an SDK or HTTP client.
+
+    Returns:
+        float: Seconds to wait, or None if the error has no usable header.
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(error) -> bool:
+    """
+    Check whether a provider error is transient.
+
+    Args:
+        error: The exception raised by an SDK or HTTP client.
+
+    Returns:
+        bool: True for rate limiting, transient server errors and network failures.
+            Timeouts are not retried: they already used up the stage's deadline budget.
+    """
+    status = get_status_code(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES
+    names = [cls.__name__ for cls in type(error).__mro__]
+    if isinstance(error, TimeoutError) or any("Timeout" in name for name in names):
+        return False
+    return isinstance(error, ConnectionError) or any(name in _TRANSIENT_ERROR_NAMES for name in names)
+
+
+class RetryPolicy:
+    """
+    Rate-limit and retry provider calls.
+
+    When Config.RATE_LIMITS_ENABLED is set, calls are paced by a token bucket
+    per provider and API key (Config.RATE_LIMITS). Transient failures are
+    retried up to Config.RETRY_MAX_ATTEMPTS times with exponential backoff and
+    full jitter, waiting at least as long as the provider's Retry-After header
+    asks. A call gives up rather than retry when Retry-After asks for more than
+    Config.RETRY_MAX_DELAY, or when the rate limiter or a backoff would run
+    past the call's timeout.
+    """
+
+    def __init__(self):
+        """Initialize the policy with no buckets."""
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self._stats = {}
+
+    def call(self, provider: str, api_key: str, fn, timeout: float = None):
+        """
+        Call a provider under the rate limit, retrying transient failures.
+
+        Args:
+            provider: The provider name, e.g. 'groq'.
+            api_key: The API key the call uses (None for local providers).
+            fn: Called with no arguments, performs the request.
+            timeout: Seconds the call may take including rate-limit waits and backoff,
+                usually the stage's deadline budget; None waits as long as needed.
+
+        Returns:
+            The result of fn.
+        """
+        if not Config.RETRY_ENABLED:
+            return fn()
+        bucket = self._get_bucket(provider, api_key)
+        attempts = max(Config.RETRY_MAX_ATTEMPTS, 1)
+        deadline = time.monotonic() + timeout if timeout else None
+        for attempt in range(attempts):
+            self._acquire(provider, bucket, deadline)
+            try:
+                return fn()
+            except Exception as e:
+                time.sleep(self._retry_delay(provider, attempt, attempts, e, deadline))
+
+    async def call_async(self, provider: str, api_key: str, fn, timeout: float = None):
+        """
+        Async variant of call.
+
+        Args:
+            provider: The provider name, e.g. 'groq'.
+            api_key: The API key the call uses (None for local providers).
+            fn: Called with no arguments, returns an awaitable that performs the request.
+            timeout: Seconds the call may take including rate-limit waits and backoff.
+
+        Returns:
+            The result of the awaitable.
+        """
+        if not Config.RETRY_ENABLED:
+            return await fn()
+        bucket = self._get_bucket(provider, api_key)
+        attempts = max(Config.RETRY_MAX_ATTEMPTS, 1)
+        deadline = time.monotonic() + timeout if timeout else None
+        for attempt in range(attempts):
+            if bucket:
+                # The bucket sleeps while it waits, so keep it off the event loop
+                await asyncio.to_thread(self._acquire, provider, bucket, deadline)
+            else:
+                self._acquire(provider, bucket, deadline)
+            try:
+                return await fn()
+            except Exception as e:
+                await asyncio.sleep(self._retry_delay(provider, attempt, attempts, e, deadline))
+
+    def stream(self, provider: str, api_key: str, open_stream, timeout: float = None):
+        """
+        Open a stream under the rate limit, retrying until its first delta arrives.
+
+        Args:
+            provider: The provider name.
+            api_key: The API key the stream uses.
+            open_stream: Called with no arguments, returns an iterator of deltas.
+            timeout: Seconds until the first delta including rate-limit waits and backoff.
+
+        Returns:
+            iterator: The stream's deltas, starting with the first one.
+        """
+        def first_delta():
+            iterator = iter(open_stream())
+            return iterator, next(iterator, None)
+
+        iterator, first = self.call(provider, api_key, first_delta, timeout)
+        return resume_stream(first, iterator)
+
+    async def stream_async(self, provider: str, api_key: str, open_stream, timeout: float = None):
+        """
+        Async variant of stream.
+
+        Args:
+            provider: The provider name.
+            api_key: The API key the stream uses.
+            open_stream: Called with no arguments, returns an async iterator of deltas.
+            timeout: Seconds until the first delta including rate-limit waits and backoff.
+
+        Returns:
+            async iterator: The stream's deltas, starting with the first one.
+        """
+        async def first_delta():
+            iterator = aiter(open_stream())
+            return iterator, await anext(iterator, None)
+
+        iterator, first = await self.call_async(provider, api_key, first_delta, timeout)
+        return resume_stream_async(first, iterator)
+
+    def get_stats(self) -> dict:
+        """
+        Get retry metrics.
+
+        Returns:
+            dict: Provider to 'calls' (attempts made), 'retries', 'failures'
+                (calls that gave up) and 'throttled' (attempts held by the rate limiter).
+        """
+        with self._lock:
+            return {provider: dict(counts) for provider, counts in self._stats.items()}
+
+    def _acquire(self, provider, bucket, deadline):
+        if bucket:
+            try:
+                waited = bucket.acquire(None if deadline is None else max(deadline - time.monotonic(), 0.0))
+            except TimeoutError:
+                self._count(provider, "failures")
+                raise
+            if waited:
+                self._count(provider, "throttled")
+                logging.debug(f"Rate limiter held {provider} request for {waited:.2f}s")
+        self._count(provider, "calls")
+
+    def _retry_delay(self, provider, attempt, attempts, error, deadline):
+        # Re-raises the error when it should not be retried
+        if attempt == attempts - 1 or not is_retryable(error) or hedge_cancelled():
+            self._count(provider, "failures")
+            raise error
+        retry_after = get_retry_after(error)
+        if retry_after is not None and retry_after > Config.RETRY_MAX_DELAY:
+            self._count(provider, "failures")
+            logging.warning(f"{provider} request failed ({error}), asked to retry after {retry_after:.1f}s, "
+                            f"longer than the {Config.RETRY_MAX_DELAY:.1f}s limit")
+            raise error
+        delay = self._backoff(attempt, retry_after)
+        if deadline is not None and time.monotonic() + delay > deadline:
+            self._count(provider, "failures")
+            logging.warning(f"{provider} request failed ({error}), no time left to retry")
+            raise error
+        self._count(provider, "retries")
+        logging.warning(f"{provider} request failed ({error}), retry {attempt + 1}/{attempts - 1} "
+                        f"in {delay:.2f}s")
+        return delay
+
+    def _backoff(self, attempt, retry_after):
+        delay = random.uniform(0, min(Config.RETRY_BASE_DELAY * 2 ** attempt, Config.RETRY_MAX_DELAY))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def _get_bucket(self, provider, api_key):
+        limit = Config.RATE_LIMITS.get(provider) if Config.RATE_LIMITS_ENABLED else None
+        if not limit:
+            return None
+        # Keys are only held hashed, so metrics and logs never expose them
+        key_id = hashlib.sha1((api_key or "").encode()).hexdigest()[:12]
+        with self._lock:
+            bucket = self._buckets.get((provider, key_id))
+            if bucket is None:
+                bucket = self._buckets[(provider, key_id)] = TokenBucket(limit["rate"], limit["burst"])
+            return bucket
+
+    def _count(self, provider, field):
+        with self._lock:
+            counts = self._stats.setdefault(provider, {"calls": 0, "retries": 0, "failures": 0, "throttled": 0})
+            counts[field] += 1
+
+
+# Global instance
+retry_policy = RetryPolicy()
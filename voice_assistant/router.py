@@ -0,0 +1,150 @@
+# voice_assistant/router.py
+
+import logging
+import re
+import threading
+import time
+
+from voice_assistant.config import Config
+from voice_assistant.api_key_manager import get_api_key
+
+_WORD_RE = re.compile(r"[\w']+")
+
+
+def classify_turn(text: str) -> str:
+    """
+    Classify a user turn as 'simple' or 'complex' from cheap local features.
+
+    A turn is simple when it matches one of Config.ROUTING_SIMPLE_PATTERNS
+    (greetings, thanks, yes/no) or is short and contains none of
+    Config.ROUTING_COMPLEX_KEYWORDS. Everything else is complex.
+
+    Args:
+        text: The user's transcribed text.
+
+    Returns:
+        str: 'simple' or 'complex'.
+    """
+    lowered = text.lower().strip()
+    words = _WORD_RE.findall(lowered)
+    if any(re.search(pattern, lowered) for pattern in Config.ROUTING_SIMPLE_PATTERNS):
+        return "simple"
+    if any(word in Config.ROUTING_COMPLEX_KEYWORDS for word in words):
+        return "complex"
+    # Several sentences or clauses usually mean a multi-part request
+    if len(re.findall(r"[.?!;]", lowered.rstrip(".?! "))) > 0:
+        return "complex"
+    if len(words) <= Config.ROUTING_SIMPLE_MAX_WORDS:
+        return "simple"
+    return "complex"
+
+
+class TurnRouter:
+    """
+    Send simple turns to a fast model and complex turns to the heavy model.
+
+    Per-route latency (time to first token and total time) is tracked and
+    logged after every routed turn.
+    """
+
+    def __init__(self):
+        """Initialize the router."""
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def route(self, model: str, api_key: str, chat_history: list):
+        """
+        Pick the response model for a turn.
+
+        Args:
+            model: The configured (heavy) response model.
+            api_key: The API key for the configured model.
+            chat_history: The chat history ending with the user's message.
+
+        Returns:
+            tuple: (route name, model, api_key) to use for this turn.
+        """
+        if not chat_history or chat_history[-1].get("role") != "user":
+            return "heavy", model, api_key
+
+        route = classify_turn(chat_history[-1].get("content") or "")
+        if route == "simple":
+            fast_model = Config.ROUTING_FAST_MODEL
+            fast_key = get_api_key("response", fast_model)
+            if fast_model in ('openai', 'groq') and not fast_key:
+                logging.warning(f"No API key for fast route model {fast_model}, using {model}")
+                return "heavy", model, api_key
+            logging.info(f"Routing simple turn to {fast_model}")
+            return "fast", fast_model, fast_key
+
+        heavy_model = Config.ROUTING_HEAVY_MODEL or model
+        if heavy_model != model:
+            api_key = get_api_key("response", heavy_model)
+        return "heavy", heavy_model, api_key
+
+    def track(self, route: str, model: str, stream):
+        """
+        Pass a response stream through, recording its latency under the route.
+
+        Args:
+            route: The route name returned by route().
+            model: The model serving the route.
+            stream: Iterable of text deltas.
+
+        Yields:
+            str: The deltas of the underlying stream.
+        """
+        start = time.perf_counter()
+        first_token = None
+        completed = False
+        try:
+            for delta in stream:
+                if first_token is None:
+                    first_token = time.perf_counter() - start
+                yield delta
+            completed = True
+        finally:
+            if completed:
+                self.record(route, model, first_token, time.perf_counter() - start)
+
+    def get_stats(self) -> dict:
+        """
+        Get per-route latency statistics.
+
+        Returns:
+            dict: Route name to 'turns', 'avg_ttft' and 'avg_total' (seconds).
+        """
+        with self._lock:
+            return {
+                route: {
+                    "turns": stats["turns"],
+                    "avg_ttft": stats["ttft_sum"] / stats["turns"],
+                    "avg_total": stats["total_sum"] / stats["turns"],
+                }
+                for route, stats in self._stats.items()
+            }
+
+    def record(self, route: str, model: str, ttft: float, total: float):
+        """
+        Record the latency of one completed turn on a route.
+
+        Args:
+            route: The route name returned by route().
+            model: The model serving the route.
+            ttft: Seconds to the first token (None if nothing was generated).
+            total: Total seconds for the response.
+        """
+        with self._lock:
+            stats = self._stats.setdefault(route, {"turns": 0, "ttft_sum": 0.0, "total_sum": 0.0})
+            stats["turns"] += 1
+            stats["ttft_sum"] += ttft or 0.0
+            stats["total_sum"] += total
+            turns = stats["turns"]
+            avg_ttft = stats["ttft_sum"] / turns
+            avg_total = stats["total_sum"] / turns
+        logging.info(f"Route {route} ({model}): first token {ttft or 0.0:.2f}s, total {total:.2f}s; "
+                     f"avg over {turns} turns {avg_ttft:.2f}s / {avg_total:.2f}s")
+
+
+# Global instance
+turn_router = TurnRouter()
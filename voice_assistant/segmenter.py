@@ -0,0 +1,135 @@
+# voice_assistant/segmenter.py
+
+import re
+
+# Abbreviations that end with a period but do not end a sentence
+_ABBREVIATIONS = {"mr", "mrs", "ms", "dr", "st", "vs", "etc", "e.g", "i.e", "no", "jr", "sr"}
+
+_SENTENCE_END = re.compile(r'[.!?]+["\')\]]*\s+|\n+')
+_CLAUSE_END = re.compile(r'[,;:—]\s+')
+
+
+class SentenceSegmenter:
+    """
+    Cut a stream of LLM tokens into speakable segments as the tokens arrive.
+
+    A segment ends at a sentence terminator followed by whitespace, or at a
+    newline. Long sentences are additionally cut at clause punctuation once
+    they exceed clause_chars, so TTS never waits on a run-on sentence.
+    """
+
+    def __init__(self, min_chars: int = 12, clause_chars: int = 80):
+        """
+        Args:
+            min_chars: Shortest segment worth sending to TTS on its own.
+            clause_chars: Length after which a segment may be cut at a comma,
+                semicolon, colon or dash.
+        """
+        self.min_chars = min_chars
+        self.clause_chars = clause_chars
+        self._buffer = ""
+
+    def feed(self, delta: str) -> list:
+        """
+        Add a token delta and return any segments it completed.
+
+        Args:
+            delta: The next piece of generated text.
+
+        Returns:
+            list: Completed segments, in order (may be empty).
+        """
+        self._buffer += delta
+        segments = []
+        while True:
+            cut = self._find_cut()
+            if cut is None:
+                break
+            segment = self._buffer[:cut].strip()
+            self._buffer = self._buffer[cut:]
+            if segment:
+                segments.append(segment)
+        return segments
+
+    def flush(self) -> list:
+        """
+        Return whatever text remains once the stream has ended.
+
+        Returns:
+            list: The trailing segment, if any.
+        """
+        segment = self._buffer.strip()
+        self._buffer = ""
+        return [segment] if segment else []
+
+    def _find_cut(self):
+        for match in _SENTENCE_END.finditer(self._buffer):
+            end = match.end()
+            if len(self._buffer[:end].strip()) < self.min_chars:
+                continue
+            if self._is_abbreviation(match.start()):
+                continue
+            return end
+
+        if len(self._buffer) >= self.clause_chars:
+            cut = None
+            for match in _CLAUSE_END.finditer(self._buffer):
+                if match.start() >= self.min_chars:
+                    cut = match.end()
+            return cut
+        return None
+
+    def _is_abbreviation(self, index):
+        if self._buffer[index] != ".":
+            return False
+        words = self._buffer[:index].split()
+        return bool(words) and words[-1].lower() in _ABBREVIATIONS
+
+
+def split_sentences(text: str, min_chars: int = 12, clause_chars: int = 80) -> list:
+    """
+    Split a complete text into speakable segments.
+
+    Args:
+        text: The text to split.
+        min_chars: Shortest segment worth emitting on its own.
+        clause_chars: Length after which a segment may be cut at clause punctuation.
+
+    Returns:
+        list: The segments, in order.
+    """
+    segmenter = SentenceSegmenter(min_chars=min_chars, clause_chars=clause_chars)
+    return segmenter.feed(text + " ") + segmenter.flush()
+
+
+def split_long_text(text: str, chunk_chars: int = 250) -> list:
+    """
+    Split a long text into chunks at sentence boundaries.
+
+    The first sentence is kept on its own so playback starts as early as
+    possible; the following sentences are merged into chunks of up to
+    chunk_chars characters, which keeps the number of requests down without
+    making any one chunk much slower than the others.
+
+    Args:
+        text: The text to split.
+        chunk_chars: Longest chunk to build by merging sentences.
+
+    Returns:
+        list: The chunks, in order.
+    """
+    sentences = split_sentences(text)
+    if not sentences:
+        return [text] if text.strip() else []
+
+    chunks = [sentences[0]]
+    current = ""
+    for sentence in sentences[1:]:
+        if current and len(current) + 1 + len(sentence) > chunk_chars:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        chunks.append(current)
+    return chunks
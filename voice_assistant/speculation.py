@@ -0,0 +1,185 @@
+# voice_assistant/speculation.py
+
+import logging
+import queue
+import re
+import threading
+import time
+
+from voice_assistant.config import Config
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s']")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def _normalize(text):
+    return _SPACE_RE.sub(" ", _PUNCTUATION_RE.sub(" ", text.lower())).strip()
+
+
+class _Speculation:
+    """A response stream started on a partial transcript and buffered until it is committed."""
+
+    def __init__(self, key, text, start_stream):
+        self.key = key
+        self.started_at = time.perf_counter()
+        self._queue = queue.Queue()
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(text, start_stream), daemon=True)
+        self._thread.start()
+
+    def _run(self, text, start_stream):
+        stream = None
+        try:
+            stream = start_stream(text)
+            for delta in stream:
+                if self._cancelled.is_set():
+                    break
+                self._queue.put(("delta", delta))
+            self._queue.put(("end", None))
+        except Exception as e:
+            self._queue.put(("error", e))
+        finally:
+            # Closing the generator closes the provider's HTTP stream
+            if stream is not None and hasattr(stream, "close"):
+                stream.close()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def stream(self):
+        while True:
+            kind, value = self._queue.get()
+            if kind == "delta":
+                yield value
+            elif kind == "error":
+                raise value
+            else:
+                return
+
+
+class SpeculativeGenerator:
+    """
+    Start the LLM on a partial transcript once it has been stable for a while.
+
+    Every partial transcript re-arms a timer. If no different partial arrives
+    within Config.SPECULATION_STABLE_MS, a response stream is started on the
+    partial and buffered. When the final transcript arrives, take() returns
+    the buffered stream if the final text matches the speculated one, or
+    cancels the speculation so the caller generates normally.
+    """
+
+    def __init__(self, start_stream, stable_ms: int = None):
+        """
+        Args:
+            start_stream: Called with the user text, returns an iterator of response deltas.
+            stable_ms: How long a partial must stay unchanged before speculating.
+        """
+        self._start_stream = start_stream
+        self.stable_ms = stable_ms or Config.SPECULATION_STABLE_MS
+        self._lock = threading.Lock()
+        self._timer = None
+        self._pending_key = None
+        self._speculation = None
+        self.attempts = 0
+        self.hits = 0
+        self.misses = 0
+        self.latency_saved = 0.0
+
+    def on_partial(self, text: str):
+        """
+        Report a partial transcript.
+
+        Args:
+            text: The transcript so far.
+        """
+        key = _normalize(text)
+        if not key:
+            return
+        with self._lock:
+            if key == self._pending_key:
+                return
+            self._pending_key = key
+            if self._timer is not None:
+                self._timer.cancel()
+            if self._speculation is not None and self._speculation.key != key:
+                self._speculation.cancel()
+                self._speculation = None
+            self._timer = threading.Timer(self.stable_ms / 1000, self._launch, args=(text, key))
+            self._timer.daemon = True
+            self._timer.start()
+
+    def take(self, final_text: str):
+        """
+        Resolve the speculation against the final transcript.
+
+        Args:
+            final_text: The final transcript.
+
+        Returns:
+            iterator: The speculative response stream on a hit, or None on a miss
+                (the caller should then generate the response itself).
+        """
+        with self._lock:
+            speculation = self._reset()
+        if speculation is None:
+            return None
+
+        if speculation.key == _normalize(final_text):
+            saved = time.perf_counter() - speculation.started_at
+            with self._lock:
+                self.hits += 1
+                self.latency_saved += saved
+            logging.info(f"Speculation hit, started {saved * 1000:.0f} ms before the final transcript "
+                         f"(hit rate {self.hit_rate:.0%})")
+            return speculation.stream()
+
+        speculation.cancel()
+        with self._lock:
+            self.misses += 1
+        logging.info(f"Speculation miss, restarting on the final transcript (hit rate {self.hit_rate:.0%})")
+        return None
+
+    def cancel(self):
+        """Drop any pending or running speculation, e.g. when a local intent handles the turn."""
+        with self._lock:
+            speculation = self._reset()
+        if speculation is not None:
+            speculation.cancel()
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of started speculations whose result was used."""
+        resolved = self.hits + self.misses
+        return self.hits / resolved if resolved else 0.0
+
+    def get_stats(self) -> dict:
+        """
+        Get speculation metrics.
+
+        Returns:
+            dict: 'attempts', 'hits', 'misses', 'hit_rate' and 'latency_saved' (total seconds).
+        """
+        with self._lock:
+            return {
+                "attempts": self.attempts,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hit_rate,
+                "latency_saved": self.latency_saved,
+            }
+
+    def _launch(self, text, key):
+        with self._lock:
+            if key != self._pending_key or self._speculation is not None:
+                return
+            logging.info(f"Partial transcript stable for {self.stable_ms} ms, speculating on: {text}")
+            self._speculation = _Speculation(key, text, self._start_stream)
+            self.attempts += 1
+
+    def _reset(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._pending_key = None
+        speculation, self._speculation = self._speculation, None
+        return speculation
@@ -0,0 +1,136 @@
+# voice_assistant/summarizer.py
+
+import logging
+import threading
+
+from voice_assistant.config import Config
+from voice_assistant.chat_history import history_window
+from voice_assistant.response_generation import generate_response_stream
+from voice_assistant.api_key_manager import get_api_key
+
+# Marks the rolling summary message so later compactions can fold it in
+SUMMARY_PREFIX = "Summary of the earlier conversation: "
+
+SUMMARY_INSTRUCTIONS = (
+    "You compress conversations between a user and a voice assistant called Verbi. "
+    "Write a short summary that keeps names, facts, user preferences, decisions and "
+    "open questions. Write plain sentences, no lists, at most {words} words."
+)
+
+
+def is_summary_message(message: dict) -> bool:
+    """
+    Check whether a chat message is a rolling summary produced by the compactor.
+
+    Args:
+        message: A chat message.
+
+    Returns:
+        bool: True if the message is a summary.
+    """
+    return message.get("role") == "system" and (message.get("content") or "").startswith(SUMMARY_PREFIX)
+
+
+class HistoryCompactor:
+    """
+    Replace older chat history segments with a rolling summary, in the background.
+
+    The summary is generated on a daemon thread between turns without holding
+    the lock. The lock is held only to snapshot the history and to swap the
+    summarized segment for the summary message, so the live turn never waits
+    on the summarization call.
+    """
+
+    def __init__(self, lock: threading.Lock = None):
+        """
+        Args:
+            lock: Lock guarding the chat history. Callers must hold it while
+                snapshotting or appending to the history.
+        """
+        self.lock = lock or threading.Lock()
+        self._thread = None
+
+    def snapshot(self, messages: list) -> list:
+        """
+        Copy the chat history for a generation request.
+
+        Args:
+            messages: The chat history.
+
+        Returns:
+            list: A copy that is safe to use while a compaction swaps segments.
+        """
+        with self.lock:
+            return list(messages)
+
+    def maybe_compact(self, messages: list) -> bool:
+        """
+        Start a background compaction if the history is over the trigger size.
+
+        Args:
+            messages: The chat history, modified in place when the summary is ready.
+
+        Returns:
+            bool: True if a compaction was started.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return False
+
+        with self.lock:
+            snapshot = list(messages)
+        if history_window.count_messages(snapshot) < Config.SUMMARY_TRIGGER_TOKENS:
+            return False
+        if self._segment_bounds(snapshot) is None:
+            return False
+
+        self._thread = threading.Thread(target=self._compact, args=(messages, snapshot), daemon=True)
+        self._thread.start()
+        return True
+
+    def _segment_bounds(self, snapshot):
+        # Keep the original system prompt and the most recent messages verbatim
+        start = 1 if snapshot and snapshot[0].get("role") == "system" and not is_summary_message(snapshot[0]) else 0
+        end = len(snapshot) - max(Config.SUMMARY_KEEP_MESSAGES, 1)
+        # Only summarize whole turns: the kept tail starts with a user message
+        while end > start and snapshot[end].get("role") != "user":
+            end -= 1
+        if end - start < 2:
+            return None
+        return start, end
+
+    def _compact(self, messages, snapshot):
+        try:
+            start, end = self._segment_bounds(snapshot)
+            segment = snapshot[start:end]
+            summary = self._summarize(segment)
+            if not summary:
+                return
+
+            summary_message = {"role": "system", "content": SUMMARY_PREFIX + summary}
+            with self.lock:
+                # Swap only if the summarized prefix is still what we read
+                if messages[:end] != snapshot[:end]:
+                    logging.info("Chat history changed during compaction, discarding summary")
+                    return
+                messages[start:end] = [summary_message]
+
+            saved = history_window.count_messages(segment) - history_window.count_tokens(summary_message)
+            logging.info(f"Compacted {len(segment)} messages into a summary (saved ~{saved} tokens)")
+        except Exception as e:
+            logging.error(f"Failed to compact chat history: {e}")
+
+    def _summarize(self, segment):
+        transcript = []
+        for message in segment:
+            if is_summary_message(message):
+                transcript.append(message["content"])
+            else:
+                transcript.append(f"{message['role'].capitalize()}: {message['content']}")
+
+        prompt = [
+            {"role": "system", "content": SUMMARY_INSTRUCTIONS.format(words=Config.SUMMARY_MAX_WORDS)},
+            {"role": "user", "content": "\n".join(transcript)},
+        ]
+        model = Config.SUMMARY_MODEL or Config.RESPONSE_MODEL
+        summary = "".join(generate_response_stream(model, get_api_key("response", model), prompt, live_turn=False))
+        return summary.strip()
@@ -57,6 +57,20 @@ class TempFileManager:
         file_path = f"output.{file_format}"
         return self.register_temp_file(file_path)
 
+    def get_segment_file(self, file_format: str, index: int) -> str:
+        """
+        Get a temp file path for one segment of a pipelined response.
+
+        Args:
+            file_format: File extension (e.g., 'mp3', 'wav')
+            index: Position of the segment within the response
+
+        Returns:
+            str: Path to the temp segment file
+        """
+        file_path = f"output_{index}.{file_format}"
+        return self.register_temp_file(file_path)
+
     def get_input_file(self, file_format: str = 'mp3') -> str:
         """
         Get a temp file path for input/recording.
@@ -1,150 +1,548 @@
 # voice_assistant/text_to_speech.py
+import asyncio
+import io
 import logging
 import json
 import os
-import pyaudio
+import time
+import wave
 import elevenlabs
 import soundfile as sf
 import requests
+import httpx
 
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 from deepgram import DeepgramClient
 try:
     from deepgram import SpeakOptions
 except ImportError:
     SpeakOptions = None
 from elevenlabs.client import ElevenLabs
-from cartesia import Cartesia
 
 from voice_assistant.config import Config
+from voice_assistant.utils import client_timeout, sdk_retries, get_async_client
 from voice_assistant.local_tts_generation import generate_audio_file_melotts
+from voice_assistant.cartesia_session import get_cartesia_session
+from voice_assistant.api_key_manager import get_api_key
+from voice_assistant.circuit_breaker import breakers, fallback_chain
+from voice_assistant.retry import retry_policy
+from voice_assistant.auto_select import resolve_model
+from voice_assistant.tts_cache import tts_cache, tts_cache_key
+from voice_assistant.temp_file_manager import temp_file_manager
 
 # Global cache for pyttsx3 engine
 _pyttsx3_engine = None
 
-def text_to_speech(model: str, api_key:str, text:str, output_file_path:str, local_model_path:str=None):
+# TTS models that play audio themselves instead of writing a file
+STREAMING_TTS_MODELS = ("cartesia",)
+
+# Models whose PCM stream is played as it arrives when Config.TTS_STREAMING is set
+NATIVE_STREAMING_TTS_MODELS = ("openai", "elevenlabs", "deepgram", "piper", "melotts")
+
+
+def streams_playback(model: str) -> bool:
+    """
+    Check whether a TTS model plays audio itself.
+
+    Callers pass None as the output file for these models and skip playback.
+
+    Args:
+    model (str): The TTS model.
+
+    Returns:
+    bool: True for Cartesia, and for OpenAI, ElevenLabs, Deepgram, Piper and MeloTTS when
+        Config.TTS_STREAMING is set.
+    """
+    return model in STREAMING_TTS_MODELS or (Config.TTS_STREAMING and model in NATIVE_STREAMING_TTS_MODELS)
+
+def text_to_speech(model: str, api_key:str, text:str, output_file_path:str, local_model_path:str=None,
+                   timeout:float=None, on_first_audio=None):
     """
     Convert text to speech using the specified model.
+
+    When Config.CIRCUIT_BREAKERS_ENABLED is set, a failing model is skipped for
+    a while and the next model in Config.TTS_FALLBACK_CHAIN speaks instead.
+    Every provider call is rate limited and transient failures are retried
+    (see voice_assistant.retry). Callers should resolve 'auto' with
+    voice_assistant.auto_select.resolve_model first, since the output file
+    format depends on the model. When Config.TTS_CACHE_ENABLED is set, clips
+    already synthesized for the same text, provider, voice and format are
+    served from the TTS cache instead of calling the provider. Models for
+    which streams_playback() is True play audio as it arrives and need no
+    output file.
     
     Args:
-    model (str): The model to use for TTS ('openai', 'deepgram', 'elevenlabs', 'local').
+    model (str): The model to use for TTS ('openai', 'deepgram', 'elevenlabs', 'local', 'auto').
     api_key (str): The API key for the TTS service.
     text (str): The text to convert to speech.
     output_file_path (str): The path to save the generated speech audio file.
     local_model_path (str): The path to the local model (if applicable).
+    timeout (float): Seconds to wait for the TTS service before giving up (Cartesia and
+        the macOS voice keep their own limits).
+    on_first_audio (callable): For models that play audio themselves, called once right
+        before the first audio is played. Callers play output files themselves.
     """
-    
+    if model == 'auto':
+        model = resolve_model("tts", model)
+        api_key = get_api_key("tts", model)
+    if _serve_cached(text, model, output_file_path, on_first_audio):
+        return
+
+    try:
+        if output_file_path is None:
+            _speak_streamed(model, api_key, text, local_model_path, timeout, on_first_audio)
+            return
+        if Config.CIRCUIT_BREAKERS_ENABLED:
+            chain = fallback_chain("tts", model, Config.TTS_FALLBACK_CHAIN)
+            provider, _ = breakers.call("tts", chain, lambda provider: _synthesize_fallback(
+                provider, model, api_key, text, output_file_path, local_model_path, timeout))
+        else:
+            provider = model
+            retry_policy.call(model, api_key, lambda: _synthesize(
+                model, api_key, text, output_file_path, local_model_path, timeout), timeout)
+        _cache_audio(text, provider, output_file_path)
+
+    except Exception as e:
+        logging.error(f"Failed to convert text to speech: {e}")
+
+
+def warm_tts_cache(model: str, api_key: str, text: str, file_format: str = None, timeout: float = None) -> bool:
+    """
+    Synthesize text into the TTS cache without playing it.
+
+    A later text_to_speech call for the same text is then served from the
+    cache, e.g. for a fixed message that must play even when the provider is
+    slow at that moment.
+
+    Args:
+    model (str): The TTS model the later call will use.
+    api_key (str): The API key for the TTS service.
+    text (str): The text to synthesize.
+    file_format (str): Container of the later call's output file ('mp3', 'wav'),
+        or None if it will stream playback.
+    timeout (float): Seconds to wait for the TTS service.
+
+    Returns:
+    bool: True if the clip is in the cache (False for Cartesia, which is not cached).
+    """
+    if not Config.TTS_CACHE_ENABLED:
+        return False
+    streamed = file_format is None
+    if streamed and model not in NATIVE_STREAMING_TTS_MODELS:
+        return False
+    cache_format = "wav" if streamed else file_format
+    key = tts_cache_key(text, model, cache_format)
+    if tts_cache.contains(key, cache_format):
+        return True
+
+    if streamed:
+        pcm = bytearray()
+        sample_rate = None
+        for sample_rate, chunk in retry_policy.stream(model, api_key,
+                                                      lambda: _pcm_chunks(model, api_key, text, timeout), timeout):
+            pcm.extend(chunk)
+        if pcm:
+            tts_cache.put(key, "wav", _wav_bytes(bytes(pcm), sample_rate))
+    else:
+        warm_file = temp_file_manager.register_temp_file(f"tts_warmup.{file_format}")
+        retry_policy.call(model, api_key, lambda: _synthesize(model, api_key, text, warm_file, timeout=timeout),
+                          timeout)
+        _cache_audio(text, model, warm_file)
+    return tts_cache.contains(key, cache_format)
+
+
+def _synthesize_fallback(provider, model, api_key, text, output_file_path, local_model_path=None, timeout=None):
+    """Synthesize with a provider from the fallback chain."""
+    if provider != model:
+        api_key = get_api_key("tts", provider)
+    retry_policy.call(provider, api_key, lambda: _synthesize(
+        provider, api_key, text, output_file_path, local_model_path, timeout), timeout)
+
+
+def _file_format(output_file_path):
+    return os.path.splitext(output_file_path)[1].lstrip(".") if output_file_path else ""
+
+
+def _serve_cached(text, model, output_file_path, on_first_audio=None):
+    """Write a cached clip to output_file_path (or play it for streaming models), returning True on a hit."""
+    streamed = output_file_path is None and streams_playback(model) and model in NATIVE_STREAMING_TTS_MODELS
+    file_format = "wav" if streamed else _file_format(output_file_path)
+    if not Config.TTS_CACHE_ENABLED or not file_format:
+        # Cartesia plays audio itself and leaves nothing to cache
+        return False
+    data = tts_cache.get(tts_cache_key(text, model, file_format), file_format)
+    if data is None:
+        return False
+    if streamed:
+        _play_wav_bytes(data, on_first_audio)
+    else:
+        _write_file(output_file_path, data)
+    stats = tts_cache.get_stats()
+    logging.info(f"TTS cache hit (hit ratio {stats['hit_ratio']:.0%}, {stats['bytes_served']} bytes served)")
+    return True
+
+
+def _cache_audio(text, provider, output_file_path):
+    """Store a freshly synthesized clip under the provider that produced it."""
+    file_format = _file_format(output_file_path)
+    if not Config.TTS_CACHE_ENABLED or not file_format:
+        return
+    try:
+        with open(output_file_path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return
+    tts_cache.put(tts_cache_key(text, provider, file_format), file_format, data)
+
+
+def _speak_streamed(model, api_key, text, local_model_path=None, timeout=None, on_first_audio=None):
+    """
+    Speak text with a model that plays audio itself.
+
+    PCM streams are played as they arrive. Retries and circuit-breaker
+    fallback only apply until the first chunk is ready, so the breaker and
+    the 'auto' selector see the time to first audio rather than the length
+    of the answer, and an error after playback has started is raised instead
+    of speaking the text again.
+    """
+    start = time.perf_counter()
+    if Config.CIRCUIT_BREAKERS_ENABLED:
+        chain = fallback_chain("tts", model, Config.TTS_FALLBACK_CHAIN)
+        provider, stream = breakers.stream("tts", chain, lambda provider: (provider, _open_speech(
+            provider, api_key if provider == model else get_api_key("tts", provider),
+            text, local_model_path, timeout, on_first_audio)))
+    else:
+        provider, stream = model, _open_speech(model, api_key, text, local_model_path, timeout, on_first_audio)
+    _play_speech(provider, text, stream, start, on_first_audio)
+
+
+def _open_speech(provider, api_key, text, local_model_path=None, timeout=None, on_first_audio=None):
+    """
+    Start speaking text with a provider.
+
+    Returns:
+    iterator: (sample rate, PCM chunk) pairs to play, or a single (None, file path)
+        pair for a fallback provider that cannot stream. Empty for Cartesia,
+        which has already spoken by the time this returns.
+    """
+    if not streams_playback(provider):
+        file_format = 'mp3' if provider in ('openai', 'elevenlabs') else 'wav'
+        fallback_file = temp_file_manager.get_output_file(file_format)
+        retry_policy.call(provider, api_key, lambda: _synthesize(
+            provider, api_key, text, fallback_file, local_model_path, timeout), timeout)
+        return iter([(None, fallback_file)])
+    if provider not in NATIVE_STREAMING_TTS_MODELS:
+        retry_policy.call(provider, api_key, lambda: _synthesize(
+            provider, api_key, text, None, local_model_path, timeout, on_first_audio), timeout)
+        return iter(())
+    return retry_policy.stream(provider, api_key, lambda: _pcm_chunks(provider, api_key, text, timeout), timeout)
+
+
+def _pcm_chunks(model, api_key, text, timeout=None):
+    """Yield (sample rate, chunk) pairs of a provider's 16-bit mono PCM stream."""
+    if model in ('piper', 'melotts'):
+        sample_rate, chunks = _open_local_pcm_stream(model, text, timeout)
+    else:
+        sample_rate = Config.TTS_STREAM_SAMPLE_RATES[model]
+        chunks = _open_pcm_stream(model, api_key, text, sample_rate, timeout)
+    try:
+        for chunk in chunks:
+            if chunk:
+                yield sample_rate, chunk
+    finally:
+        chunks.close()
+
+
+def _play_speech(provider, text, stream, start, on_first_audio=None):
+    """Play a stream from _open_speech, teeing PCM into the TTS cache as a WAV clip."""
+    from voice_assistant.audio import PCMPlayer, play_audio
+    player = None
+    pcm = bytearray()
+    sample_rate = None
+    try:
+        for sample_rate, chunk in stream:
+            if sample_rate is None:
+                # A file from a fallback provider that cannot stream
+                if on_first_audio:
+                    on_first_audio()
+                play_audio(chunk)
+                continue
+            if player is None:
+                logging.info(f"{provider} TTS first audio after {(time.perf_counter() - start) * 1000:.0f}ms")
+                player = PCMPlayer(sample_rate)
+                if on_first_audio:
+                    on_first_audio()
+            player.write(chunk)
+            pcm.extend(chunk)
+    finally:
+        if player is not None:
+            player.close()
+        if hasattr(stream, "close"):
+            stream.close()
+    if Config.TTS_CACHE_ENABLED and pcm:
+        tts_cache.put(tts_cache_key(text, provider, "wav"), "wav", _wav_bytes(bytes(pcm), sample_rate))
+
+
+def _open_pcm_stream(model, api_key, text, sample_rate, timeout=None):
+    """Yield 16-bit mono PCM chunks from a provider's streaming endpoint."""
+    chunk_size = Config.TTS_STREAM_CHUNK_BYTES
+    if model == 'openai':
+        # OpenAI's raw PCM output is always 24 kHz
+        client = OpenAI(api_key=api_key, **client_timeout(timeout), **sdk_retries())
+        with client.audio.speech.with_streaming_response.create(
+            model=Config.TTS_VOICES["openai"]["model"],
+            voice=Config.TTS_VOICES["openai"]["voice"],
+            input=text,
+            response_format="pcm"
+        ) as speech_response:
+            yield from speech_response.iter_bytes(chunk_size)
+
+    elif model == 'elevenlabs':
+        client = ElevenLabs(api_key=api_key, **client_timeout(timeout))
+        yield from client.generate(
+            text=text,
+            voice=Config.TTS_VOICES["elevenlabs"]["voice"],
+            output_format=f"pcm_{sample_rate}",
+            model=Config.TTS_VOICES["elevenlabs"]["model"],
+            stream=True
+        )
+
+    elif model == 'deepgram':
+        response = requests.post(
+            "https://api.deepgram.com/v1/speak",
+            params={
+                "model": Config.TTS_VOICES["deepgram"]["model"],
+                "encoding": "linear16",
+                "sample_rate": sample_rate,
+                "container": "none",
+            },
+            headers={"Authorization": f"Token {api_key}"},
+            json={"text": text},
+            stream=True,
+            timeout=timeout
+        )
+        with response:
+            response.raise_for_status()
+            yield from response.iter_content(chunk_size)
+
+    else:
+        raise ValueError(f"{model} has no streaming TTS endpoint")
+
+
+def _open_local_pcm_stream(model, text, timeout=None):
+    """
+    Open the chunked streaming endpoint of the Piper or MeloTTS server.
+
+    The server synthesizes sentence by sentence and sends each one's PCM as
+    soon as it is ready, so playback starts after the first sentence.
+
+    Returns:
+    tuple: (sample rate, iterator of 16-bit mono PCM chunks).
+    """
+    if model == 'piper':
+        url = f"{Config.PIPER_SERVER_URL}/synthesize/stream"
+    else:
+        url = f"http://localhost:{Config.TTS_PORT_LOCAL}/generate-audio/stream"
+    response = requests.post(url, json={"text": text}, stream=True, timeout=timeout)
+    try:
+        response.raise_for_status()
+        sample_rate = int(response.headers["X-Sample-Rate"])
+    except Exception:
+        response.close()
+        raise
+
+    def chunks():
+        with response:
+            yield from response.iter_content(Config.TTS_STREAM_CHUNK_BYTES)
+
+    return sample_rate, chunks()
+
+
+def _wav_bytes(pcm, sample_rate):
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(pcm)
+    return buffer.getvalue()
+
+
+def _play_wav_bytes(data, on_first_audio=None):
+    from voice_assistant.audio import PCMPlayer
+    with wave.open(io.BytesIO(data), "rb") as wav_file:
+        player = PCMPlayer(wav_file.getframerate(), wav_file.getnchannels())
+        frames = wav_file.readframes(wav_file.getnframes())
+    if on_first_audio:
+        on_first_audio()
     try:
-        if model == 'openai':
-            client = OpenAI(api_key=api_key)
-            speech_response = client.audio.speech.create(
-                model="tts-1",
-                voice="nova",
-                input=text
-            )
-
-            speech_response.stream_to_file(output_file_path)
-            # with open(output_file_path, "wb") as audio_file:
-            #     audio_file.write(speech_response['data'])  # Ensure this correctly accesses the binary content
-
-        elif model == 'deepgram':
-            from deepgram import SpeakOptions
-            client = DeepgramClient(api_key=api_key)
-            options = SpeakOptions(
-                model="aura-arcas-en", #"aura-luna-en", # https://developers.deepgram.com/docs/tts-models
-                encoding="linear16",
-                container="wav"
-            )
-            SPEAK_OPTIONS = {"text": text}
-            response = client.speak.rest.v("1").save(output_file_path, SPEAK_OPTIONS, options)
-        
-        elif model == 'elevenlabs':
-            client = ElevenLabs(api_key=api_key)
-            audio = client.generate(
-                text=text, 
-                voice="Paul J.", 
-                output_format="mp3_22050_32", 
-                model="eleven_turbo_v2"
-            )
-            elevenlabs.save(audio, output_file_path)
-        
-        elif model == "cartesia":
-            client = Cartesia(api_key=api_key)
-            # voice_name = "Barbershop Man"
-            voice_id = "f114a467-c40a-4db8-964d-aaba89cd08fa"#"a0e99841-438c-4a64-b679-ae501e7d6091"
-            voice = client.voices.get(id=voice_id)
-
-            # You can check out our models at https://docs.cartesia.ai/getting-started/available-models
-            model_id = "sonic-english"
-
-            # You can find the supported `output_format`s at https://docs.cartesia.ai/api-reference/endpoints/stream-speech-server-sent-events
-            output_format = {
-                "container": "raw",
-                "encoding": "pcm_f32le",
-                "sample_rate": 44100,
-            }
-
-            p = pyaudio.PyAudio()
-            rate = 44100
-
-            stream = None
-
-            # Generate and stream audio
-            for output in client.tts.sse(
-                model_id=model_id,
-                transcript=text,
-                voice_embedding=voice["embedding"],
-                stream=True,
-                output_format=output_format,
-            ):
-                buffer = output["audio"]
-
-                if stream is None:
-                    stream = p.open(format=pyaudio.paFloat32, channels=1, rate=rate, output=True)
-
-                # Write the audio data to the stream
-                stream.write(buffer)
-            
-            if stream:
-                stream.stop_stream()
-                stream.close()
-            p.terminate()
-
-        elif model == "melotts": # this is a local model
-            generate_audio_file_melotts(text=text, filename=output_file_path)
-
-        elif model == "piper":  # this is a local model
-            try:
-                response = requests.post(
-                    f"{Config.PIPER_SERVER_URL}/synthesize/",
-                    json={"text": text},
-                    headers={"Content-Type": "application/json"}
-                )
-
-                if response.status_code == 200:
-                    with open(Config.PIPER_OUTPUT_FILE, "wb") as f:
-                        f.write(response.content)
-                    logging.info(f"Piper TTS output saved to {Config.PIPER_OUTPUT_FILE}")
-                else:
-                    logging.error(f"Piper TTS API error: {response.status_code} - {response.text}")
-
-            except Exception as e:
-                logging.error(f"Piper TTS request failed: {e}")
-
-        elif model == "pyttsx3":  # this is a local model using macOS built-in TTS
-            _tts_with_pyttsx3(text, output_file_path)
-
-        elif model == 'local':
-            with open(output_file_path, "wb") as f:
-                f.write(b"Local TTS audio data")
+        for offset in range(0, len(frames), Config.TTS_STREAM_CHUNK_BYTES):
+            player.write(frames[offset:offset + Config.TTS_STREAM_CHUNK_BYTES])
+    finally:
+        player.close()
+
+
+def _synthesize(model, api_key, text, output_file_path, local_model_path=None, timeout=None, on_first_audio=None):
+    if model == 'openai':
+        client = OpenAI(api_key=api_key, **client_timeout(timeout), **sdk_retries())
+        speech_response = client.audio.speech.create(
+            model=Config.TTS_VOICES["openai"]["model"],
+            voice=Config.TTS_VOICES["openai"]["voice"],
+            input=text
+        )
+
+        speech_response.stream_to_file(output_file_path)
+        # with open(output_file_path, "wb") as audio_file:
+        #     audio_file.write(speech_response['data'])  # Ensure this correctly accesses the binary content
+
+    elif model == 'deepgram':
+        from deepgram import SpeakOptions
+        client = DeepgramClient(api_key=api_key)
+        options = SpeakOptions(
+            model=Config.TTS_VOICES["deepgram"]["model"],  # https://developers.deepgram.com/docs/tts-models
+            encoding="linear16",
+            container="wav"
+        )
+        SPEAK_OPTIONS = {"text": text}
+        response = client.speak.rest.v("1").save(
+            output_file_path, SPEAK_OPTIONS, options,
+            **({"timeout": httpx.Timeout(timeout)} if timeout else {})
+        )
+    
+    elif model == 'elevenlabs':
+        client = ElevenLabs(api_key=api_key, **client_timeout(timeout))
+        audio = client.generate(
+            text=text, 
+            voice=Config.TTS_VOICES["elevenlabs"]["voice"], 
+            output_format="mp3_22050_32", 
+            model=Config.TTS_VOICES["elevenlabs"]["model"]
+        )
+        elevenlabs.save(audio, output_file_path)
+    
+    elif model == "cartesia":
+        # The session keeps the client, voice embedding and output stream across turns
+        get_cartesia_session(api_key).speak(text, on_first_audio)
+
+    elif model == "melotts": # this is a local model
+        generate_audio_file_melotts(text=text, filename=output_file_path, timeout=timeout)
+
+    elif model == "piper":  # this is a local model
+        response = requests.post(
+            f"{Config.PIPER_SERVER_URL}/synthesize/",
+            json={"text": text},
+            headers={"Content-Type": "application/json"},
+            timeout=timeout
+        )
+
+        if response.status_code != 200:
+            logging.error(f"Piper TTS API error: {response.status_code} - {response.text}")
+            response.raise_for_status()
+        with open(output_file_path, "wb") as f:
+            f.write(response.content)
+        logging.info(f"Piper TTS output saved to {output_file_path}")
+
+    elif model == "pyttsx3":  # this is a local model using macOS built-in TTS
+        _tts_with_pyttsx3(text, output_file_path)
+
+    elif model == 'local':
+        with open(output_file_path, "wb") as f:
+            f.write(b"Local TTS audio data")
+
+    else:
+        raise ValueError("Unsupported TTS model")
+
 
+async def text_to_speech_async(model: str, api_key:str, text:str, output_file_path:str, local_model_path:str=None):
+    """
+    Async variant of text_to_speech.
+
+    OpenAI uses AsyncOpenAI and the MeloTTS and Piper sidecars are called with
+    httpx, rate limited, retried and falling back along
+    Config.TTS_FALLBACK_CHAIN like the sync path. Providers without an async
+    path here (Deepgram, ElevenLabs, Cartesia, pyttsx3) run the sync
+    implementation in a worker thread.
+
+    Args:
+    model (str): The model to use for TTS ('openai', 'deepgram', 'elevenlabs', 'local').
+    api_key (str): The API key for the TTS service.
+    text (str): The text to convert to speech.
+    output_file_path (str): The path to save the generated speech audio file.
+    local_model_path (str): The path to the local model (if applicable).
+    """
+    if model == 'auto':
+        model = resolve_model("tts", model)
+        api_key = get_api_key("tts", model)
+    if model not in ('openai', 'melotts', 'piper'):
+        # text_to_speech checks the cache and applies retries and breakers itself
+        await asyncio.to_thread(text_to_speech, model, api_key, text, output_file_path, local_model_path)
+        return
+    if await asyncio.to_thread(_serve_cached, text, model, output_file_path):
+        return
+
+    async def synthesize(provider):
+        key = api_key if provider == model else get_api_key("tts", provider)
+        return await retry_policy.call_async(provider, key, lambda: _synthesize_async(
+            provider, key, text, output_file_path, local_model_path))
+
+    try:
+        if Config.CIRCUIT_BREAKERS_ENABLED:
+            chain = fallback_chain("tts", model, Config.TTS_FALLBACK_CHAIN)
+            provider, _ = await breakers.call_async("tts", chain, synthesize)
         else:
-            raise ValueError("Unsupported TTS model")
+            provider = model
+            await synthesize(model)
+        await asyncio.to_thread(_cache_audio, text, provider, output_file_path)
 
     except Exception as e:
         logging.error(f"Failed to convert text to speech: {e}")
 
 
+async def _synthesize_async(model, api_key, text, output_file_path, local_model_path=None):
+    if model == 'openai':
+        client = get_async_client(("openai", api_key), lambda: AsyncOpenAI(api_key=api_key, **sdk_retries()))
+        async with client.audio.speech.with_streaming_response.create(
+            model=Config.TTS_VOICES["openai"]["model"],
+            voice=Config.TTS_VOICES["openai"]["voice"],
+            input=text
+        ) as speech_response:
+            await speech_response.stream_to_file(output_file_path)
+
+    elif model == "melotts":  # this is a local model
+        client = _get_local_async_client()
+        response = await client.post(
+            f"http://localhost:{Config.TTS_PORT_LOCAL}/generate-audio/",
+            json={"text": text, "language": "EN", "accent": "EN-US", "speed": 1.0}
+        )
+        response.raise_for_status()
+        await asyncio.to_thread(_write_file, output_file_path, response.content)
+
+    elif model == "piper":  # this is a local model
+        client = _get_local_async_client()
+        response = await client.post(
+            f"{Config.PIPER_SERVER_URL}/synthesize/",
+            json={"text": text}
+        )
+        if response.status_code != 200:
+            logging.error(f"Piper TTS API error: {response.status_code} - {response.text}")
+            response.raise_for_status()
+        await asyncio.to_thread(_write_file, output_file_path, response.content)
+        logging.info(f"Piper TTS output saved to {output_file_path}")
+
+    else:
+        # A fallback provider without an async client
+        await asyncio.to_thread(_synthesize, model, api_key, text, output_file_path, local_model_path)
+
+
+def _get_local_async_client():
+    # Local synthesis of a long text can take a while, so the sidecars get no timeout
+    return get_async_client(("httpx", "local_tts"), lambda: httpx.AsyncClient(timeout=None))
+
+
+def _write_file(file_path, data):
+    with open(file_path, "wb") as f:
+        f.write(data)
+
+
 def _tts_with_pyttsx3(text, output_file_path):
     """
     Generate speech using pyttsx3 (macOS built-in TTS).
@@ -1,16 +1,28 @@
 # voice_assistant/transcription.py
 
+import asyncio
+import io
 import json
 import logging
+import os
 import requests
 import time
 
+import httpx
 from colorama import Fore, init
-from openai import OpenAI
-from groq import Groq
+from openai import OpenAI, AsyncOpenAI
+from groq import Groq, AsyncGroq
 from deepgram import DeepgramClient
 from faster_whisper import WhisperModel
 
+from voice_assistant.config import Config
+from voice_assistant.utils import client_timeout, sdk_retries, get_async_client
+from voice_assistant.api_key_manager import get_api_key
+from voice_assistant.hedging import hedger, hedge_partner
+from voice_assistant.circuit_breaker import breakers, fallback_chain
+from voice_assistant.retry import retry_policy
+from voice_assistant.auto_select import resolve_model
+
 fast_url = "http://localhost:8000"
 checked_fastwhisperapi = False
 
@@ -30,12 +42,85 @@ def check_fastwhisperapi():
             raise Exception("FastWhisperAPI is not running")
         checked_fastwhisperapi = True
 
-def transcribe_audio(model, api_key, audio_file_path, local_model_path=None):
+def transcribe_audio(model, api_key, audio_file_path, local_model_path=None, timeout=None):
     """
     Transcribe an audio file using the specified model.
+
+    When Config.HEDGING_ENABLED is set and the model has not answered within
+    its observed p90 latency, Config.HEDGE_STT_SECONDARY is asked as well and
+    the first transcript wins. When Config.CIRCUIT_BREAKERS_ENABLED is set, a
+    failing model is skipped for a while and the next model in
+    Config.STT_FALLBACK_CHAIN is used instead. Every provider call is rate
+    limited and transient failures are retried (see voice_assistant.retry).
+    'auto' picks the fastest healthy provider (see voice_assistant.auto_select).
     
     Args:
-        model (str): The model to use for transcription ('openai', 'groq', 'deepgram', 'fastwhisper', 'local').
+        model (str): The model to use for transcription ('openai', 'groq', 'deepgram', 'fastwhisper', 'local', 'auto').
+        api_key (str): The API key for the transcription service.
+        audio_file_path (str): The path to the audio file to transcribe.
+        local_model_path (str): The path to the local model (if applicable).
+        timeout (float): Seconds to wait for a cloud or server model before giving up.
+            The local faster-whisper model is not interrupted.
+
+    Returns:
+        str: The transcribed text.
+    """
+    if model == 'auto':
+        model = resolve_model("stt", model)
+        api_key = get_api_key("transcription", model)
+
+    def transcribe(provider):
+        if provider == model:
+            return retry_policy.call(provider, api_key, lambda: _transcribe(
+                provider, api_key, audio_file_path, local_model_path, timeout=timeout), timeout)
+        key = get_api_key("transcription", provider)
+        return retry_policy.call(provider, key, lambda: _transcribe(
+            provider, key, audio_file_path, local_model_path, timeout=timeout), timeout)
+
+    def transcribe_hedged(provider):
+        # Returns (provider that answered, transcript)
+        if Config.HEDGING_ENABLED and provider == model:
+            secondary = hedge_partner("transcription", model, Config.HEDGE_STT_SECONDARY)
+            return hedger.call("stt", model, secondary, transcribe, timeout=timeout)
+        return provider, transcribe(provider)
+
+    try:
+        if Config.CIRCUIT_BREAKERS_ENABLED:
+            chain = fallback_chain("transcription", model, Config.STT_FALLBACK_CHAIN)
+            return breakers.call("stt", chain, transcribe_hedged, lambda answer: answer[0])[1][1]
+        return transcribe_hedged(model)[1]
+    except Exception as e:
+        logging.error(f"{Fore.RED}Failed to transcribe audio: {e}{Fore.RESET}")
+        raise Exception("Error in transcribing audio")
+
+def _transcribe(model, api_key, audio_file_path, local_model_path=None, timeout=None):
+    if model == 'openai':
+        return _transcribe_with_openai(api_key, audio_file_path, timeout)
+    elif model == 'groq':
+        return _transcribe_with_groq(api_key, audio_file_path, timeout)
+    elif model == 'deepgram':
+        return _transcribe_with_deepgram(api_key, audio_file_path, timeout)
+    elif model == 'fastwhisperapi':
+        return _transcribe_with_fastwhisperapi(audio_file_path, timeout)
+    elif model == 'faster-whisper':
+        return _transcribe_with_faster_whisper(audio_file_path, local_model_path)
+    elif model == 'local':
+        # Placeholder for local STT model transcription
+        return "Transcribed text from local model"
+    else:
+        raise ValueError("Unsupported transcription model")
+
+async def transcribe_audio_async(model, api_key, audio_file_path, local_model_path=None):
+    """
+    Async variant of transcribe_audio built on the providers' async clients.
+
+    OpenAI and Groq use their async SDK clients and FastWhisperAPI uses httpx.
+    Deepgram and faster-whisper run the sync implementation in a worker thread.
+    Calls are rate limited, retried and fall back along
+    Config.STT_FALLBACK_CHAIN like the sync path; hedging is sync-only.
+
+    Args:
+        model (str): The model to use for transcription ('openai', 'groq', 'deepgram', 'fastwhisperapi', 'faster-whisper', 'local').
         api_key (str): The API key for the transcription service.
         audio_file_path (str): The path to the audio file to transcribe.
         local_model_path (str): The path to the local model (if applicable).
@@ -43,28 +128,44 @@ def transcribe_audio(model, api_key, audio_file_path, local_model_path=None):
     Returns:
         str: The transcribed text.
     """
+    if model == 'auto':
+        model = resolve_model("stt", model)
+        api_key = get_api_key("transcription", model)
+
+    def transcribe(provider):
+        key = api_key if provider == model else get_api_key("transcription", provider)
+        return retry_policy.call_async(provider, key, lambda: _transcribe_async(
+            provider, key, audio_file_path, local_model_path))
+
     try:
-        if model == 'openai':
-            return _transcribe_with_openai(api_key, audio_file_path)
-        elif model == 'groq':
-            return _transcribe_with_groq(api_key, audio_file_path)
-        elif model == 'deepgram':
-            return _transcribe_with_deepgram(api_key, audio_file_path)
-        elif model == 'fastwhisperapi':
-            return _transcribe_with_fastwhisperapi(audio_file_path)
-        elif model == 'faster-whisper':
-            return _transcribe_with_faster_whisper(audio_file_path, local_model_path)
-        elif model == 'local':
-            # Placeholder for local STT model transcription
-            return "Transcribed text from local model"
-        else:
-            raise ValueError("Unsupported transcription model")
+        if Config.CIRCUIT_BREAKERS_ENABLED:
+            chain = fallback_chain("transcription", model, Config.STT_FALLBACK_CHAIN)
+            return (await breakers.call_async("stt", chain, transcribe))[1]
+        return await transcribe(model)
     except Exception as e:
         logging.error(f"{Fore.RED}Failed to transcribe audio: {e}{Fore.RESET}")
         raise Exception("Error in transcribing audio")
 
-def _transcribe_with_openai(api_key, audio_file_path):
-    client = OpenAI(api_key=api_key)
+async def _transcribe_async(model, api_key, audio_file_path, local_model_path=None):
+    if model == 'openai':
+        return await _transcribe_with_openai_async(api_key, audio_file_path)
+    elif model == 'groq':
+        return await _transcribe_with_groq_async(api_key, audio_file_path)
+    elif model == 'deepgram':
+        return await asyncio.to_thread(_transcribe_with_deepgram, api_key, audio_file_path)
+    elif model == 'fastwhisperapi':
+        return await _transcribe_with_fastwhisperapi_async(audio_file_path)
+    elif model == 'faster-whisper':
+        return await asyncio.to_thread(_transcribe_with_faster_whisper, audio_file_path, local_model_path)
+    elif model == 'local':
+        # Placeholder for local STT model transcription
+        return "Transcribed text from local model"
+    else:
+        raise ValueError("Unsupported transcription model")
+
+
+def _transcribe_with_openai(api_key, audio_file_path, timeout=None):
+    client = OpenAI(api_key=api_key, **client_timeout(timeout), **sdk_retries())
     with open(audio_file_path, "rb") as audio_file:
         transcription = client.audio.transcriptions.create(
             model="whisper-1",
@@ -74,8 +175,8 @@ def _transcribe_with_openai(api_key, audio_file_path):
     return transcription.text
 
 
-def _transcribe_with_groq(api_key, audio_file_path):
-    client = Groq(api_key=api_key)
+def _transcribe_with_groq(api_key, audio_file_path, timeout=None):
+    client = Groq(api_key=api_key, **client_timeout(timeout), **sdk_retries())
     with open(audio_file_path, "rb") as audio_file:
         transcription = client.audio.transcriptions.create(
             model="whisper-large-v3",
@@ -85,7 +186,7 @@ def _transcribe_with_groq(api_key, audio_file_path):
     return transcription.text
 
 
-def _transcribe_with_deepgram(api_key, audio_file_path):
+def _transcribe_with_deepgram(api_key, audio_file_path, timeout=None):
     try:
         from deepgram import DeepgramClient
 
@@ -97,7 +198,8 @@ def _transcribe_with_deepgram(api_key, audio_file_path):
             response = client.listen.v1.media.transcribe_file(
                 request=audio_file.read(),
                 model="nova-2",
-                smart_format=True
+                smart_format=True,
+                request_options={"timeout_in_seconds": int(timeout) + 1} if timeout else None
             )
 
         # Extract transcript from response
@@ -109,7 +211,34 @@ def _transcribe_with_deepgram(api_key, audio_file_path):
         raise
 
 
-def _transcribe_with_fastwhisperapi(audio_file_path):
+async def _transcribe_with_openai_async(api_key, audio_file_path):
+    client = get_async_client(("openai", api_key), lambda: AsyncOpenAI(api_key=api_key, **sdk_retries()))
+    audio_bytes = await asyncio.to_thread(_read_file, audio_file_path)
+    transcription = await client.audio.transcriptions.create(
+        model="whisper-1",
+        file=(os.path.basename(audio_file_path), audio_bytes),
+        language='en'
+    )
+    return transcription.text
+
+
+async def _transcribe_with_groq_async(api_key, audio_file_path):
+    client = get_async_client(("groq", api_key), lambda: AsyncGroq(api_key=api_key, **sdk_retries()))
+    audio_bytes = await asyncio.to_thread(_read_file, audio_file_path)
+    transcription = await client.audio.transcriptions.create(
+        model="whisper-large-v3",
+        file=(os.path.basename(audio_file_path), audio_bytes),
+        language='en'
+    )
+    return transcription.text
+
+
+def _read_file(file_path):
+    with open(file_path, "rb") as f:
+        return f.read()
+
+
+def _transcribe_with_fastwhisperapi(audio_file_path, timeout=None):
     check_fastwhisperapi()
     endpoint = f"{fast_url}/v1/transcriptions"
 
@@ -122,7 +251,26 @@ def _transcribe_with_fastwhisperapi(audio_file_path):
     }
     headers = {'Authorization': 'Bearer dummy_api_key'}
 
-    response = requests.post(endpoint, files=files, data=data, headers=headers)
+    response = requests.post(endpoint, files=files, data=data, headers=headers, timeout=timeout)
+    response_json = response.json()
+    return response_json.get('text', 'No text found in the response.')
+
+
+async def _transcribe_with_fastwhisperapi_async(audio_file_path):
+    await asyncio.to_thread(check_fastwhisperapi)
+    endpoint = f"{fast_url}/v1/transcriptions"
+
+    audio_bytes = await asyncio.to_thread(_read_file, audio_file_path)
+    files = {'file': (audio_file_path, audio_bytes)}
+    data = {
+        'model': "base",
+        'language': "en",
+        'vad_filter': "true",
+    }
+    headers = {'Authorization': 'Bearer dummy_api_key'}
+
+    client = get_async_client(("httpx",), httpx.AsyncClient)
+    response = await client.post(endpoint, files=files, data=data, headers=headers)
     response_json = response.json()
     return response_json.get('text', 'No text found in the response.')
 
@@ -140,46 +288,77 @@ def _transcribe_with_faster_whisper(audio_file_path, model_size=None):
         str: The transcribed text
     """
     try:
-        from voice_assistant.config import Config
-
-        # Use provided model size or default from config
-        # Ignore if model_size looks like a file path (contains '/')
-        if model_size is None or '/' in str(model_size) or model_size == '':
-            model_size = Config.FASTER_WHISPER_MODEL
-
-        # Check if model is already cached
-        global _faster_whisper_model_cache
-        if model_size not in _faster_whisper_model_cache:
-            logging.info(f"Loading faster-whisper model: {model_size}")
-            # Load model with optimal settings for Mac
-            # compute_type="int8" for CPU, "float16" for GPU
-            model = WhisperModel(
-                model_size,
-                device="cpu",
-                compute_type="int8",
-                download_root=None  # Uses default cache directory
-            )
-            _faster_whisper_model_cache[model_size] = model
-            logging.info(f"Model {model_size} loaded successfully")
-        else:
-            model = _faster_whisper_model_cache[model_size]
-
-        # Transcribe audio
-        segments, info = model.transcribe(
-            audio_file_path,
-            beam_size=5,
-            language="en",
-            vad_filter=True,  # Voice activity detection
-            vad_parameters=dict(min_silence_duration_ms=500)
-        )
-
-        # Combine all segments into a single transcript
-        transcript = " ".join([segment.text for segment in segments])
+        model = _get_faster_whisper_model(model_size)
+        transcript, info = _decode_with_faster_whisper(model, audio_file_path)
 
         logging.info(f"Detected language '{info.language}' with probability {info.language_probability}")
 
-        return transcript.strip()
+        return transcript
 
     except Exception as e:
         logging.error(f"{Fore.RED}faster-whisper transcription error: {e}{Fore.RESET}")
-        raise
\ No newline at end of file
+        raise
+
+
+def transcribe_partial(wav_data, model_size=None):
+    """
+    Transcribe the audio captured so far with faster-whisper, while the user is still speaking.
+
+    Uses the same model and decoding settings as the final faster-whisper
+    transcription, so a partial taken after the user stopped talking matches
+    the final transcript.
+
+    Args:
+        wav_data (bytes): WAV audio of the phrase so far
+        model_size (str): Model size; if None, uses Config.FASTER_WHISPER_MODEL
+
+    Returns:
+        str: The transcript so far ('' if nothing was recognized or decoding failed)
+    """
+    try:
+        transcript, _ = _decode_with_faster_whisper(_get_faster_whisper_model(model_size), io.BytesIO(wav_data))
+        return transcript
+    except Exception as e:
+        logging.debug(f"Partial transcription failed: {e}")
+        return ""
+
+
+def _get_faster_whisper_model(model_size=None):
+    """Load a faster-whisper model once and reuse it."""
+    from voice_assistant.config import Config
+
+    # Use provided model size or default from config
+    # Ignore if model_size looks like a file path (contains '/')
+    if model_size is None or '/' in str(model_size) or model_size == '':
+        model_size = Config.FASTER_WHISPER_MODEL
+
+    # Check if model is already cached
+    global _faster_whisper_model_cache
+    if model_size not in _faster_whisper_model_cache:
+        logging.info(f"Loading faster-whisper model: {model_size}")
+        # Load model with optimal settings for Mac
+        # compute_type="int8" for CPU, "float16" for GPU
+        model = WhisperModel(
+            model_size,
+            device="cpu",
+            compute_type="int8",
+            download_root=None  # Uses default cache directory
+        )
+        _faster_whisper_model_cache[model_size] = model
+        logging.info(f"Model {model_size} loaded successfully")
+    return _faster_whisper_model_cache[model_size]
+
+
+def _decode_with_faster_whisper(model, audio):
+    """Decode a file path or file-like object, returning (transcript, info)."""
+    segments, info = model.transcribe(
+        audio,
+        beam_size=5,
+        language="en",
+        vad_filter=True,  # Voice activity detection
+        vad_parameters=dict(min_silence_duration_ms=500)
+    )
+
+    # Combine all segments into a single transcript
+    transcript = " ".join([segment.text for segment in segments])
+    return transcript.strip(), info
\ No newline at end of file
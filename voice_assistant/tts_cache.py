@@ -0,0 +1,240 @@
+# voice_assistant/tts_cache.py
+
+import hashlib
+import logging
+import mmap
+import os
+import threading
+from collections import OrderedDict
+
+from voice_assistant.config import Config
+
+
+def normalize_tts_text(text: str) -> str:
+    """
+    Normalize text so that only differences that change the audio change the key.
+
+    Case and punctuation are kept since they affect prosody; only surrounding
+    and repeated whitespace is dropped.
+
+    Args:
+        text: The text to synthesize.
+
+    Returns:
+        str: The normalized text.
+    """
+    return " ".join(text.split())
+
+
+def tts_cache_key(text: str, provider: str, file_format: str) -> str:
+    """
+    Build the content-addressed key of a synthesized clip.
+
+    Args:
+        text: The text to synthesize.
+        provider: The TTS provider, e.g. 'openai'.
+        file_format: The audio container, e.g. 'mp3'.
+
+    Returns:
+        str: A hex digest of the normalized text, provider, its model and voice
+            (Config.TTS_VOICES) and the format.
+    """
+    voice = Config.TTS_VOICES.get(provider, {})
+    parts = [provider, voice.get("model", ""), voice.get("voice", ""), file_format, normalize_tts_text(text)]
+    return hashlib.sha256("\x00".join(parts).encode()).hexdigest()
+
+
+class TTSCache:
+    """
+    Two-tier cache of synthesized audio.
+
+    Hot clips live in an in-memory LRU bounded by Config.TTS_CACHE_MEMORY_BYTES.
+    Every clip is also written to Config.TTS_CACHE_DIR, which is capped at
+    Config.TTS_CACHE_DISK_BYTES (least recently used files are removed first)
+    and survives restarts. Disk hits are read through mmap and promoted to
+    the memory tier.
+    """
+
+    def __init__(self, directory: str = None, memory_bytes: int = None, disk_bytes: int = None):
+        """
+        Args:
+            directory: Directory of the on-disk tier (Config.TTS_CACHE_DIR by default).
+            memory_bytes: Size cap of the in-memory tier.
+            disk_bytes: Size cap of the on-disk tier.
+        """
+        self.directory = directory or Config.TTS_CACHE_DIR
+        self.memory_bytes = memory_bytes or Config.TTS_CACHE_MEMORY_BYTES
+        self.disk_bytes = disk_bytes or Config.TTS_CACHE_DISK_BYTES
+        self._memory = OrderedDict()
+        self._memory_size = 0
+        self._disk_size = None
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bytes_served = 0
+
+    def get(self, key: str, file_format: str):
+        """
+        Look up a clip.
+
+        Args:
+            key: The key from tts_cache_key.
+            file_format: The audio container, used as the file extension on disk.
+
+        Returns:
+            bytes: The audio, or None on a miss.
+        """
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                self.bytes_served += len(data)
+                return data
+
+        path = self._path(key, file_format)
+        try:
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                data = bytes(mapped)
+            # Bump the modification time so disk eviction is least recently used
+            os.utime(path)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.disk_hits += 1
+            self.bytes_served += len(data)
+            self._remember(key, data)
+        return data
+
+    def contains(self, key: str, file_format: str) -> bool:
+        """
+        Check whether a clip is cached, without counting a hit or miss.
+
+        Args:
+            key: The key from tts_cache_key.
+            file_format: The audio container.
+
+        Returns:
+            bool: True if either tier holds the clip.
+        """
+        with self._lock:
+            if key in self._memory:
+                return True
+        return os.path.exists(self._path(key, file_format))
+
+    def put(self, key: str, file_format: str, data: bytes):
+        """
+        Store a clip in both tiers.
+
+        Args:
+            key: The key from tts_cache_key.
+            file_format: The audio container.
+            data: The audio bytes.
+        """
+        if not data:
+            return
+        with self._lock:
+            self._remember(key, data)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._path(key, file_format)
+            partial = f"{path}.{threading.get_ident()}.part"
+            with open(partial, "wb") as f:
+                f.write(data)
+            os.replace(partial, path)
+            with self._lock:
+                self._disk_size = self._scan_size() if self._disk_size is None else self._disk_size + len(data)
+                if self._disk_size > self.disk_bytes:
+                    self._evict_disk()
+        except OSError as e:
+            logging.warning(f"Could not write TTS cache entry: {e}")
+
+    def clear(self):
+        """Remove every cached clip from memory and disk."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_size = 0
+            for path, _, _ in self._disk_entries():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._disk_size = 0
+
+    def get_stats(self) -> dict:
+        """
+        Get hit-ratio metrics.
+
+        Returns:
+            dict: Memory and disk hits, misses, the hit ratio, bytes served from
+                the cache and the size of each tier.
+        """
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_ratio": hits / lookups if lookups else 0.0,
+                "bytes_served": self.bytes_served,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_size,
+                "disk_bytes": self._disk_size if self._disk_size is not None else self._scan_size(),
+            }
+
+    def _path(self, key, file_format):
+        return os.path.join(self.directory, f"{key}.{file_format}")
+
+    def _remember(self, key, data):
+        if len(data) > self.memory_bytes:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_size -= len(old)
+        self._memory[key] = data
+        self._memory_size += len(data)
+        while self._memory_size > self.memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_size -= len(evicted)
+
+    def _disk_entries(self):
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        entries = []
+        for name in names:
+            if name.endswith(".part"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((path, stat.st_mtime, stat.st_size))
+        return entries
+
+    def _scan_size(self):
+        return sum(size for _, _, size in self._disk_entries())
+
+    def _evict_disk(self):
+        entries = sorted(self._disk_entries(), key=lambda entry: entry[1])
+        size = sum(entry[2] for entry in entries)
+        for path, _, entry_size in entries:
+            if size <= self.disk_bytes:
+                break
+            try:
+                os.remove(path)
+                size -= entry_size
+            except OSError:
+                pass
+        self._disk_size = size
+
+
+# Global instance
+tts_cache = TTSCache()
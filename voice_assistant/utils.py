@@ -1,7 +1,16 @@
 # voice_assistant/utils.py
 
+import asyncio
 import os
 import logging
+import threading
+import weakref
+
+from voice_assistant.config import Config
+
+# Async SDK clients per event loop, see get_async_client
+_async_clients = weakref.WeakKeyDictionary()
+_async_clients_lock = threading.Lock()
 
 def delete_file(file_path):
     """
@@ -19,3 +28,94 @@ def delete_file(file_path):
         logging.error(f"Permission denied when trying to delete file: {file_path}")
     except OSError as e:
         logging.error(f"Error deleting file {file_path}: {e}")
+
+
+def client_timeout(timeout):
+    """
+    Keyword arguments setting an SDK client's timeout, if one is given.
+
+    Args:
+    timeout (float): Seconds to wait, or None for the SDK default.
+
+    Returns:
+    dict: Keyword arguments for the client constructor.
+    """
+    return {"timeout": timeout} if timeout else {}
+
+
+def sdk_retries():
+    """
+    Keyword arguments turning off an SDK client's own retries when RetryPolicy retries.
+
+    Returns:
+    dict: Keyword arguments for an OpenAI or Groq client constructor.
+    """
+    return {"max_retries": 0} if Config.RETRY_ENABLED else {}
+
+
+def resume_stream(first, iterator):
+    """
+    Yield an already-read first item, then the rest of its iterator.
+
+    The iterator is closed when the generator finishes or is closed, which
+    closes the provider's HTTP stream.
+
+    Args:
+    first: The first item, or None if the stream was empty.
+    iterator: The iterator the first item was read from.
+
+    Yields:
+    The first item followed by the remaining items.
+    """
+    try:
+        if first is not None:
+            yield first
+            yield from iterator
+    finally:
+        if hasattr(iterator, "close"):
+            iterator.close()
+
+
+async def resume_stream_async(first, iterator):
+    """
+    Async variant of resume_stream.
+
+    Args:
+    first: The first item, or None if the stream was empty.
+    iterator: The async iterator the first item was read from.
+
+    Yields:
+    The first item followed by the remaining items.
+    """
+    try:
+        if first is not None:
+            yield first
+            async for item in iterator:
+                yield item
+    finally:
+        if hasattr(iterator, "aclose"):
+            await iterator.aclose()
+
+
+def get_async_client(key, factory):
+    """
+    Get a long-lived async client for the running event loop, creating it on first use.
+
+    Async clients keep their connections open for reuse, and those
+    connections belong to the event loop that opened them, so one client is
+    kept per loop and key and dropped together with its loop.
+
+    Args:
+    key (tuple): Identifies the client, e.g. ('openai', api_key).
+    factory (callable): Called with no arguments to build the client.
+
+    Returns:
+    The client.
+    """
+    loop = asyncio.get_running_loop()
+    with _async_clients_lock:
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None:
+            client = clients[key] = factory()
+        return client